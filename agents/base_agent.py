@@ -9,21 +9,98 @@ Provides common functionality for all agents:
 - Timestamp management
 """
 
-from abc import ABC, abstractmethod
-from typing import Dict, Optional, Callable
+from collections import OrderedDict
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Callable, Awaitable, Tuple
 from datetime import datetime
+import asyncio
+import atexit
+import contextvars
+import copy
+import functools
+import hashlib
 import json
+import os
+import threading
+import time
 
+try:  # Optional dependency – faster metadata serialization for console logs
+    import orjson  # type: ignore
+except Exception:  # pragma: no cover - optional dependency
+    orjson = None
 
-class BaseAgent(ABC):
+# Shared pool for running synchronous process() calls from async chains.
+# Threads are started lazily, so importing this module stays cheap.
+_AGENT_EXECUTOR = ThreadPoolExecutor(
+    max_workers=int(os.environ.get("AGENT_POOL_SIZE", 32)),
+    thread_name_prefix="agent"
+)
+atexit.register(_AGENT_EXECUTOR.shutdown)
+
+# Hoisted clock lookups used on every log/output call
+_now = datetime.now
+_perf_counter = time.perf_counter
+
+# Start of the call being processed. Context-local rather than an instance
+# attribute, so concurrent calls on one agent each time their own run.
+_processing_started: "contextvars.ContextVar[Optional[float]]" = contextvars.ContextVar(
+    "processing_started", default=None
+)
+
+# Console prefixes for the fallback logger
+_LEVEL_PREFIX: Dict[str, str] = {
+    "INFO": "ℹ️",
+    "SUCCESS": "✅",
+    "WARNING": "⚠️",
+    "ERROR": "❌",
+    "CRITICAL": "🚨",
+    "DEBUG": "🔍"
+}
+
+
+def _dump_metadata(metadata: Dict) -> str:
+    """
+    Serialize log metadata for console output.
+    
+    Compact by default; set AGENT_LOG_PRETTY=1 for indented output.
+    """
+    if os.environ.get("AGENT_LOG_PRETTY"):
+        return json.dumps(metadata, indent=2, default=str)
+    if orjson is not None:
+        return orjson.dumps(metadata, default=str).decode()
+    return json.dumps(metadata, separators=(",", ":"), default=str)
+
+
+class BaseAgent:
     """
     Abstract base class for all agents in the system.
     
     All agents must implement:
     - process(): Main processing method
     - _validate_input(): Input validation
+    
+    This is enforced once when a subclass is defined rather than through
+    ABCMeta on every instantiation. Intermediate base classes can opt out
+    with ``class MyBase(BaseAgent, abstract=True)``.
+    
+    Successful safe_process() results are memoized per input. Agents whose
+    output is not a pure function of the input payload (side effects,
+    randomness, file contents) should set cacheable = False. Agents whose
+    process() already consults the cache set _process_caches = True so the
+    safe_process*() wrappers do not key and store each result a second time.
     """
     
+    __slots__ = ("agent_name", "log_callback", "_cache", "_cache_lock")
+    
+    _ABSTRACT_METHODS: Tuple[str, ...] = ("process", "_validate_input")
+    
+    REQUIRED_FIELDS: Tuple[str, ...] = ()
+    _executor: Executor = _AGENT_EXECUTOR
+    cacheable: bool = True
+    _process_caches: bool = False
+    _cache_max: int = 128
+    _cache_ttl: float = 300.0
+    
     def __init__(self, agent_name: str, log_callback: Optional[Callable] = None):
         """
         Initialize base agent.
@@ -34,9 +111,24 @@ class BaseAgent(ABC):
         """
         self.agent_name = agent_name
         self.log_callback = log_callback
-        self.start_time = None
+        self._cache: "OrderedDict[str, Tuple[float, Dict]]" = OrderedDict()
+        # safe_process_async() runs calls for one agent on several executor threads
+        self._cache_lock = threading.Lock()
+    
+    def __init_subclass__(cls, abstract: bool = False, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if abstract:
+            return
+        
+        missing = [
+            name for name in cls._ABSTRACT_METHODS
+            if getattr(cls, name) is getattr(BaseAgent, name)
+        ]
+        if missing:
+            raise TypeError(
+                f"{cls.__name__} must implement abstract methods: {', '.join(missing)}"
+            )
     
-    @abstractmethod
     def process(self, input_data: Dict) -> Dict:
         """
         Main processing method - must be implemented by subclass.
@@ -47,9 +139,8 @@ class BaseAgent(ABC):
         Returns:
             Dict: Standardized output for next agent
         """
-        pass
+        raise NotImplementedError
     
-    @abstractmethod
     def _validate_input(self, input_data: Dict) -> None:
         """
         Validate input data - must be implemented by subclass.
@@ -60,7 +151,7 @@ class BaseAgent(ABC):
         Raises:
             ValueError: If validation fails
         """
-        pass
+        raise NotImplementedError
     
     def _log(self, level: str, message: str, metadata: Optional[Dict] = None) -> None:
         """
@@ -71,53 +162,47 @@ class BaseAgent(ABC):
             message: Log message
             metadata: Optional additional data to log
         """
-        log_entry = {
-            "timestamp": datetime.now().isoformat(),
-            "agent": self.agent_name,
-            "level": level,
-            "message": message
-        }
-        
-        if metadata:
-            log_entry["metadata"] = metadata
-        
         if self.log_callback:
             self.log_callback(self.agent_name, level, message, metadata)
         else:
             # Fallback to console logging
-            prefix = {
-                "INFO": "ℹ️",
-                "SUCCESS": "✅",
-                "WARNING": "⚠️",
-                "ERROR": "❌",
-                "DEBUG": "🔍"
-            }.get(level, "•")
+            prefix = _LEVEL_PREFIX.get(level, "•")
             
             print(f"{prefix} [{level}] {self.agent_name}: {message}")
             if metadata:
-                print(f"   Metadata: {json.dumps(metadata, indent=2)}")
+                print(f"   Metadata: {_dump_metadata(metadata)}")
     
-    def _start_processing(self) -> None:
-        """Mark processing start time."""
-        self.start_time = datetime.now()
+    def _start_processing(self) -> contextvars.Token:
+        """
+        Mark processing start time.
+        
+        Returns:
+            Token to hand back to _end_processing()
+        """
+        started = _processing_started.set(_perf_counter())
         self._log("INFO", f"{self.agent_name} started processing")
+        return started
     
-    def _end_processing(self, success: bool = True) -> None:
+    def _end_processing(self, started: contextvars.Token, success: bool = True) -> None:
         """
         Mark processing end and log duration.
         
         Args:
+            started: Token returned by _start_processing()
             success: Whether processing was successful
         """
-        if self.start_time:
-            duration = (datetime.now() - self.start_time).total_seconds()
-            level = "SUCCESS" if success else "ERROR"
-            self._log(level, f"{self.agent_name} completed in {duration:.2f}s")
+        duration = _perf_counter() - _processing_started.get()
+        _processing_started.reset(started)
+        level = "SUCCESS" if success else "ERROR"
+        self._log(level, f"{self.agent_name} completed in {duration:.2f}s")
     
     def _create_output(self, data: Dict, status: str = "success") -> Dict:
         """
         Create standardized output format.
         
+        Metadata is added to ``data`` in place and the same dict is returned,
+        so callers must pass a freshly built dict and not reuse it afterwards.
+        
         Args:
             data: Output data from agent processing
             status: Processing status (success/error/warning)
@@ -125,58 +210,102 @@ class BaseAgent(ABC):
         Returns:
             Dict: Standardized output with metadata
         """
-        output = {
-            **data,
-            "agent": self.agent_name,
-            "status": status,
-            "timestamp": datetime.now().isoformat()
-        }
+        data["agent"] = self.agent_name
+        data["status"] = status
+        data["timestamp"] = _now().isoformat()
         
         # Add processing duration if available
-        if self.start_time:
-            duration = (datetime.now() - self.start_time).total_seconds()
-            output["processing_time_seconds"] = round(duration, 3)
+        started = _processing_started.get()
+        if started is not None:
+            data["processing_time_seconds"] = round(_perf_counter() - started, 3)
         
-        return output
+        return data
     
-    def _error_response(self, error_msg: str, exception: Optional[Exception] = None) -> Dict:
+    def _error_response(
+        self,
+        error_msg: str,
+        exception: Optional[Exception] = None,
+        error_type: Optional[str] = None
+    ) -> Dict:
         """
         Create standardized error response.
         
         Args:
             error_msg: Human-readable error message
             exception: Optional exception object
+            error_type: Optional error class name when no exception was raised
             
         Returns:
             Dict: Error response in standard format
         """
         self._log("ERROR", f"Error in {self.agent_name}: {error_msg}")
         
+        if error_type is None:
+            error_type = type(exception).__name__ if exception else "UnknownError"
+        
         error_data = {
             "error": error_msg,
-            "error_type": type(exception).__name__ if exception else "UnknownError",
+            "error_type": error_type,
             "agent": self.agent_name,
             "status": "error",
-            "timestamp": datetime.now().isoformat()
+            "timestamp": _now().isoformat()
         }
         
         return error_data
     
-    def _validate_required_fields(self, data: Dict, required_fields: list) -> None:
+    def _check_required_fields(self, data: Dict, required_fields: Optional[Iterable[str]] = None) -> Optional[str]:
+        """
+        Non-raising variant of _validate_required_fields.
+        
+        Args:
+            data: Data dictionary to validate
+            required_fields: Required field names (defaults to REQUIRED_FIELDS)
+            
+        Returns:
+            Error message if any required field is missing, else None
+        """
+        if required_fields is None:
+            required_fields = self.REQUIRED_FIELDS
+        
+        # Common case: everything present, short-circuits on first miss
+        if all(field in data for field in required_fields):
+            return None
+        
+        missing = [field for field in required_fields if field not in data]
+        return f"Missing required fields: {', '.join(missing)}"
+    
+    def _validate_required_fields(self, data: Dict, required_fields: Optional[Iterable[str]] = None) -> None:
         """
         Helper to validate required fields exist in input data.
         
         Args:
             data: Data dictionary to validate
-            required_fields: List of required field names
+            required_fields: Required field names (defaults to REQUIRED_FIELDS)
             
         Raises:
             ValueError: If any required field is missing
         """
-        missing = [field for field in required_fields if field not in data]
+        error = self._check_required_fields(data, required_fields)
+        if error is not None:
+            raise ValueError(error)
+    
+    def _validate_input_checked(self, input_data: Dict) -> Optional[str]:
+        """
+        Cheap pre-check run by safe_process before calling process().
         
-        if missing:
-            raise ValueError(f"Missing required fields: {', '.join(missing)}")
+        Returns an error message instead of raising, so malformed inputs are
+        rejected without building a traceback. The default checks
+        REQUIRED_FIELDS; full validation still happens in _validate_input.
+        
+        Args:
+            input_data: Data to validate
+            
+        Returns:
+            Error message if the input is invalid, else None
+        """
+        if not isinstance(input_data, dict):
+            return "Input data must be a dictionary"
+        return self._check_required_fields(input_data)
     
     def safe_process(self, input_data: Dict) -> Dict:
         """
@@ -190,15 +319,233 @@ class BaseAgent(ABC):
         Returns:
             Dict: Either successful output or error response
         """
+        key = None if self._process_caches else self._cache_key(input_data)
+        cached = self._cache_get(key)
+        if cached is not None:
+            return cached
+        
+        started = self._start_processing()
+        error = self._validate_input_checked(input_data)
+        if error is not None:
+            self._end_processing(started, success=False)
+            return self._error_response(error, error_type="ValueError")
+        
         try:
-            self._start_processing()
             result = self.process(input_data)
-            self._end_processing(success=True)
+            self._end_processing(started, success=True)
+            self._cache_put(key, result)
             return result
         except Exception as e:
-            self._end_processing(success=False)
+            self._end_processing(started, success=False)
             return self._error_response(str(e), e)
     
+    async def process_async(self, input_data: Dict) -> Dict:
+        """
+        Async variant of process().
+        
+        Default implementation runs the synchronous process() on the agent
+        executor (see set_executor) so it does not block the event loop.
+        Agents doing native async I/O should override this.
+        
+        Args:
+            input_data: Input from previous agent or coordinator
+            
+        Returns:
+            Dict: Standardized output for next agent
+        """
+        loop = asyncio.get_running_loop()
+        # Carry the caller's context so _create_output() sees its start time
+        context = contextvars.copy_context()
+        return await loop.run_in_executor(
+            type(self)._executor, context.run, self.process, input_data
+        )
+    
+    @classmethod
+    def set_executor(cls, executor: Executor) -> None:
+        """
+        Set the executor used by process_async() for this class and its subclasses.
+        
+        Call on a specific subclass to give CPU-heavy agents their own pool.
+        
+        Args:
+            executor: concurrent.futures executor instance
+        """
+        cls._executor = executor
+    
+    async def safe_process_async(self, input_data: Dict) -> Dict:
+        """
+        Async wrapper around process_async() with error handling.
+        
+        Args:
+            input_data: Input from previous agent
+            
+        Returns:
+            Dict: Either successful output or error response
+        """
+        key = None if self._process_caches else self._cache_key(input_data)
+        cached = self._cache_get(key)
+        if cached is not None:
+            return cached
+        
+        started = self._start_processing()
+        error = self._validate_input_checked(input_data)
+        if error is not None:
+            self._end_processing(started, success=False)
+            return self._error_response(error, error_type="ValueError")
+        
+        try:
+            result = await self.process_async(input_data)
+            self._end_processing(started, success=True)
+            self._cache_put(key, result)
+            return result
+        except Exception as e:
+            self._end_processing(started, success=False)
+            return self._error_response(str(e), e)
+    
+    # ============= BATCH PROCESSING =============
+    
+    def process_batch(self, inputs: List[Dict]) -> List[Dict]:
+        """
+        Process several inputs in one call.
+        
+        Default implementation processes items one by one. Agents that can
+        amortize work across items (model loading, batched requests) should
+        override this.
+        
+        Args:
+            inputs: List of inputs from previous agent or coordinator
+            
+        Returns:
+            List of outputs in input order
+        """
+        return [self.process(input_data) for input_data in inputs]
+    
+    def safe_process_batch(self, inputs: List[Dict]) -> List[Dict]:
+        """
+        Wrapper around process_batch() with per-item error handling.
+        
+        If an overridden process_batch() fails, items are retried one by one
+        so a single bad record does not fail the whole batch.
+        
+        Args:
+            inputs: List of inputs from previous agent
+            
+        Returns:
+            List of successful outputs or error responses, in input order
+        """
+        if type(self).process_batch is BaseAgent.process_batch:
+            return [self.safe_process(input_data) for input_data in inputs]
+        
+        try:
+            started = self._start_processing()
+            results = self.process_batch(inputs)
+            self._end_processing(started, success=True)
+            return results
+        except Exception:
+            self._end_processing(started, success=False)
+            return [self.safe_process(input_data) for input_data in inputs]
+    
+    async def process_batch_async(self, inputs: List[Dict]) -> List[Dict]:
+        """
+        Async variant of process_batch() running items concurrently.
+        
+        Args:
+            inputs: List of inputs from previous agent or coordinator
+            
+        Returns:
+            List of outputs in input order
+        """
+        return list(await asyncio.gather(*[
+            self.process_async(input_data) for input_data in inputs
+        ]))
+    
+    async def safe_process_batch_async(self, inputs: List[Dict]) -> List[Dict]:
+        """
+        Async wrapper around process_batch_async() with per-item error handling.
+        
+        Args:
+            inputs: List of inputs from previous agent
+            
+        Returns:
+            List of successful outputs or error responses, in input order
+        """
+        if type(self).process_batch_async is not BaseAgent.process_batch_async:
+            try:
+                started = self._start_processing()
+                results = await self.process_batch_async(inputs)
+                self._end_processing(started, success=True)
+                return results
+            except Exception:
+                self._end_processing(started, success=False)
+        
+        return list(await asyncio.gather(*[
+            self.safe_process_async(input_data) for input_data in inputs
+        ]))
+    
+    # ============= RESULT CACHE =============
+    
+    def _cache_key(self, input_data: Dict) -> Optional[str]:
+        """
+        Build a canonical hash of the input payload.
+        
+        Only plain JSON payloads are cached: a repr() of anything else (file
+        handles, buffers, arrays) can be truncated or carry a reused memory
+        address, so distinct inputs could share a key.
+        
+        Returns:
+            Hex digest, or None if caching is disabled or input is not plain JSON
+        """
+        if not self.cacheable:
+            return None
+        
+        try:
+            canonical = json.dumps(input_data, sort_keys=True)
+        except (TypeError, ValueError):
+            return None
+        
+        return hashlib.blake2b(canonical.encode(), digest_size=16).hexdigest()
+    
+    def _cache_get(self, key: Optional[str]) -> Optional[Dict]:
+        """Return a fresh copy of a cached result, or None on miss/expiry."""
+        if key is None:
+            return None
+        
+        with self._cache_lock:
+            entry = self._cache.get(key)
+            if entry is None:
+                return None
+            
+            stored_at, result = entry
+            if time.monotonic() - stored_at > self._cache_ttl:
+                del self._cache[key]
+                return None
+            
+            self._cache.move_to_end(key)
+        
+        self._log("INFO", f"{self.agent_name} cache hit")
+        
+        hit = copy.deepcopy(result)
+        if "timestamp" in hit:
+            hit["timestamp"] = _now().isoformat()
+        return hit
+    
+    def _cache_put(self, key: Optional[str], result: Dict) -> None:
+        """Store a successful result, evicting the least recently used entry."""
+        if key is None or not isinstance(result, dict) or result.get("status") == "error":
+            return
+        
+        entry = (time.monotonic(), copy.deepcopy(result))
+        with self._cache_lock:
+            self._cache[key] = entry
+            self._cache.move_to_end(key)
+            if len(self._cache) > self._cache_max:
+                self._cache.popitem(last=False)
+    
+    def clear_cache(self) -> None:
+        """Drop all memoized results."""
+        with self._cache_lock:
+            self._cache.clear()
+    
     def get_agent_info(self) -> Dict:
         """
         Get agent metadata and capabilities.
@@ -235,6 +582,26 @@ def create_agent_chain(agents: list) -> Callable:
     Returns:
         Function that processes data through all agents sequentially
     """
+    if len(agents) == 1:
+        # Fast path: no loop or hand-off bookkeeping for a single agent
+        only_agent = agents[0]
+        
+        def single_process(initial_input: Dict) -> Dict:
+            result = only_agent.safe_process(initial_input)
+            if result.get("status") == "error":
+                return {
+                    "status": "chain_failed",
+                    "failed_at": only_agent.agent_name,
+                    "results": [result]
+                }
+            return {
+                "status": "chain_completed",
+                "final_output": result,
+                "all_results": [result]
+            }
+        
+        return single_process
+    
     def chain_process(initial_input: Dict) -> Dict:
         current_data = initial_input
         results = []
@@ -263,6 +630,266 @@ def create_agent_chain(agents: list) -> Callable:
     return chain_process
 
 
+class AgentStepResult(NamedTuple):
+    """One step of a streamed agent chain."""
+    agent_name: str
+    result: Dict
+
+
+def create_agent_chain_streaming(agents: list) -> Callable[[Dict], Iterator[AgentStepResult]]:
+    """
+    Create a processing chain that yields each step as it completes.
+    
+    Unlike create_agent_chain, intermediate outputs are not accumulated, so
+    callers that only need the final output hold one step at a time. The
+    generator stops after the first error step.
+    
+    Args:
+        agents: List of BaseAgent instances
+        
+    Returns:
+        Function returning a generator of AgentStepResult tuples
+    """
+    def chain_process(initial_input: Dict) -> Iterator[AgentStepResult]:
+        current_data = initial_input
+        
+        for agent in agents:
+            result = agent.safe_process(current_data)
+            yield AgentStepResult(agent.agent_name, result)
+            
+            if result.get("status") == "error":
+                return
+            
+            current_data = result
+    
+    return chain_process
+
+
+def create_agent_chain_async(
+    agents: list,
+    dependency_graph: Optional[Dict[str, List[str]]] = None
+) -> Callable[[Dict], Awaitable[Dict]]:
+    """
+    Create an async processing chain from multiple agents.
+    
+    Without a dependency graph every agent depends on the previous one, so
+    stages are awaited in order. With a graph, agents are grouped into
+    levels and all agents in a level run concurrently via asyncio.gather.
+    
+    Args:
+        agents: List of BaseAgent instances
+        dependency_graph: Optional mapping of agent_name -> list of upstream
+            agent names. Agents without upstreams receive the initial input,
+            agents with one upstream receive its output, and agents with
+            several receive a dict of upstream outputs keyed by agent name.
+        
+    Returns:
+        Async function that processes data through all agents
+    """
+    if dependency_graph is None:
+        async def chain_process(initial_input: Dict) -> Dict:
+            current_data = initial_input
+            results = []
+            
+            for agent in agents:
+                result = await agent.safe_process_async(current_data)
+                results.append(result)
+                
+                # Stop chain if error occurred
+                if result.get("status") == "error":
+                    return {
+                        "status": "chain_failed",
+                        "failed_at": agent.agent_name,
+                        "results": results
+                    }
+                
+                current_data = result
+            
+            return {
+                "status": "chain_completed",
+                "final_output": current_data,
+                "all_results": results
+            }
+        
+        return chain_process
+    
+    levels = _topological_levels(agents, dependency_graph)
+    
+    async def graph_process(initial_input: Dict) -> Dict:
+        outputs: Dict[str, Dict] = {}
+        results = []
+        
+        for level in levels:
+            level_inputs = []
+            for agent in level:
+                upstream = dependency_graph.get(agent.agent_name, [])
+                if not upstream:
+                    level_inputs.append(initial_input)
+                elif len(upstream) == 1:
+                    level_inputs.append(outputs[upstream[0]])
+                else:
+                    level_inputs.append({name: outputs[name] for name in upstream})
+            
+            level_results = await asyncio.gather(*[
+                agent.safe_process_async(agent_input)
+                for agent, agent_input in zip(level, level_inputs)
+            ])
+            
+            for agent, result in zip(level, level_results):
+                results.append(result)
+                outputs[agent.agent_name] = result
+                
+                if result.get("status") == "error":
+                    return {
+                        "status": "chain_failed",
+                        "failed_at": agent.agent_name,
+                        "results": results
+                    }
+        
+        return {
+            "status": "chain_completed",
+            "final_output": results[-1] if results else initial_input,
+            "all_results": results
+        }
+    
+    return graph_process
+
+
+def create_agent_chain_batched(
+    agents: list,
+    batch_size: int = 8
+) -> Callable[[List[Dict]], Awaitable[List[Dict]]]:
+    """
+    Create an async chain that pipelines batches of inputs through agents.
+    
+    Each agent runs as its own stage connected by queues, so while stage k
+    works on batch i, stage k+1 can already work on batch i-1. Items that
+    fail at a stage are dropped from later stages.
+    
+    Args:
+        agents: List of BaseAgent instances
+        batch_size: Number of inputs handed to each stage at once
+        
+    Returns:
+        Async function mapping a list of inputs to a list of chain results
+        (same shape as create_agent_chain output), in input order
+    """
+    if batch_size < 1:
+        raise ValueError("batch_size must be at least 1")
+    
+    async def chain_process(inputs: List[Dict]) -> List[Dict]:
+        outcomes: List[Optional[Dict]] = [None] * len(inputs)
+        trails: List[List[Dict]] = [[] for _ in inputs]
+        queues = [asyncio.Queue() for _ in range(len(agents) + 1)]
+        
+        async def stage(agent, inbox: asyncio.Queue, outbox: asyncio.Queue) -> None:
+            while True:
+                batch = await inbox.get()
+                if batch is None:
+                    await outbox.put(None)
+                    return
+                
+                indices, payloads = batch
+                results = await agent.safe_process_batch_async(payloads)
+                
+                passed_indices, passed = [], []
+                for idx, result in zip(indices, results):
+                    trails[idx].append(result)
+                    if result.get("status") == "error":
+                        outcomes[idx] = {
+                            "status": "chain_failed",
+                            "failed_at": agent.agent_name,
+                            "results": trails[idx]
+                        }
+                    else:
+                        passed_indices.append(idx)
+                        passed.append(result)
+                
+                if passed:
+                    await outbox.put((passed_indices, passed))
+        
+        tasks = [
+            asyncio.create_task(stage(agent, queues[i], queues[i + 1]))
+            for i, agent in enumerate(agents)
+        ]
+        
+        for start in range(0, len(inputs), batch_size):
+            end = min(start + batch_size, len(inputs))
+            await queues[0].put((list(range(start, end)), inputs[start:end]))
+        await queues[0].put(None)
+        
+        await asyncio.gather(*tasks)
+        
+        final_queue = queues[-1]
+        while not final_queue.empty():
+            batch = final_queue.get_nowait()
+            if batch is None:
+                break
+            for idx, result in zip(*batch):
+                outcomes[idx] = {
+                    "status": "chain_completed",
+                    "final_output": result,
+                    "all_results": trails[idx]
+                }
+        
+        return outcomes
+    
+    return chain_process
+
+
+def _topological_levels(agents: list, dependency_graph: Dict[str, List[str]]) -> List[list]:
+    """
+    Group agents into levels where every agent only depends on earlier levels.
+    
+    Raises:
+        ValueError: If the graph references unknown agents or has a cycle
+    """
+    by_name = {agent.agent_name: agent for agent in agents}
+    unknown = {
+        name for deps in dependency_graph.values() for name in deps
+    } - set(by_name)
+    if unknown:
+        raise ValueError(f"Unknown agents in dependency graph: {', '.join(sorted(unknown))}")
+    
+    levels = []
+    placed = set()
+    remaining = list(agents)
+    
+    while remaining:
+        level = [
+            agent for agent in remaining
+            if all(dep in placed for dep in dependency_graph.get(agent.agent_name, []))
+        ]
+        if not level:
+            raise ValueError("Dependency graph contains a cycle")
+        levels.append(level)
+        placed.update(agent.agent_name for agent in level)
+        remaining = [agent for agent in remaining if agent not in level]
+    
+    return levels
+
+
+async def run_in_agent_executor(func: Callable, *args, **kwargs):
+    """
+    Run a blocking agent call on the shared agent executor.
+    
+    Lets agents that do not inherit from BaseAgent expose async entry
+    points backed by the same thread pool.
+    
+    Args:
+        func: Synchronous callable to run
+        *args, **kwargs: Arguments forwarded to func
+        
+    Returns:
+        Whatever func returns
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        BaseAgent._executor,
+        functools.partial(func, *args, **kwargs)
+    )
+
+
 def validate_agent_output(output: Dict, required_keys: list) -> bool:
     """
     Validate agent output has required structure.
@@ -285,6 +912,8 @@ class ExampleAgent(BaseAgent):
     Shows how to properly inherit and implement required methods.
     """
     
+    REQUIRED_FIELDS = ("required_field",)
+    
     def __init__(self, log_callback=None):
         super().__init__("ExampleAgent", log_callback)
         self.config = {}
@@ -303,7 +932,7 @@ class ExampleAgent(BaseAgent):
     
     def _validate_input(self, input_data: Dict) -> None:
         """Validate input structure."""
-        self._validate_required_fields(input_data, ["required_field"])
+        self._validate_required_fields(input_data)
     
     def _get_capabilities(self) -> list:
         """List agent capabilities."""
@@ -347,6 +976,11 @@ if __name__ == "__main__":
     print(f"   Chain status: {chain_result['status']}")
     print(f"   Number of steps: {len(chain_result.get('all_results', []))}")
     
+    print("\n5. Testing async agent chain:")
+    async_chain = create_agent_chain_async([agent1, agent2])
+    async_result = asyncio.run(async_chain(valid_input))
+    print(f"   Chain status: {async_result['status']}")
+    
     print("\n" + "=" * 60)
     print("✅ Base Agent class ready for production use")
     print("=" * 60)
\ No newline at end of file
@@ -6,24 +6,186 @@ Orchestrates all agents in the pipeline:
 1. Ingestion → 2. Imaging → 3. Therapy → 4. Pharmacy/Doctor → 5. Order Generation
 
 Handles:
-- Sequential agent execution
+- Async agent execution (sync wrapper kept for existing callers)
 - Error handling and fallbacks
 - Escalation decision logic
 - Event logging for observability
 - Final output consolidation
 """
 
+import asyncio
+import atexit
 import json
-from typing import Dict, List, Optional, Callable
+import logging
+import logging.handlers
+import itertools
+import queue
+import re
+import secrets
+import sys
+import threading
+import time
+from collections import deque
+from functools import lru_cache
+from typing import TYPE_CHECKING, Deque, Dict, List, Optional, Callable, Tuple
 from datetime import datetime
 from pathlib import Path
+from types import MappingProxyType
 
-# Import agents
-from agents.ingestion_agent import IngestionAgent
-from agents.imaging_agent import ImagingAgent
-from agents.therapy_agent import TherapyAgent
-from agents.pharmacy_agent import PharmacyAgent
-from agents.doctor_agent import DoctorAgent
+try:  # Optional dependency – faster session export serialization
+    import orjson  # type: ignore
+except Exception:  # pragma: no cover - optional dependency
+    orjson = None
+
+try:  # Optional dependency – non-blocking session export writes
+    import aiofiles  # type: ignore
+except Exception:  # pragma: no cover - optional dependency
+    aiofiles = None
+
+from agents.base_agent import _LEVEL_PREFIX, run_in_agent_executor
+from agents.doctor_agent import _CRITICAL_FLAG_RX
+
+# Agent classes are imported lazily (see the agent properties on Coordinator)
+# so paths like the emergency bypass never load the modules they don't use;
+# only the shared red-flag pattern comes from doctor_agent up front
+if TYPE_CHECKING:  # pragma: no cover - typing only
+    from agents.ingestion_agent import IngestionAgent
+    from agents.imaging_agent import ImagingAgent
+    from agents.therapy_agent import TherapyAgent
+    from agents.pharmacy_agent import PharmacyAgent
+    from agents.doctor_agent import DoctorAgent
+
+
+# Console echo of pipeline events goes through a queue drained by a
+# background thread, so agents never block on (or contend for) stdout.
+_EVENT_LOG_MAXLEN = 10_000
+_time = time.time
+_now = datetime.now
+
+# Lock-free ID sequences (one next() per ID); random start points keep
+# ids from different processes from lining up
+_SESSION_SEQ = itertools.count(secrets.randbelow(10_000))
+_ORDER_SEQ = itertools.count(secrets.randbelow(100_000_000))
+
+
+class _StdoutHandler(logging.StreamHandler):
+    """StreamHandler bound to whatever sys.stdout is when a record is written."""
+    
+    def __init__(self, level: int = logging.NOTSET):
+        logging.Handler.__init__(self, level)
+    
+    @property
+    def stream(self):
+        return sys.stdout
+
+
+_event_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+_console_handler = _StdoutHandler()
+_console_handler.setFormatter(logging.Formatter("%(message)s"))
+# Started by the first Coordinator, so importing this module spawns no thread
+_event_listener: Optional[logging.handlers.QueueListener] = None
+_event_listener_lock = threading.Lock()
+
+event_logger = logging.getLogger(__name__)
+event_logger.setLevel(logging.INFO)
+event_logger.propagate = False
+event_logger.addHandler(logging.handlers.QueueHandler(_event_queue))
+
+
+def _start_event_listener() -> None:
+    """Start the console listener thread once per process."""
+    global _event_listener
+    if _event_listener is not None:
+        return
+    with _event_listener_lock:
+        if _event_listener is None:
+            listener = logging.handlers.QueueListener(_event_queue, _console_handler)
+            listener.start()
+            atexit.register(listener.stop)
+            _event_listener = listener
+
+# Emergency markers in imaging red flags: the critical tags plus explicit
+# calls for emergency services (any case, e.g. "Call 108")
+_EMERGENCY_FLAG_RX = re.compile(rf"{_CRITICAL_FLAG_RX.pattern}|CALL 911|CALL 108", re.IGNORECASE)
+# Escalation rule only honours the upper-case severity tags
+_ESCALATION_FLAG_RX = re.compile(r"CRITICAL|EMERGENCY")
+
+
+@lru_cache(maxsize=128)
+def _flags_are_critical(red_flags: Tuple[str, ...]) -> bool:
+    """Cached emergency check, keyed on the (hashable) red-flag tuple."""
+    return any(_EMERGENCY_FLAG_RX.search(flag) for flag in red_flags)
+
+
+@lru_cache(maxsize=32)
+def _escalation_reason_cached(
+    has_red_flags: bool,
+    requires_rx: bool,
+    severe: bool,
+    has_otc: bool,
+    low_confidence: bool
+) -> str:
+    """Build the escalation reason string from its boolean fingerprint."""
+    reasons = []
+    
+    if has_red_flags:
+        reasons.append("Red flags detected")
+    
+    if requires_rx:
+        reasons.append("Prescription medication required")
+    
+    if severe:
+        reasons.append("Severe condition")
+    
+    if not has_otc:
+        reasons.append("No suitable OTC treatment")
+    
+    if low_confidence:
+        reasons.append("Low diagnostic confidence")
+    
+    return " | ".join(reasons) if reasons else "Medical consultation recommended"
+
+
+def _serialize_session(session_data: Dict) -> bytes:
+    """Serialize exported session data as indented JSON bytes."""
+    if orjson is not None:
+        return orjson.dumps(session_data, option=orjson.OPT_INDENT_2, default=str)
+    return json.dumps(session_data, indent=2, default=str).encode("utf-8")
+
+
+# Pharmacy outcome -> (log level, message template, field defaults)
+_PHARMACY_OUTCOMES = {
+    "error": ("WARNING", "Pharmacy matching failed: {message}", {"message": "Unknown error"}),
+    "no_stock": ("WARNING", "Pharmacy issue: {message}", {"message": "Stock unavailable"}),
+    "partial": ("WARNING", "Partial stock available: {stock_percentage}%", {}),
+    "ok": (
+        "SUCCESS",
+        "Pharmacy matched: {pharmacy_name} ({distance_km}km, ETA: {eta_min}min)",
+        {}
+    ),
+}
+
+
+class _TemplateFields(dict):
+    """format_map() source that renders absent fields as None."""
+    
+    def __missing__(self, key: str) -> None:
+        return None
+
+
+def _classify_pharmacy(pharmacy_result: Dict) -> str:
+    """Bucket a PharmacyAgent result into a _PHARMACY_OUTCOMES key."""
+    if pharmacy_result.get("status") == "error":
+        return "error"
+    if pharmacy_result.get("availability") in ("no_pharmacies", "out_of_stock"):
+        return "no_stock"
+    if pharmacy_result.get("stock_percentage", 0) < 100:
+        return "partial"
+    return "ok"
+
+
+# (unix_time, agent, level, message, metadata)
+EventRecord = Tuple[float, str, str, str, Optional[Dict]]
 
 
 class Coordinator:
@@ -36,51 +198,177 @@ class Coordinator:
     - Handle errors gracefully
     - Log all events for observability
     - Generate final recommendations/orders
+    
+    A Coordinator is NOT coroutine-safe: the event log and current session
+    are per-instance state, so concurrent sessions each need their own
+    Coordinator. Agent calls run on the shared agent executor, which also
+    bounds how many agent calls run at once across sessions.
     """
     
+    # Fixed attribute set: no per-instance __dict__ (cheap per-session instances)
+    __slots__ = (
+        "event_log",
+        "data_dir",
+        "upload_dir",
+        "current_session",
+        "_run_started_iso",
+        "_ingestion_agent",
+        "_imaging_agent",
+        "_therapy_agent",
+        "_pharmacy_agent",
+        "_doctor_agent",
+        "_agent_lock",
+    )
+    
+    # Constant parts of the response payloads; per-run fields are merged in.
+    # Recommendation tuples are shared across responses (serialize as lists).
+    _EMERGENCY_TEMPLATE = MappingProxyType({
+        "status": "EMERGENCY",
+        "severity": "CRITICAL",
+        "action_required": "IMMEDIATE_MEDICAL_ATTENTION",
+        "message": "🚨 EMERGENCY: This case requires IMMEDIATE medical attention. Call emergency services (911/108) now.",
+        "recommendations": (
+            "🚨 CALL EMERGENCY SERVICES IMMEDIATELY (911/108)",
+            "Do NOT wait or attempt self-treatment",
+            "Go to nearest emergency room",
+            "If chest pain/breathing difficulty: Call ambulance immediately"
+        ),
+        "disclaimer": "⚠️ CRITICAL SITUATION - Seek professional emergency care NOW"
+    })
+    
+    _ESCALATION_TEMPLATE = MappingProxyType({
+        "status": "ESCALATED",
+        "action_required": "DOCTOR_CONSULTATION",
+        "message": "⚠️ This case requires professional medical consultation",
+        "recommendations": (
+            "👨‍⚕️ Schedule appointment with doctor within 24-48 hours",
+            "📋 Bring this report and X-ray to consultation",
+            "🩺 Consider tele-consultation for faster access",
+            "⚠️ If symptoms worsen, seek immediate care"
+        ),
+        "disclaimer": "⚠️ Professional medical evaluation required - NOT FOR SELF-TREATMENT"
+    })
+    
+    _ESCALATION_NEXT_STEPS = MappingProxyType({
+        "immediate": "Book doctor appointment",
+        "monitoring": "Track symptoms daily",
+        "emergency_triggers": "Worsening symptoms, high fever, breathing difficulty"
+    })
+    
+    _FAILURE_TEMPLATE = MappingProxyType({
+        "status": "FAILED",
+        "recommendations": (
+            "Please try again with different files",
+            "Ensure X-ray image is clear and in PNG/JPG format",
+            "If problem persists, consult doctor directly"
+        ),
+        "disclaimer": "⚠️ System error - Please consult healthcare professional directly"
+    })
+    
+    _SUCCESS_DISCLAIMERS = (
+        "⚠️ EDUCATIONAL DEMONSTRATION ONLY - NOT MEDICAL ADVICE",
+        "This system does NOT provide medical diagnoses",
+        "Always consult qualified healthcare professionals",
+        "In emergency, call 911/108 immediately"
+    )
+    
     def __init__(self, data_dir: str = "./data", upload_dir: str = "./uploads"):
         """
-        Initialize coordinator with all agents.
+        Initialize coordinator (agents are constructed on first use).
         
         Args:
             data_dir: Path to data folder with CSVs/JSONs
             upload_dir: Path to uploads folder
         """
-        # Event log for tracking
-        self.event_log: List[Dict] = []
-        
-        # Initialize agents with logging callback
-        self.ingestion_agent = IngestionAgent(
-            upload_dir=upload_dir,
-            log_callback=self._log_event
-        )
-        
-        self.imaging_agent = ImagingAgent(
-            log_callback=self._log_event
-        )
-        
-        self.therapy_agent = TherapyAgent(
-            data_dir=data_dir,
-            log_callback=self._log_event
-        )
-        
-        # Pharmacy and Doctor agents
-        self.pharmacy_agent = PharmacyAgent(
-            data_dir=data_dir,
-            log_callback=self._log_event
-        )
-        
-        self.doctor_agent = DoctorAgent(
-            data_dir=data_dir,
-            log_callback=self._log_event
-        )
+        _start_event_listener()
+        
+        # Event log for tracking (bounded; dicts are built on read)
+        self.event_log: Deque[EventRecord] = deque(maxlen=_EVENT_LOG_MAXLEN)
+        
+        # Agents are constructed on first use with the logging callback
+        self.data_dir = data_dir
+        self.upload_dir = upload_dir
+        self._ingestion_agent: Optional["IngestionAgent"] = None
+        self._imaging_agent: Optional["ImagingAgent"] = None
+        self._therapy_agent: Optional["TherapyAgent"] = None
+        self._pharmacy_agent: Optional["PharmacyAgent"] = None
+        self._doctor_agent: Optional["DoctorAgent"] = None
+        # Guards cold construction on the executor (see _aget_agent)
+        self._agent_lock = threading.Lock()
         
         # Pipeline state
         self.current_session = None
+        self._run_started_iso: Optional[str] = None  # shared timestamp for the current run
         
         self._log_event("Coordinator", "INFO", "Coordinator initialized successfully")
     
+    # ============= AGENTS (lazily constructed) =============
+    
+    @property
+    def ingestion_agent(self) -> "IngestionAgent":
+        if self._ingestion_agent is None:
+            from agents.ingestion_agent import IngestionAgent
+            self._ingestion_agent = IngestionAgent(
+                upload_dir=self.upload_dir,
+                log_callback=self._log_event
+            )
+        return self._ingestion_agent
+    
+    @property
+    def imaging_agent(self) -> "ImagingAgent":
+        if self._imaging_agent is None:
+            from agents.imaging_agent import ImagingAgent
+            self._imaging_agent = ImagingAgent(
+                log_callback=self._log_event
+            )
+        return self._imaging_agent
+    
+    @property
+    def therapy_agent(self) -> "TherapyAgent":
+        if self._therapy_agent is None:
+            from agents.therapy_agent import TherapyAgent
+            self._therapy_agent = TherapyAgent(
+                data_dir=self.data_dir,
+                log_callback=self._log_event
+            )
+        return self._therapy_agent
+    
+    @property
+    def pharmacy_agent(self) -> "PharmacyAgent":
+        if self._pharmacy_agent is None:
+            from agents.pharmacy_agent import PharmacyAgent
+            self._pharmacy_agent = PharmacyAgent(
+                data_dir=self.data_dir,
+                log_callback=self._log_event
+            )
+        return self._pharmacy_agent
+    
+    @property
+    def doctor_agent(self) -> "DoctorAgent":
+        if self._doctor_agent is None:
+            from agents.doctor_agent import DoctorAgent
+            self._doctor_agent = DoctorAgent(
+                data_dir=self.data_dir,
+                log_callback=self._log_event
+            )
+        return self._doctor_agent
+    
     def execute_pipeline(self, upload_data: Dict) -> Dict:
+        """
+        Synchronous wrapper around aexecute_pipeline().
+        
+        Must not be called from inside a running event loop; async callers
+        should await aexecute_pipeline() directly.
+        
+        Args:
+            upload_data: Raw upload data from UI
+        
+        Returns:
+            Dict: Complete pipeline result with recommendations/order
+        """
+        return asyncio.run(self.aexecute_pipeline(upload_data))
+    
+    async def aexecute_pipeline(self, upload_data: Dict) -> Dict:
         """
         Main pipeline execution method.
         
@@ -103,17 +391,30 @@ class Coordinator:
         
         self._log_event("Coordinator", "INFO", f"Starting pipeline execution - Session: {session_id}")
         
+        pharmacy_prefetch = None
+        
         try:
             # ===== STEP 1: INGESTION =====
             self._log_event("Coordinator", "INFO", "STEP 1: Ingestion Agent")
-            ingestion_result = self.ingestion_agent.process(upload_data)
+            ingestion_agent = await self._aget_agent("ingestion_agent")
+            ingestion_result = await ingestion_agent.process_async(upload_data)
             
             if ingestion_result.get("status") == "error":
                 return self._pipeline_failed("Ingestion", ingestion_result.get("error"))
             
+            # Speculatively locate nearby pharmacies (only needs the location)
+            # while Imaging/Therapy run; discarded on emergency/escalation/failure.
+            # Only once the Pharmacy Agent exists: building it here would load
+            # its data even on paths that never reach pharmacy matching
+            if self._pharmacy_agent is not None:
+                pharmacy_prefetch = asyncio.create_task(
+                    self._aprefetch_pharmacies(ingestion_result.get("location", {}))
+                )
+            
             # ===== STEP 2: IMAGING =====
             self._log_event("Coordinator", "INFO", "STEP 2: Imaging Agent")
-            imaging_result = self.imaging_agent.process(ingestion_result)
+            imaging_agent = await self._aget_agent("imaging_agent")
+            imaging_result = await imaging_agent.process_async(ingestion_result)
             
             if imaging_result.get("error"):
                 return self._pipeline_failed("Imaging", imaging_result.get("error"))
@@ -130,7 +431,8 @@ class Coordinator:
             
             # ===== STEP 3: THERAPY =====
             self._log_event("Coordinator", "INFO", "STEP 3: Therapy Agent")
-            therapy_result = self.therapy_agent.process(
+            therapy_agent = await self._aget_agent("therapy_agent")
+            therapy_result = await therapy_agent.process_async(
                 imaging_output=imaging_result,
                 patient_data=ingestion_result.get("patient", {})
             )
@@ -147,55 +449,79 @@ class Coordinator:
             
             if should_escalate:
                 self._log_event("Coordinator", "WARNING", "Case requires doctor consultation")
+                escalation_reason = self._get_escalation_reason(imaging_result, therapy_result)
+                
+                # Call Doctor Agent for escalation (scheduled now, so it runs
+                # while the pharmacy fallback below is prepared)
+                doctor_agent = await self._aget_agent("doctor_agent")
+                doctor_task = asyncio.create_task(
+                    doctor_agent.process_async({
+                        "imaging_result": imaging_result,
+                        "therapy_result": therapy_result,
+                        "patient": ingestion_result.get("patient", {}),
+                        "escalation_reason": escalation_reason
+                    })
+                )
+                escalation_tasks = [doctor_task]
                 
-                # Call Doctor Agent for escalation
-                doctor_result = self.doctor_agent.process({
-                    "imaging_result": imaging_result,
-                    "therapy_result": therapy_result,
-                    "patient": ingestion_result.get("patient", {}),
-                    "escalation_reason": self._get_escalation_reason(imaging_result, therapy_result)
-                })
+                # OTC options exist: match a pharmacy concurrently as a fallback
+                # while the patient waits for the consultation
+                try:
+                    if therapy_result.get("otc_options"):
+                        pharmacy_agent = await self._aget_agent("pharmacy_agent")
+                        escalation_tasks.append(
+                            pharmacy_agent.process_async(
+                                therapy_result=therapy_result,
+                                location=ingestion_result.get("location", {}),
+                                prefetched=await self._await_prefetch(pharmacy_prefetch)
+                            )
+                        )
+                except BaseException:
+                    doctor_task.cancel()
+                    raise
+                
+                doctor_result, *fallback = await asyncio.gather(
+                    *escalation_tasks,
+                    return_exceptions=True
+                )
+                
+                if isinstance(doctor_result, BaseException):
+                    return self._pipeline_failed("Doctor", str(doctor_result))
+                
+                pharmacy_fallback = fallback[0] if fallback else None
+                if isinstance(pharmacy_fallback, BaseException):
+                    self._log_event("Coordinator", "WARNING",
+                        f"Fallback pharmacy matching failed: {pharmacy_fallback}")
+                    pharmacy_fallback = None
                 
                 # Return escalation response with doctor recommendations
                 return self._doctor_escalation_response(
                     ingestion_result,
                     imaging_result,
                     therapy_result,
-                    doctor_result
+                    doctor_result,
+                    pharmacy_fallback,
+                    escalation_reason
                 )
             
-            # ===== STEP 4: PHARMACY (if OTC treatment suitable) =====
-            # ===== STEP 4: PHARMACY (if OTC treatment suitable) =====
             # ===== STEP 4: PHARMACY (if OTC treatment suitable) =====
             if therapy_result.get("otc_options"):
                 self._log_event("Coordinator", "INFO", "STEP 4: Pharmacy Matching")
                 
                 # Call Pharmacy Agent
-                pharmacy_result = self.pharmacy_agent.process(
+                pharmacy_agent = await self._aget_agent("pharmacy_agent")
+                pharmacy_result = await pharmacy_agent.process_async(
                     therapy_result=therapy_result,
-                    location=ingestion_result.get("location", {})
+                    location=ingestion_result.get("location", {}),
+                    prefetched=await self._await_prefetch(pharmacy_prefetch)
                 )
                 
-                # Check pharmacy matching status
-                if pharmacy_result.get("status") == "error":
-                    self._log_event("Coordinator", "WARNING", 
-                        f"Pharmacy matching failed: {pharmacy_result.get('message', 'Unknown error')}")
-                    # Could escalate to doctor here if needed
-                
-                elif pharmacy_result.get("availability") in ["no_pharmacies", "out_of_stock"]:
-                    self._log_event("Coordinator", "WARNING", 
-                        f"Pharmacy issue: {pharmacy_result.get('message', 'Stock unavailable')}")
-                    # Offer alternative: tele-consultation or different location
-                
-                elif pharmacy_result.get("stock_percentage", 0) < 100:
-                    self._log_event("Coordinator", "WARNING", 
-                        f"Partial stock available: {pharmacy_result.get('stock_percentage')}%")
-                    # Continue but warn user
-                
-                else:
-                    self._log_event("Coordinator", "SUCCESS", 
-                        f"Pharmacy matched: {pharmacy_result.get('pharmacy_name')} "
-                        f"({pharmacy_result.get('distance_km')}km, ETA: {pharmacy_result.get('eta_min')}min)")
+                # Log pharmacy matching outcome (error / no stock / partial / matched)
+                level, template, defaults = _PHARMACY_OUTCOMES[_classify_pharmacy(pharmacy_result)]
+                self._log_event(
+                    "Coordinator", level,
+                    template.format_map(_TemplateFields(defaults, **pharmacy_result))
+                )
             else:
                 pharmacy_result = None
                 self._log_event("Coordinator", "INFO", "No pharmacy matching needed (escalation case)")
@@ -218,6 +544,62 @@ class Coordinator:
         except Exception as e:
             self._log_event("Coordinator", "ERROR", f"Pipeline failed: {str(e)}")
             return self._pipeline_failed("System", str(e))
+        
+        finally:
+            self._discard_prefetch(pharmacy_prefetch)
+    
+    async def _aget_agent(self, name: str):
+        """
+        Resolve a lazily constructed agent without blocking the event loop.
+        
+        Construction imports the agent module and may load CSV/JSON data
+        (Therapy, Pharmacy, Doctor), so a cold first access is run on the
+        shared agent executor.
+        """
+        agent = getattr(self, f"_{name}")
+        if agent is None:
+            agent = await run_in_agent_executor(self._build_agent, name)
+        return agent
+    
+    def _build_agent(self, name: str):
+        """Construct an agent under the lock so racing callers build it only once."""
+        with self._agent_lock:
+            return getattr(self, name)
+    
+    async def _aprefetch_pharmacies(self, location: Dict) -> Dict:
+        """Speculative pharmacy lookup (see PharmacyAgent.prefetch_pharmacies)."""
+        return await self._pharmacy_agent.prefetch_pharmacies_async(location)
+    
+    async def _await_prefetch(self, task: Optional[asyncio.Task]) -> Optional[Dict]:
+        """
+        Collect speculative pharmacy candidates.
+        
+        Returns None when the prefetch failed, so the Pharmacy Agent
+        falls back to resolving the location itself.
+        """
+        if task is None:
+            return None
+        
+        try:
+            return await task
+        except Exception as e:
+            self._log_event("Coordinator", "WARNING", f"Pharmacy prefetch failed: {str(e)}")
+            return None
+    
+    def _discard_prefetch(self, task: Optional[asyncio.Task]) -> None:
+        """
+        Cancel an unused prefetch, or consume its outcome if it already finished.
+        
+        Cancelling stops the asyncio task only: a lookup already running on
+        the agent executor still finishes there and its result is dropped.
+        """
+        if task is None:
+            return
+        
+        if not task.done():
+            task.cancel()
+        elif not task.cancelled():
+            task.exception()
     
     def _should_escalate_to_doctor(
         self,
@@ -232,8 +614,7 @@ class Coordinator:
         Only escalate for true medical necessity.
         """
         # Rule 1: CRITICAL/EMERGENCY red flags = escalate (not all red flags)
-        critical_red_flags = [flag for flag in red_flags if "CRITICAL" in flag or "EMERGENCY" in flag]
-        if critical_red_flags:
+        if any(_ESCALATION_FLAG_RX.search(flag) for flag in red_flags):
             return True
         
         # Rule 2: Therapy agent explicitly says escalate
@@ -266,13 +647,7 @@ class Coordinator:
         """
         Check if any red flags are CRITICAL (emergency level).
         """
-        critical_keywords = ["CRITICAL", "EMERGENCY", "CALL 911", "CALL 108"]
-        
-        for flag in red_flags:
-            if any(keyword in flag.upper() for keyword in critical_keywords):
-                return True
-        
-        return False
+        return _flags_are_critical(tuple(red_flags))
     
     def _emergency_response(
         self,
@@ -283,23 +658,13 @@ class Coordinator:
         Generate emergency response (bypass normal flow).
         """
         return {
-            "status": "EMERGENCY",
-            "severity": "CRITICAL",
-            "action_required": "IMMEDIATE_MEDICAL_ATTENTION",
-            "message": "🚨 EMERGENCY: This case requires IMMEDIATE medical attention. Call emergency services (911/108) now.",
+            **self._EMERGENCY_TEMPLATE,
             "red_flags": imaging_result.get("red_flags", []),
             "patient": ingestion_result.get("patient", {}),
             "condition": imaging_result.get("condition_probs", {}),
-            "recommendations": [
-                "🚨 CALL EMERGENCY SERVICES IMMEDIATELY (911/108)",
-                "Do NOT wait or attempt self-treatment",
-                "Go to nearest emergency room",
-                "If chest pain/breathing difficulty: Call ambulance immediately"
-            ],
-            "disclaimer": "⚠️ CRITICAL SITUATION - Seek professional emergency care NOW",
             "session_id": self.current_session,
-            "timestamp": datetime.now().isoformat(),
-            "event_log": self.event_log
+            "timestamp": self._run_timestamp(),
+            "event_log": self.get_event_log()
         }
     
     def _doctor_escalation_response(
@@ -307,16 +672,19 @@ class Coordinator:
         ingestion_result: Dict,
         imaging_result: Dict,
         therapy_result: Dict,
-        doctor_result: Dict = None
+        doctor_result: Dict = None,
+        pharmacy_fallback: Optional[Dict] = None,
+        escalation_reason: Optional[str] = None
     ) -> Dict:
         """
         Generate doctor escalation response.
         """
-        return {
-            "status": "ESCALATED",
+        if escalation_reason is None:
+            escalation_reason = self._get_escalation_reason(imaging_result, therapy_result)
+        
+        response = {
+            **self._ESCALATION_TEMPLATE,
             "severity": imaging_result.get("severity_hint", "moderate"),
-            "action_required": "DOCTOR_CONSULTATION",
-            "message": "⚠️ This case requires professional medical consultation",
             "patient": ingestion_result.get("patient", {}),
             "condition": {
                 "probs": imaging_result.get("condition_probs", {}),
@@ -325,22 +693,11 @@ class Coordinator:
             },
             "red_flags": imaging_result.get("red_flags", []),
             "therapy_notes": therapy_result.get("safety_advice", []),
-            "recommendations": [
-                "👨‍⚕️ Schedule appointment with doctor within 24-48 hours",
-                "📋 Bring this report and X-ray to consultation",
-                "🩺 Consider tele-consultation for faster access",
-                "⚠️ If symptoms worsen, seek immediate care"
-            ],
-            "escalation_reason": self._get_escalation_reason(imaging_result, therapy_result),
-            "next_steps": {
-                "immediate": "Book doctor appointment",
-                "monitoring": "Track symptoms daily",
-                "emergency_triggers": "Worsening symptoms, high fever, breathing difficulty"
-            },
-            "disclaimer": "⚠️ Professional medical evaluation required - NOT FOR SELF-TREATMENT",
+            "escalation_reason": escalation_reason,
+            "next_steps": dict(self._ESCALATION_NEXT_STEPS),
             "session_id": self.current_session,
-            "timestamp": datetime.now().isoformat(),
-            "event_log": self.event_log,
+            "timestamp": self._run_timestamp(),
+            "event_log": self.get_event_log(),
             
             # Doctor recommendations from DoctorAgent
             "doctor_recommendations": doctor_result if doctor_result else {
@@ -348,6 +705,12 @@ class Coordinator:
                 "message": "Please contact healthcare provider directly"
             }
         }
+        
+        # OTC pharmacy match gathered alongside the doctor lookup, if any
+        if pharmacy_fallback and pharmacy_fallback.get("status") == "success":
+            response["pharmacy_fallback"] = pharmacy_fallback
+        
+        return response
     
     def _get_escalation_reason(
         self,
@@ -355,24 +718,13 @@ class Coordinator:
         therapy_result: Dict
     ) -> str:
         """Determine why escalation is needed."""
-        reasons = []
-        
-        if imaging_result.get("red_flags"):
-            reasons.append("Red flags detected")
-        
-        if therapy_result.get("requires_prescription"):
-            reasons.append("Prescription medication required")
-        
-        if imaging_result.get("severity_hint") == "severe":
-            reasons.append("Severe condition")
-        
-        if not therapy_result.get("otc_options"):
-            reasons.append("No suitable OTC treatment")
-        
-        if imaging_result.get("confidence", 1.0) < 0.5:
-            reasons.append("Low diagnostic confidence")
-        
-        return " | ".join(reasons) if reasons else "Medical consultation recommended"
+        return _escalation_reason_cached(
+            bool(imaging_result.get("red_flags")),
+            bool(therapy_result.get("requires_prescription")),
+            imaging_result.get("severity_hint") == "severe",
+            bool(therapy_result.get("otc_options")),
+            imaging_result.get("confidence", 1.0) < 0.5
+        )
     
     
     def _consolidate_results(
@@ -388,9 +740,10 @@ class Coordinator:
         """
         # Determine overall status
         severity = imaging.get("severity_hint", "mild")
-        has_red_flags = len(imaging.get("red_flags", [])) > 0
+        condition_probs = imaging.get("condition_probs", {})
+        red_flags = imaging.get("red_flags", [])
         
-        if has_red_flags:
+        if red_flags:
             status_level = "WARNING"
         elif severity == "severe":
             status_level = "WARNING"
@@ -409,14 +762,14 @@ class Coordinator:
             
             # Medical Assessment
             "assessment": {
-                "condition_probabilities": imaging.get("condition_probs", {}),
+                "condition_probabilities": condition_probs,
                 "primary_condition": max(
-                    imaging.get("condition_probs", {}).items(),
-                    key=lambda x: x[1]
-                )[0] if imaging.get("condition_probs") else "unknown",
+                    condition_probs,
+                    key=condition_probs.__getitem__
+                ) if condition_probs else "unknown",
                 "severity": severity,
                 "confidence": imaging.get("confidence", 0),
-                "red_flags": imaging.get("red_flags", []),
+                "red_flags": red_flags,
             },
             
             # Treatment Recommendations
@@ -437,16 +790,10 @@ class Coordinator:
             "recommendations": imaging.get("recommendations", []),
             
             # Safety & Disclaimers
-            "disclaimers": [
-                "⚠️ EDUCATIONAL DEMONSTRATION ONLY - NOT MEDICAL ADVICE",
-                "This system does NOT provide medical diagnoses",
-                "Always consult qualified healthcare professionals",
-                "In emergency, call 911/108 immediately",
-                therapy.get("disclaimer", "")
-            ],
+            "disclaimers": [*self._SUCCESS_DISCLAIMERS, therapy.get("disclaimer", "")],
             
             # Metadata
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": self._run_timestamp(),
             "processing_summary": {
                 "ingestion": "completed",
                 "imaging": "completed",
@@ -456,7 +803,7 @@ class Coordinator:
             },
             
             # Event log for observability
-            "event_log": self.event_log
+            "event_log": self.get_event_log()
         }
     
     def _generate_order_summary(
@@ -467,9 +814,7 @@ class Coordinator:
         """
         Generate order summary from pharmacy data.
         """
-        import random
-        
-        order_id = f"ORD{random.randint(10000000, 99999999)}"
+        order_id = f"ORD{next(_ORDER_SEQ) % 100_000_000:08d}"
         
         # Use REAL data from Pharmacy Agent ✅
         items = pharmacy_result.get("items", [])
@@ -509,28 +854,27 @@ class Coordinator:
         self._log_event("Coordinator", "ERROR", f"Pipeline failed at {failed_stage}: {error}")
         
         return {
-            "status": "FAILED",
+            **self._FAILURE_TEMPLATE,
             "failed_at": failed_stage,
             "error": error,
             "message": f"Unable to complete analysis. Error in {failed_stage} stage.",
-            "recommendations": [
-                "Please try again with different files",
-                "Ensure X-ray image is clear and in PNG/JPG format",
-                "If problem persists, consult doctor directly"
-            ],
-            "disclaimer": "⚠️ System error - Please consult healthcare professional directly",
             "session_id": self.current_session,
-            "timestamp": datetime.now().isoformat(),
-            "event_log": self.event_log
+            "timestamp": self._run_timestamp(),
+            "event_log": self.get_event_log()
         }
     
     def _create_session(self) -> str:
         """Create unique session ID."""
-        import random
-        session_id = f"SES{datetime.now().strftime('%Y%m%d%H%M%S')}{random.randint(1000, 9999)}"
+        started = _now()
+        session_id = f"SES{started.strftime('%Y%m%d%H%M%S')}{next(_SESSION_SEQ) % 10_000:04d}"
         self.current_session = session_id
+        self._run_started_iso = started.isoformat()
         return session_id
     
+    def _run_timestamp(self) -> str:
+        """ISO timestamp of the current run (taken once in _create_session)."""
+        return self._run_started_iso or _now().isoformat()
+    
     def _log_event(
         self,
         agent_name: str,
@@ -547,36 +891,32 @@ class Coordinator:
             message: Log message
             metadata: Optional additional data
         """
-        event = {
-            "timestamp": datetime.now().isoformat(),
-            "agent": agent_name,
-            "level": level,
-            "message": message
-        }
-        
-        if metadata:
-            event["metadata"] = metadata
-        
-        self.event_log.append(event)
+        self.event_log.append((_time(), agent_name, level, message, metadata or None))
         
-        # Also print to console for debugging
-        prefix = {
-            "INFO": "ℹ️",
-            "SUCCESS": "✅",
-            "WARNING": "⚠️",
-            "ERROR": "❌",
-            "CRITICAL": "🚨"
-        }.get(level, "•")
-        
-        print(f"{prefix} [{level}] {agent_name}: {message}")
+        # Also echo to console for debugging (written by the listener thread)
+        event_logger.info(
+            "%s [%s] %s: %s",
+            _LEVEL_PREFIX.get(level, "•"), level, agent_name, message
+        )
     
     def get_event_log(self) -> List[Dict]:
         """Get complete event log for current session."""
-        return self.event_log
+        events = []
+        for timestamp, agent_name, level, message, metadata in self.event_log:
+            event = {
+                "timestamp": datetime.fromtimestamp(timestamp).isoformat(),
+                "agent": agent_name,
+                "level": level,
+                "message": message
+            }
+            if metadata:
+                event["metadata"] = metadata
+            events.append(event)
+        return events
     
     def clear_event_log(self) -> None:
         """Clear event log (for new session)."""
-        self.event_log = []
+        self.event_log.clear()
     
     def export_session(self, output_path: str) -> None:
         """
@@ -585,16 +925,34 @@ class Coordinator:
         Args:
             output_path: Path to save session JSON
         """
-        session_data = {
-            "session_id": self.current_session,
-            "event_log": self.event_log,
-            "exported_at": datetime.now().isoformat()
-        }
+        Path(output_path).write_bytes(_serialize_session(self._session_export_data()))
+        
+        self._log_event("Coordinator", "INFO", f"Session exported to {output_path}")
+    
+    async def aexport_session(self, output_path: str) -> None:
+        """
+        Async variant of export_session() that keeps file I/O off the event loop.
         
-        with open(output_path, 'w') as f:
-            json.dump(session_data, f, indent=2)
+        Args:
+            output_path: Path to save session JSON
+        """
+        data = _serialize_session(self._session_export_data())
+        
+        if aiofiles is not None:
+            async with aiofiles.open(output_path, "wb") as f:
+                await f.write(data)
+        else:
+            await run_in_agent_executor(Path(output_path).write_bytes, data)
         
         self._log_event("Coordinator", "INFO", f"Session exported to {output_path}")
+    
+    def _session_export_data(self) -> Dict:
+        """Snapshot of the current session for export."""
+        return {
+            "session_id": self.current_session,
+            "event_log": self.get_event_log(),
+            "exported_at": _now().isoformat()
+        }
 
 
 # ============= DEMO & TESTING =============
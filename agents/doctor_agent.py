@@ -10,11 +10,120 @@ Responsibilities:
 - Escalation handling for cases requiring medical attention
 """
 
+import copy
+import hashlib
+import json
 import os
+import re
+import threading
+from bisect import bisect_right
+from collections import OrderedDict
+from types import MappingProxyType
+import numpy as np
 import pandas as pd
-from typing import Dict, List, Optional
+from functools import lru_cache
+from typing import Any, Dict, List, Mapping, NamedTuple, Optional, Tuple
 from datetime import datetime, timedelta
-import random
+
+try:  # Optional dependency – faster cache-key serialization
+    import orjson  # type: ignore
+except Exception:  # pragma: no cover - optional dependency
+    orjson = None
+
+try:  # Optional dependency – fused scoring kernel for large doctor tables
+    from numba import njit  # type: ignore
+except Exception:  # pragma: no cover - optional dependency
+    njit = None
+
+from agents.base_agent import BaseAgent, run_in_agent_executor
+
+
+_NO_ROWS = np.empty(0, dtype=np.intp)
+# Shared read-only defaults for missing request fields (no per-call literals)
+_EMPTY_MAPPING = MappingProxyType({})
+_GENERAL_PHYSICIAN_ONLY = ("General Physician",)
+# Below this many candidates the NumPy path is already cheaper than a JIT call
+_JIT_MIN_CANDIDATES = 512
+# Critical red-flag tags in any case (the coordinator builds its emergency check on this)
+_CRITICAL_FLAG_RX = re.compile(r"CRITICAL|EMERGENCY", re.IGNORECASE)
+_BASE_BOOKING_INSTRUCTIONS = (
+    "1. Select a doctor from the recommended list",
+    "2. Choose an available time slot",
+    "3. Prepare your medical history and symptoms",
+    "4. Have X-ray images and reports ready",
+    "5. Join the tele-consultation at scheduled time",
+)
+
+
+class _DoctorTable(NamedTuple):
+    """Parsed doctors.csv shared by all DoctorAgent instances."""
+    
+    df: pd.DataFrame
+    records: List[Dict[str, Any]]
+    specialty_codes: np.ndarray
+    specialties: pd.Index
+    experience: np.ndarray
+    tele: np.ndarray
+    slot_schedules: List[Tuple[List[datetime], List[str]]]
+    base_records: List[Mapping[str, Any]]
+    specialty_rows: Dict[str, np.ndarray]
+    specialty_index: Dict[str, List[Dict[str, Any]]]
+    general_physician_rows: np.ndarray
+
+
+def _score_kernel(spec_ids, experience, tele, affinity_row, urgent, jitter, out):
+    """Fill ``out`` with capped match scores in one pass (same rules as NumPy path)."""
+    for i in range(spec_ids.shape[0]):
+        years = experience[i]
+        if years >= 15:
+            score = 30
+        elif years >= 10:
+            score = 25
+        elif years >= 5:
+            score = 20
+        else:
+            score = 15
+        
+        score += affinity_row[spec_ids[i]] + jitter[i]
+        if tele[i]:
+            score += 20
+        if urgent and years >= 10:
+            score += 5
+        out[i] = min(score, 100)
+
+
+# Compiled once per process (and cached on disk) when numba is installed
+_score_kernel_jit = njit(cache=True)(_score_kernel) if njit is not None else None
+
+
+@lru_cache(maxsize=2048)
+def _build_recommendation_reason(specialty: str, condition: str, experience: int) -> str:
+    """Build the recommendation reason (memoized; inputs have low cardinality)."""
+    reasons = []
+    
+    # Specialty reason
+    if specialty == "Pulmonologist":
+        reasons.append("Specialist in respiratory and lung conditions")
+    elif specialty == "Infectious Disease Specialist":
+        reasons.append("Expert in infectious diseases and complicated infections")
+    elif specialty == "General Physician":
+        reasons.append("Experienced in general medicine and initial diagnosis")
+    elif specialty == "Pediatrician":
+        reasons.append("Specialized in children's health")
+    
+    # Experience reason
+    if experience >= 15:
+        reasons.append(f"{experience}+ years of clinical experience")
+    elif experience >= 10:
+        reasons.append(f"{experience} years of practice")
+    
+    # Condition-specific
+    if condition in ["pneumonia", "covid_suspect"]:
+        reasons.append("Handles respiratory infections")
+    elif condition == "tb_suspect":
+        reasons.append("Experienced with TB diagnosis and treatment")
+    
+    return " | ".join(reasons) if reasons else "Qualified medical professional"
 
 
 class DoctorAgent:
@@ -25,6 +134,50 @@ class DoctorAgent:
     Output: Doctor recommendations with available slots
     """
     
+    # Results are memoized per (condition, severity, red flags); an entry is
+    # dropped after the agent-wide TTL or once its earliest displayed slot is
+    # no longer in the future, whichever comes first.
+    _cache_max = 256
+    _cache_ttl = timedelta(seconds=BaseAgent._cache_ttl)
+    
+    # urgency -> (consultation_type, recommended_action, wait_time, booking_instructions)
+    _URGENCY_TABLE = MappingProxyType({
+        "critical": (
+            "emergency_room",
+            "🚨 SEEK EMERGENCY CARE IMMEDIATELY - Call 911/108",
+            "IMMEDIATE",
+            (
+                "🚨 DO NOT BOOK ONLINE - SEEK EMERGENCY CARE",
+                "Call emergency services: 911 (US) / 108 (India)",
+                "Go to nearest emergency room immediately",
+                "Call ahead if possible",
+            ),
+        ),
+        "high": (
+            "urgent_tele_consult",
+            "📞 Book urgent tele-consultation within 6-12 hours",
+            "Same day",
+            (
+                "⚡ URGENT BOOKING REQUIRED",
+                "1. Select earliest available slot (same day preferred)",
+                "2. Mention urgency when booking",
+                "3. Keep phone ready for doctor's call",
+            ) + _BASE_BOOKING_INSTRUCTIONS[2:],
+        ),
+        "moderate": (
+            "tele_consult",
+            "👨‍⚕️ Schedule tele-consultation within 24-48 hours",
+            "1-2 days",
+            _BASE_BOOKING_INSTRUCTIONS,
+        ),
+        "low": (
+            "tele_consult",
+            "📋 Book routine consultation within 3-5 days",
+            "3-5 days",
+            _BASE_BOOKING_INSTRUCTIONS,
+        ),
+    })
+    
     def __init__(self, data_dir: str = "./data", log_callback=None):
         """
         Initialize Doctor Agent.
@@ -35,9 +188,11 @@ class DoctorAgent:
         """
         self.data_dir = data_dir
         self.log_callback = log_callback
-        
-        # Load doctors database
-        self.doctors_df = self._load_doctors()
+        self._result_cache: "OrderedDict[str, Tuple[datetime, Dict]]" = OrderedDict()
+        # aprocess() calls for one agent run on several executor threads
+        self._result_cache_lock = threading.Lock()
+        # Persistent generator for the match-score jitter (seeded once)
+        self._rng = np.random.default_rng()
         
         # Condition to specialty mapping
         self.condition_specialty_map = {
@@ -48,6 +203,10 @@ class DoctorAgent:
             "normal": ["General Physician"],
             "unknown": ["General Physician"]
         }
+        self._build_affinity()
+        
+        # Load doctors database
+        self.doctors_df = self._load_doctors()
         
         self._log("INFO", f"Doctor Agent initialized with {len(self.doctors_df)} doctors")
     
@@ -98,72 +257,115 @@ class DoctorAgent:
         self._log("INFO", "Doctor Agent processing escalated case")
         
         try:
+            # One clock read per request: slot filtering and the timestamp share it
+            now = datetime.now()
+            
             # Extract data
-            imaging_result = escalation_data.get("imaging_result", {})
-            therapy_result = escalation_data.get("therapy_result", {})
-            patient = escalation_data.get("patient", {})
+            imaging_result = escalation_data.get("imaging_result") or _EMPTY_MAPPING
             
             # Determine primary condition
-            condition_probs = imaging_result.get("condition_probs", {})
-            primary_condition = max(condition_probs.items(), key=lambda x: x[1])[0] if condition_probs else "unknown"
+            condition_probs = imaging_result.get("condition_probs") or _EMPTY_MAPPING
+            primary_condition = max(condition_probs, key=condition_probs.__getitem__) if condition_probs else "unknown"
             
             # Determine severity and urgency
             severity = imaging_result.get("severity_hint", "moderate")
-            red_flags = imaging_result.get("red_flags", [])
-            urgency_level = self._determine_urgency(severity, red_flags)
+            red_flags = imaging_result.get("red_flags") or ()
             
-            # Find matching doctors
-            suitable_doctors = self._match_doctors(
-                primary_condition,
-                severity,
-                urgency_level,
-                patient
-            )
+            cache_key = self._result_cache_key(primary_condition, severity, red_flags)
+            cached = self._result_cache_get(cache_key, now)
+            if cached is not None:
+                return cached
             
-            # Sort by match score
-            suitable_doctors = sorted(suitable_doctors, key=lambda x: x['match_score'], reverse=True)
+            critical_count = self._count_critical_flags(red_flags)
+            urgency_level = self._determine_urgency(severity, red_flags, critical_count)
             
-            # Take top 5 doctors
-            top_doctors = suitable_doctors[:5]
+            # Score every candidate, but build records only for the top 5
+            candidate_rows, match_scores = self._score_candidates(primary_condition, urgency_level)
+            top = self._top_positions(match_scores, 5)
+            top_doctors = self._build_doctor_records(
+                candidate_rows[top],
+                match_scores[top],
+                primary_condition,
+                now
+            )
             
-            # Determine consultation type and action
-            consultation_type, recommended_action, wait_time = self._determine_consultation_details(
-                urgency_level,
-                severity,
-                red_flags
+            # Consultation type, action, wait time and booking steps in one lookup
+            consultation_type, recommended_action, wait_time, booking_instructions = (
+                self._urgency_details(urgency_level)
             )
             
             result = {
                 "available_doctors": top_doctors,
-                "total_matches": len(suitable_doctors),
+                "total_matches": int(candidate_rows.size),
                 "urgency_level": urgency_level,
                 "recommended_action": recommended_action,
                 "consultation_type": consultation_type,
                 "estimated_wait_time": wait_time,
                 "primary_condition": primary_condition,
                 "severity": severity,
-                "booking_instructions": self._generate_booking_instructions(urgency_level),
-                "emergency_note": self._generate_emergency_note(red_flags),
-                "timestamp": datetime.now().isoformat(),
+                "booking_instructions": booking_instructions,
+                "emergency_note": self._generate_emergency_note(red_flags, critical_count),
+                "timestamp": now.isoformat(),
                 "agent": "DoctorAgent",
                 "status": "success"
             }
             
             self._log("SUCCESS", f"Matched {len(top_doctors)} doctors for {primary_condition} ({urgency_level} urgency)")
             
+            self._result_cache_put(cache_key, result, now)
             return result
             
         except Exception as e:
             self._log("ERROR", f"Doctor matching failed: {str(e)}")
             return self._error_response(str(e))
     
+    async def process_async(self, escalation_data: Dict) -> Dict:
+        """Async variant of process() that runs on the shared agent executor."""
+        return await run_in_agent_executor(self.process, escalation_data)
+    
     def _load_doctors(self) -> pd.DataFrame:
-        """Load doctors database from CSV."""
-        doctors_path = os.path.join(self.data_dir, "doctors.csv")
+        """Load doctors database from CSV (shared across instances per file version)."""
+        doctors_path = os.path.abspath(os.path.join(self.data_dir, "doctors.csv"))
         
         if not os.path.exists(doctors_path):
             raise FileNotFoundError(f"Doctors database not found: {doctors_path}")
         
+        # Keyed by mtime, so editing doctors.csv triggers a fresh parse
+        table = self._read_doctor_table(doctors_path, os.stat(doctors_path).st_mtime_ns)
+        
+        # Cached results refer to the previous table
+        self.clear_cache()
+        
+        self._doctor_records = table.records
+        self._experience = table.experience
+        self._tele = table.tele
+        self._slot_schedules = table.slot_schedules
+        self._base_records = table.base_records
+        self._specialty_rows = table.specialty_rows
+        self.specialty_index = table.specialty_index
+        self._general_physician_rows = table.general_physician_rows
+        
+        # Specialties outside the condition map share the trailing "other"
+        # column; the extra trailing entry catches missing values (code -1)
+        other_id = len(self._spec_to_id)
+        category_spec_ids = np.array(
+            [self._spec_to_id.get(specialty, other_id) for specialty in table.specialties] + [other_id],
+            dtype=np.intp
+        )
+        self._doctor_spec_ids = category_spec_ids[table.specialty_codes]
+        
+        self._log("INFO", f"Loaded {len(table.df)} doctors from database")
+        return table.df
+    
+    @staticmethod
+    @lru_cache(maxsize=4)
+    def _read_doctor_table(doctors_path: str, mtime_ns: int) -> _DoctorTable:
+        """
+        Parse doctors.csv into the structures matching reads.
+        
+        Memoized on (path, mtime) and shared by every DoctorAgent, so the
+        returned arrays are read-only and must not be mutated.
+        """
         df = pd.read_csv(doctors_path)
         
         # Validate required columns
@@ -173,17 +375,178 @@ class DoctorAgent:
         if missing:
             raise ValueError(f"Missing columns in doctors.csv: {missing}")
         
-        self._log("INFO", f"Loaded {len(df)} doctors from database")
-        return df
+        # Compact dtypes: specialty as integer codes, tele as a real bool
+        # (missing counts as not available), narrow ints when already integral
+        df['specialty'] = df['specialty'].astype('category')
+        df['tele_available'] = df['tele_available'].fillna(False).astype(bool)
+        for col, dtype in (('experience_years', np.int16), ('consultation_fee', np.int32)):
+            if pd.api.types.is_integer_dtype(df[col]):
+                df[col] = df[col].astype(dtype)
+        
+        # Column arrays for vectorized scoring, plus one record dict per row
+        records = df.to_dict('records')
+        specialty_codes = df['specialty'].cat.codes.to_numpy()
+        specialties = df['specialty'].cat.categories
+        experience = df['experience_years'].to_numpy()
+        tele = df['tele_available'].to_numpy()
+        
+        # Slots are static between requests: parse them once into sorted
+        # (datetimes, labels) pairs so a query is a single bisect
+        slot_strings = df['available_slots'] if 'available_slots' in df.columns else [''] * len(df)
+        slot_schedules = [DoctorAgent._parse_slot_schedule(s) for s in slot_strings]
+        
+        # Languages split once into shared tuples (serialize like lists)
+        language_strings = (
+            df['languages'].fillna('English') if 'languages' in df.columns else ['English'] * len(df)
+        )
+        languages = [
+            tuple(language.strip() for language in str(language_list).split(','))
+            for language_list in language_strings
+        ]
+        
+        # Static part of each response record; requests only add the
+        # slot, score and reason fields on top
+        base_records = [
+            MappingProxyType({
+                "doctor_id": record['doctor_id'],
+                "name": record['name'],
+                "specialty": record['specialty'],
+                "experience_years": int(record['experience_years']),
+                "consultation_fee": int(record['consultation_fee']),
+                "languages": language_tuple,
+            })
+            for record, language_tuple in zip(records, languages)
+        ]
+        
+        # Specialty -> row positions of tele-available doctors, so matching is
+        # a few dict lookups instead of a DataFrame scan per request
+        specialty_rows = {
+            specialty: np.flatnonzero(tele & (specialty_codes == code))
+            for code, specialty in enumerate(specialties)
+        }
+        specialty_index = {
+            specialty: [records[row] for row in rows]
+            for specialty, rows in specialty_rows.items()
+            if rows.size
+        }
+        # Fallback pool when no tele doctor matches (regardless of tele status)
+        general_physician_rows = np.flatnonzero(df['specialty'] == 'General Physician')
+        
+        for array in (specialty_codes, experience, tele, general_physician_rows, *specialty_rows.values()):
+            array.setflags(write=False)
+        
+        return _DoctorTable(
+            df=df,
+            records=records,
+            specialty_codes=specialty_codes,
+            specialties=specialties,
+            experience=experience,
+            tele=tele,
+            slot_schedules=slot_schedules,
+            base_records=base_records,
+            specialty_rows=specialty_rows,
+            specialty_index=specialty_index,
+            general_physician_rows=general_physician_rows,
+        )
     
-    def _determine_urgency(self, severity: str, red_flags: List[str]) -> str:
+    def _count_critical_flags(self, red_flags: List[str]) -> int:
+        """Count red flags mentioning CRITICAL or EMERGENCY (case-insensitive)."""
+        search = _CRITICAL_FLAG_RX.search
+        return sum(1 for flag in red_flags if search(flag))
+    
+    def _build_affinity(self) -> None:
+        """
+        Precompute specialty scores as a condition x specialty matrix.
+        
+        Row per condition in condition_specialty_map; column per mapped
+        specialty plus a final column for any other specialty. Cells hold
+        40 (primary), 30 (secondary) or 20 (other).
+        """
+        specialties = sorted({
+            specialty
+            for specialties in self.condition_specialty_map.values()
+            for specialty in specialties
+        })
+        self._spec_to_id = {specialty: i for i, specialty in enumerate(specialties)}
+        self._condition_to_id = {
+            condition: i for i, condition in enumerate(self.condition_specialty_map)
+        }
+        
+        self._affinity = np.full(
+            (len(self._condition_to_id), len(specialties) + 1), 20, dtype=np.int8
+        )
+        for condition, required in self.condition_specialty_map.items():
+            row = self._affinity[self._condition_to_id[condition]]
+            row[[self._spec_to_id[specialty] for specialty in required[1:]]] = 30
+            row[self._spec_to_id[required[0]]] = 40
+    
+    def _result_cache_key(self, condition: str, severity: str, red_flags: List[str]) -> str:
+        """Digest of the inputs that determine a doctor-matching result."""
+        fields = [condition, severity, sorted(map(str, red_flags))]
+        if orjson is not None:
+            canonical = orjson.dumps(fields, default=str)
+        else:
+            canonical = json.dumps(fields, default=str).encode()
+        return hashlib.blake2b(canonical, digest_size=16).hexdigest()
+    
+    def _result_cache_get(self, key: str, now: datetime) -> Optional[Dict]:
+        """Return a fresh copy of a cached result, or None on miss/expiry."""
+        with self._result_cache_lock:
+            entry = self._result_cache.get(key)
+            if entry is None:
+                return None
+            
+            valid_until, result = entry
+            if now >= valid_until:
+                del self._result_cache[key]
+                return None
+            
+            self._result_cache.move_to_end(key)
+        
+        self._log("INFO", "DoctorAgent cache hit")
+        
+        hit = copy.deepcopy(result)
+        hit["timestamp"] = now.isoformat()
+        return hit
+    
+    def _result_cache_put(self, key: str, result: Dict, now: datetime) -> None:
+        """Store a result until the TTL expires or its earliest displayed slot passes."""
+        first_slots = [
+            datetime.fromisoformat(doctor["available_slots"][0].replace('Z', ''))
+            for doctor in result["available_doctors"]
+            if doctor["available_slots"]
+        ]
+        valid_until = min([*first_slots, now + self._cache_ttl])
+        
+        entry = (valid_until, copy.deepcopy(result))
+        with self._result_cache_lock:
+            self._result_cache[key] = entry
+            self._result_cache.move_to_end(key)
+            if len(self._result_cache) > self._cache_max:
+                self._result_cache.popitem(last=False)
+    
+    def clear_cache(self) -> None:
+        """Drop all memoized results."""
+        with self._result_cache_lock:
+            self._result_cache.clear()
+    
+    def _determine_urgency(
+        self,
+        severity: str,
+        red_flags: List[str],
+        critical_count: Optional[int] = None
+    ) -> str:
         """
         Determine urgency level based on severity and red flags.
         
         Returns: "critical", "high", "moderate", or "low"
         """
-        # Critical if any CRITICAL/EMERGENCY red flags
-        if any("CRITICAL" in flag.upper() or "EMERGENCY" in flag.upper() for flag in red_flags):
+        # Critical if any CRITICAL/EMERGENCY red flags; without a precomputed
+        # count, stop at the first match instead of counting them all
+        if critical_count is None:
+            critical_count = any(map(_CRITICAL_FLAG_RX.search, red_flags))
+        
+        if critical_count:
             return "critical"
         
         # High if severe or any red flags
@@ -202,57 +565,82 @@ class DoctorAgent:
         condition: str,
         severity: str,
         urgency: str,
-        patient: Dict
+        patient: Dict,
+        now: Optional[datetime] = None
     ) -> List[Dict]:
         """
         Find suitable doctors based on condition and patient needs.
+        
+        Builds a record for every candidate; process() instead scores all
+        candidates and builds records only for the top few.
+        ``now`` is the request clock used to filter past slots.
         """
+        rows, match_scores = self._score_candidates(condition, urgency)
+        return self._build_doctor_records(rows, match_scores, condition, now)
+    
+    def _score_candidates(self, condition: str, urgency: str) -> Tuple[np.ndarray, np.ndarray]:
+        """Return (row positions, match scores) of the candidate doctors."""
         # Get required specialties for this condition
-        required_specialties = self.condition_specialty_map.get(condition, ["General Physician"])
-        
-        # Filter doctors by specialty
-        suitable = self.doctors_df[
-            self.doctors_df['specialty'].isin(required_specialties)
-        ].copy()
+        required_specialties = self.condition_specialty_map.get(condition, _GENERAL_PHYSICIAN_ONLY)
         
-        # Filter by tele-consultation availability
-        suitable = suitable[suitable['tele_available'] == True]
+        # Row positions of tele-available doctors with a required specialty
+        rows = np.concatenate([
+            self._specialty_rows.get(specialty, _NO_ROWS) for specialty in required_specialties
+        ])
         
-        if suitable.empty:
+        if not rows.size:
             self._log("WARNING", f"No suitable doctors found for {condition}")
             # Fallback to all general physicians
-            suitable = self.doctors_df[
-                self.doctors_df['specialty'] == 'General Physician'
-            ].copy()
+            rows = self._general_physician_rows
+        
+        condition_id = self._condition_to_id.get(condition, self._condition_to_id["unknown"])
+        return rows, self._calculate_match_scores(rows, urgency, condition_id)
+    
+    @staticmethod
+    def _top_positions(scores: np.ndarray, k: int) -> np.ndarray:
+        """
+        Positions of the k highest scores, best first.
+        
+        Ties keep candidate order (same as a stable sort), so only the
+        scores at or above the k-th largest value are sorted.
+        """
+        if scores.size > k:
+            threshold = np.partition(scores, scores.size - k)[scores.size - k]
+            positions = np.flatnonzero(scores >= threshold)
+        else:
+            positions = np.arange(scores.size)
+        
+        order = np.argsort(-scores[positions], kind='stable')
+        return positions[order[:k]]
+    
+    def _build_doctor_records(
+        self,
+        rows: np.ndarray,
+        match_scores: np.ndarray,
+        condition: str,
+        now: Optional[datetime] = None
+    ) -> List[Dict]:
+        """Build response records for the given doctor rows."""
+        if now is None:
+            now = datetime.now()
         
         # Build doctor list with match scores
         doctor_list = []
-        for _, doctor in suitable.iterrows():
-            match_score = self._calculate_match_score(
-                doctor,
-                condition,
-                severity,
-                urgency,
-                required_specialties
-            )
+        for row, match_score in zip(rows.tolist(), match_scores.tolist()):
+            base = self._base_records[row]
             
-            # Parse available slots
-            slots = self._parse_available_slots(doctor.get('available_slots', ''))
+            # Future slots from the pre-parsed schedule
+            slots = self._future_slots(row, now)
             
             doctor_info = {
-                "doctor_id": doctor['doctor_id'],
-                "name": doctor['name'],
-                "specialty": doctor['specialty'],
-                "experience_years": int(doctor['experience_years']),
-                "consultation_fee": int(doctor['consultation_fee']),
-                "languages": doctor.get('languages', 'English').split(','),
+                **base,
                 "available_slots": slots[:3],  # Show next 3 slots
                 "total_slots_available": len(slots),
                 "match_score": match_score,
                 "recommendation_reason": self._get_recommendation_reason(
-                    doctor['specialty'],
+                    base['specialty'],
                     condition,
-                    doctor['experience_years']
+                    base['experience_years']
                 )
             }
             
@@ -260,16 +648,14 @@ class DoctorAgent:
         
         return doctor_list
     
-    def _calculate_match_score(
+    def _calculate_match_scores(
         self,
-        doctor: pd.Series,
-        condition: str,
-        severity: str,
+        rows: np.ndarray,
         urgency: str,
-        required_specialties: List[str]
-    ) -> int:
+        condition_id: int
+    ) -> np.ndarray:
         """
-        Calculate match score (0-100) for doctor-patient matching.
+        Calculate match scores (0-100) for the candidate rows in one pass.
         
         Factors:
         - Specialty match (40 points)
@@ -277,62 +663,74 @@ class DoctorAgent:
         - Availability (20 points)
         - Random variation (10 points)
         """
-        score = 0
-        
-        # Specialty match (40 points)
-        specialty = doctor['specialty']
-        if specialty == required_specialties[0]:  # Primary specialty
-            score += 40
-        elif specialty in required_specialties:  # Secondary specialty
-            score += 30
-        else:
-            score += 20
+        experience = self._experience[rows]
+        
+        if _score_kernel_jit is not None and rows.size >= _JIT_MIN_CANDIDATES:
+            scores = np.empty(rows.size, dtype=np.int64)
+            _score_kernel_jit(
+                self._doctor_spec_ids[rows],
+                experience,
+                self._tele[rows],
+                self._affinity[condition_id],
+                urgency in ("critical", "high"),
+                self._rng.integers(0, 11, size=rows.size),
+                scores
+            )
+            return scores
         
-        # Experience (30 points)
-        experience = doctor['experience_years']
-        if experience >= 15:
-            score += 30
-        elif experience >= 10:
-            score += 25
-        elif experience >= 5:
-            score += 20
-        else:
-            score += 15
+        # Specialty match: primary 40, secondary 30, other 20
+        specialty_score = self._affinity[condition_id, self._doctor_spec_ids[rows]]
+        
+        # Experience: 15+ -> 30, 10+ -> 25, 5+ -> 20, else 15
+        experience_score = np.select(
+            [experience >= 15, experience >= 10, experience >= 5],
+            [30, 25, 20],
+            default=15
+        )
         
         # Tele-availability (20 points)
-        if doctor.get('tele_available', False):
-            score += 20
+        tele_score = np.where(self._tele[rows], 20, 0)
         
         # Small random variation for diversity (10 points)
-        score += random.randint(0, 10)
+        random_score = self._rng.integers(0, 11, size=rows.size)
+        
+        score = specialty_score + experience_score + tele_score + random_score
         
         # Urgency bonus (prioritize experienced doctors for urgent cases)
-        if urgency in ["critical", "high"] and experience >= 10:
-            score += 5
+        if urgency in ("critical", "high"):
+            score += np.where(experience >= 10, 5, 0)
         
-        return min(100, score)  # Cap at 100
+        return np.minimum(100, score)  # Cap at 100
     
-    def _parse_available_slots(self, slots_str: str) -> List[str]:
+    @staticmethod
+    def _parse_slot_schedule(slots_str: str) -> Tuple[List[datetime], List[str]]:
         """
-        Parse available slots string into list of datetime strings.
+        Parse an available slots string into parallel sorted lists.
         
-        Input: "2025-10-08T10:00:00,2025-10-08T14:00:00,2025-10-09T09:00:00"
-        Output: ["2025-10-08T10:00:00", "2025-10-08T14:00:00", "2025-10-09T09:00:00"]
+        Input: "2025-10-08T14:00:00,2025-10-08T10:00:00"
+        Output: ([datetime(2025, 10, 8, 10), datetime(2025, 10, 8, 14)],
+                 ["2025-10-08T10:00:00", "2025-10-08T14:00:00"])
+        
+        Labels keep the CSV spelling so responses are unchanged.
         """
         if not slots_str or pd.isna(slots_str):
-            return []
+            return [], []
         
         try:
-            slots = [s.strip() for s in str(slots_str).split(',')]
-            # Filter out past slots
-            now = datetime.now()
-            future_slots = [
-                slot for slot in slots 
-                if datetime.fromisoformat(slot.replace('Z', '')) > now
-            ]
-            return future_slots
-        except:
-            return []
+            labels = [s.strip() for s in str(slots_str).split(',')]
+            parsed = sorted(
+                (datetime.fromisoformat(label.replace('Z', '')), label)
+                for label in labels
+            )
+        except (ValueError, TypeError):
+            return [], []
+        
+        return [dt for dt, _ in parsed], [label for _, label in parsed]
+    
+    def _future_slots(self, row: int, now: datetime) -> List[str]:
+        """Return slot labels strictly after ``now`` for a doctor row."""
+        times, labels = self._slot_schedules[row]
+        return labels[bisect_right(times, now):]
     
     def _get_recommendation_reason(
         self,
@@ -341,31 +739,13 @@ class DoctorAgent:
         experience: int
     ) -> str:
         """Generate human-readable recommendation reason."""
-        reasons = []
-        
-        # Specialty reason
-        if specialty == "Pulmonologist":
-            reasons.append("Specialist in respiratory and lung conditions")
-        elif specialty == "Infectious Disease Specialist":
-            reasons.append("Expert in infectious diseases and complicated infections")
-        elif specialty == "General Physician":
-            reasons.append("Experienced in general medicine and initial diagnosis")
-        elif specialty == "Pediatrician":
-            reasons.append("Specialized in children's health")
-        
-        # Experience reason
-        if experience >= 15:
-            reasons.append(f"{experience}+ years of clinical experience")
-        elif experience >= 10:
-            reasons.append(f"{experience} years of practice")
-        
-        # Condition-specific
-        if condition in ["pneumonia", "covid_suspect"]:
-            reasons.append("Handles respiratory infections")
-        elif condition == "tb_suspect":
-            reasons.append("Experienced with TB diagnosis and treatment")
-        
-        return " | ".join(reasons) if reasons else "Qualified medical professional"
+        # Below 10 years the text does not mention experience, so those
+        # values share one cache entry
+        return _build_recommendation_reason(
+            specialty,
+            condition,
+            experience if experience >= 10 else 0
+        )
     
     def _determine_consultation_details(
         self,
@@ -378,74 +758,32 @@ class DoctorAgent:
         
         Returns: (consultation_type, recommended_action, wait_time)
         """
-        if urgency == "critical":
-            return (
-                "emergency_room",
-                "🚨 SEEK EMERGENCY CARE IMMEDIATELY - Call 911/108",
-                "IMMEDIATE"
-            )
-        
-        if urgency == "high":
-            return (
-                "urgent_tele_consult",
-                "📞 Book urgent tele-consultation within 6-12 hours",
-                "Same day"
-            )
-        
-        if urgency == "moderate":
-            return (
-                "tele_consult",
-                "👨‍⚕️ Schedule tele-consultation within 24-48 hours",
-                "1-2 days"
-            )
-        
-        # Low urgency
-        return (
-            "tele_consult",
-            "📋 Book routine consultation within 3-5 days",
-            "3-5 days"
-        )
+        return self._urgency_details(urgency)[:3]
     
-    def _generate_booking_instructions(self, urgency: str) -> List[str]:
+    def _generate_booking_instructions(self, urgency: str) -> Tuple[str, ...]:
         """Generate step-by-step booking instructions."""
-        base_instructions = [
-            "1. Select a doctor from the recommended list",
-            "2. Choose an available time slot",
-            "3. Prepare your medical history and symptoms",
-            "4. Have X-ray images and reports ready",
-            "5. Join the tele-consultation at scheduled time"
-        ]
-        
-        if urgency == "critical":
-            return [
-                "🚨 DO NOT BOOK ONLINE - SEEK EMERGENCY CARE",
-                "Call emergency services: 911 (US) / 108 (India)",
-                "Go to nearest emergency room immediately",
-                "Call ahead if possible"
-            ]
-        
-        if urgency == "high":
-            urgent_instructions = [
-                "⚡ URGENT BOOKING REQUIRED",
-                "1. Select earliest available slot (same day preferred)",
-                "2. Mention urgency when booking",
-                "3. Keep phone ready for doctor's call",
-            ]
-            return urgent_instructions + base_instructions[2:]
-        
-        return base_instructions
+        return self._urgency_details(urgency)[3]
+    
+    def _urgency_details(self, urgency: str) -> Tuple[str, str, str, Tuple[str, ...]]:
+        """Look up (type, action, wait time, booking instructions); unknown -> low."""
+        return self._URGENCY_TABLE.get(urgency, self._URGENCY_TABLE["low"])
     
-    def _generate_emergency_note(self, red_flags: List[str]) -> str:
+    def _generate_emergency_note(
+        self,
+        red_flags: List[str],
+        critical_count: Optional[int] = None
+    ) -> str:
         """Generate emergency note if critical red flags present."""
         if not red_flags:
             return ""
         
-        critical_flags = [flag for flag in red_flags if "CRITICAL" in flag.upper() or "EMERGENCY" in flag.upper()]
+        if critical_count is None:
+            critical_count = self._count_critical_flags(red_flags)
         
-        if critical_flags:
+        if critical_count:
             return (
                 "🚨 EMERGENCY SITUATION DETECTED\n"
-                f"Red flags: {len(critical_flags)} critical warnings\n"
+                f"Red flags: {critical_count} critical warnings\n"
                 "This requires IMMEDIATE medical attention. "
                 "Do not delay - call emergency services (911/108) or go to ER now."
             )
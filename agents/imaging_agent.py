@@ -3,12 +3,15 @@
 from __future__ import annotations
 
 import hashlib
+import io
 import json
 import math
 import random
+import re
+import zlib
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, Iterable, List
+from typing import Any, BinaryIO, Dict, Iterable, List, Optional, Union
 
 import numpy as np
 from PIL import Image
@@ -16,20 +19,181 @@ from PIL import Image
 from agents.base_agent import BaseAgent
 from config import RED_FLAG_KEYWORDS
 
+try:  # Optional dependency – compiled probability rules
+    from numba import njit  # type: ignore
+except Exception:  # pragma: no cover - optional dependency
+    njit = None
+
+# Longest edge used for feature extraction (see _grayscale_histogram)
+_FEATURE_SIZE = (512, 512)
+_GRAY_LEVELS = np.arange(256, dtype=np.int64)
+# Rows weight the 256 histogram bins into: pixel count, sum, sum of
+# squares, dark pixels (< 90) and bright pixels (> 200)
+_HISTOGRAM_MOMENTS = np.stack([
+    np.ones(256, dtype=np.int64),
+    _GRAY_LEVELS,
+    _GRAY_LEVELS * _GRAY_LEVELS,
+    (_GRAY_LEVELS < 90).astype(np.int64),
+    (_GRAY_LEVELS > 200).astype(np.int64),
+])
+_HISTOGRAM_MOMENTS.flags.writeable = False
+
+# Weight positions follow ImagingAgent.CONDITIONS
+_NORMAL, _PNEUMONIA, _COVID, _BRONCHITIS, _TB = range(5)
+
+# Every keyword the heuristics look for in (lower-cased) notes
+_PROBABILITY_KEYWORDS = ("dry cough", "productive", "phlegm", "fever", "shortness of breath", "breathless")
+_SEVERITY_KEYWORDS = ("worsening", "severe", "acute")
+_NOTE_KEYWORDS = tuple(dict.fromkeys(
+    [*_PROBABILITY_KEYWORDS, *_SEVERITY_KEYWORDS, *(keyword.lower() for keyword in RED_FLAG_KEYWORDS)]
+))
+# Zero-width lookahead tries every start position, longest keyword first;
+# shorter keywords inside the captured one are added back via _KEYWORD_CONTAINS
+# so the result equals checking `keyword in notes` for each keyword.
+_KEYWORD_RX = re.compile(
+    "(?=(" + "|".join(map(re.escape, sorted(_NOTE_KEYWORDS, key=len, reverse=True))) + "))"
+)
+_KEYWORD_CONTAINS = {
+    keyword: frozenset(other for other in _NOTE_KEYWORDS if other in keyword)
+    for keyword in _NOTE_KEYWORDS
+}
+
+
+def _match_note_keywords(notes: str) -> frozenset:
+    """Return the set of _NOTE_KEYWORDS occurring in ``notes`` (one regex scan)."""
+    matched = set()
+    for match in _KEYWORD_RX.finditer(notes):
+        matched |= _KEYWORD_CONTAINS[match.group(1)]
+    return frozenset(matched)
+
+
+def _top_two(probs: Dict[str, float]) -> tuple:
+    """Single scan for (top key, top value, runner-up value); first key wins ties."""
+    top_key, top, second = None, -1.0, -1.0
+    for key, value in probs.items():
+        if value > top:
+            top_key, top, second = key, value, top
+        elif value > second:
+            second = value
+    return top_key, top, second
+
+
+# Note keywords packed into one int for _apply_rules
+_NOTE_DRY_COUGH = 1
+_NOTE_PRODUCTIVE = 2
+_NOTE_FEVER = 4
+_NOTE_BREATHLESS = 8
+
+
+def _apply_rules(w, dark, contrast, mean, spo2, age, note_flags):
+    """Add the feature, symptom, SpO2 and age adjustments to weights ``w`` in place."""
+    # Feature heuristics
+    if dark > 0.55:
+        w[_PNEUMONIA] += 0.9
+        w[_COVID] += 0.6
+        w[_NORMAL] -= 0.7
+    elif dark > 0.4:
+        w[_BRONCHITIS] += 0.4
+        w[_PNEUMONIA] += 0.25
+
+    if contrast < 120:
+        w[_PNEUMONIA] += 0.5
+    elif contrast > 220:
+        w[_NORMAL] += 0.4
+
+    if mean < 100:
+        w[_PNEUMONIA] += 0.3
+        w[_TB] += 0.2
+
+    # Symptom modifiers
+    if note_flags & _NOTE_DRY_COUGH:
+        w[_COVID] += 0.4
+    if note_flags & _NOTE_PRODUCTIVE:
+        w[_BRONCHITIS] += 0.4
+    if note_flags & _NOTE_FEVER:
+        w[_PNEUMONIA] += 0.3
+        w[_COVID] += 0.2
+    if note_flags & _NOTE_BREATHLESS:
+        w[_PNEUMONIA] += 0.5
+
+    # SpO2 adjustments
+    if spo2 < 90:
+        w[_PNEUMONIA] += 0.8
+    elif spo2 < 94:
+        w[_PNEUMONIA] += 0.4
+    else:
+        w[_NORMAL] += 0.3
+
+    # Age adjustments
+    if age > 65:
+        w[_PNEUMONIA] += 0.2
+    elif age < 5:
+        w[_BRONCHITIS] += 0.3
+
+
+# Argument types fixed by ImagingAgent._rule_inputs. With an explicit
+# signature numba compiles at import (or loads the on-disk cache) instead
+# of on the first request; without numba the rules run on a plain list,
+# cheaper than NumPy scalar indexing
+_APPLY_RULES_SIGNATURE = "void(float64[::1], float64, float64, float64, int64, float64, int64)"
+_apply_rules_jit = njit(_APPLY_RULES_SIGNATURE, cache=True)(_apply_rules) if njit is not None else None
+
 
 class ImagingAgent(BaseAgent):
     """Heuristic classifier that generates safe, interpretable outputs."""
 
     CONDITIONS = ["normal", "pneumonia", "covid_suspect", "bronchitis", "tb_suspect"]
+    REQUIRED_FIELDS = ("xray_path", "patient")
+
+    # Bump when the heuristics change so cached results are not reused.
+    MODEL_VERSION = "heuristic-v3"
+
+    # process() caches results by X-ray content (see _cache_key), so retries
+    # of the same upload skip inference even though it lands at a new path.
+    # Output is deterministic for a given key, hence no expiry. safe_process()
+    # leaves caching to process() so the X-ray is not read and hashed twice.
+    _process_caches = True
+    _cache_max = 256
+    _cache_ttl = float("inf")
 
     def __init__(self, log_callback=None) -> None:
         super().__init__("ImagingAgent", log_callback)
 
+    def _cache_key(self, input_data: Dict[str, Any], xray_bytes: Optional[bytes] = None) -> Optional[str]:
+        """Content-address results by X-ray bytes plus the clinical inputs used."""
+        if not self.cacheable:
+            return None
+
+        try:
+            if xray_bytes is None:
+                xray_bytes = Path(input_data["xray_path"]).read_bytes()
+            digest = hashlib.blake2b(xray_bytes, digest_size=16)
+            patient = input_data.get("patient") or {}
+            clinical = [
+                self.MODEL_VERSION,
+                patient.get("age", 40),
+                input_data.get("spo2"),
+                input_data.get("notes", ""),
+            ]
+            digest.update(json.dumps(clinical, default=str).encode())
+        except (KeyError, TypeError, AttributeError, OSError):
+            return None
+
+        return digest.hexdigest()
+
     # ------------------------------------------------------------------
     # Public API
     # ------------------------------------------------------------------
     def process(self, ingestion_output: Dict[str, Any]) -> Dict[str, Any]:
-        self._start_processing()
+        # The bytes hashed for the cache key are decoded on a miss, so the
+        # upload is read from disk once per call
+        xray_bytes = self._read_xray_bytes(ingestion_output) if self.cacheable else None
+        cache_key = self._cache_key(ingestion_output, xray_bytes)
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            return cached
+
+        started = self._start_processing()
         try:
             self._validate_input(ingestion_output)
 
@@ -38,14 +202,16 @@ class ImagingAgent(BaseAgent):
             notes = ingestion_output.get("notes", "")
             spo2 = ingestion_output.get("spo2")
 
-            features = self._extract_image_features(xray_path)
+            histogram = self._grayscale_histogram(io.BytesIO(xray_bytes) if xray_bytes is not None else xray_path)
+            features = self._features_from_histogram(histogram)
             metadata = {
                 "age": patient.get("age", 40),
                 "spo2": int(spo2) if spo2 is not None else 98,
                 "notes": notes.lower(),
             }
+            metadata["keywords"] = _match_note_keywords(metadata["notes"])
 
-            condition_probs = self._compute_probabilities(features, metadata, xray_path)
+            condition_probs = self._compute_probabilities(features, metadata, self._histogram_seed(histogram))
             severity = self._score_severity(condition_probs, metadata)
             confidence = self._score_confidence(condition_probs)
             red_flags = self._detect_red_flags(metadata, severity)
@@ -62,17 +228,18 @@ class ImagingAgent(BaseAgent):
 
             self._log("SUCCESS", "Imaging completed", {"severity": severity, "confidence": payload["confidence"]})
             result = self._create_output(payload)
-            self._end_processing(success=True)
+            self._end_processing(started, success=True)
+            self._cache_put(cache_key, result)
             return result
         except Exception as exc:  # pragma: no cover - defensive
-            self._end_processing(success=False)
+            self._end_processing(started, success=False)
             return self._error_response(str(exc), exc)
 
     # ------------------------------------------------------------------
     # Validation
     # ------------------------------------------------------------------
     def _validate_input(self, data: Dict[str, Any]) -> None:
-        self._validate_required_fields(data, ["xray_path", "patient"])
+        self._validate_required_fields(data)
         path = Path(data["xray_path"])
         if not path.exists():
             raise FileNotFoundError(f"X-ray not found: {path}")
@@ -82,17 +249,47 @@ class ImagingAgent(BaseAgent):
     # ------------------------------------------------------------------
     # Feature extraction
     # ------------------------------------------------------------------
-    def _extract_image_features(self, path: Path) -> Dict[str, float]:
-        with Image.open(path) as img:
-            grayscaled = img.convert("L")
-            array = np.asarray(grayscaled, dtype=np.float32)
+    @staticmethod
+    def _read_xray_bytes(data: Dict[str, Any]) -> Optional[bytes]:
+        try:
+            return Path(data["xray_path"]).read_bytes()
+        except (KeyError, TypeError, OSError):
+            return None
 
-        mean = float(np.mean(array))
-        std = float(np.std(array))
-        min_val = float(np.min(array))
-        max_val = float(np.max(array))
-        dark_ratio = float(np.mean(array < 90))
-        bright_ratio = float(np.mean(array > 200))
+    def _extract_image_features(self, path: Path) -> Dict[str, float]:
+        return self._features_from_histogram(self._grayscale_histogram(path))
+
+    @staticmethod
+    def _grayscale_histogram(source: Union[Path, BinaryIO]) -> np.ndarray:
+        # The features are global statistics, so a bounded thumbnail gives
+        # the same picture at a fraction of the pixels. JPEGs are decoded
+        # straight to grayscale at reduced scale (draft); other formats are
+        # resized once. One pass over the 8-bit pixels (Pillow's C histogram)
+        # then yields the 256 bin counts every statistic is derived from.
+        with Image.open(source) as img:
+            img.draft("L", _FEATURE_SIZE)
+            img.thumbnail(_FEATURE_SIZE, Image.Resampling.BILINEAR)
+            grayscaled = img if img.mode == "L" else img.convert("L")
+            return np.asarray(grayscaled.histogram(), dtype=np.int64)
+
+    @staticmethod
+    def _histogram_seed(counts: np.ndarray) -> int:
+        """Deterministic per-image seed from the already computed histogram."""
+        return zlib.crc32(counts.tobytes())
+
+    @staticmethod
+    def _features_from_histogram(counts: np.ndarray) -> Dict[str, float]:
+        total, pixel_sum, square_sum, dark_count, bright_count = (_HISTOGRAM_MOMENTS @ counts).tolist()
+        occupied = np.flatnonzero(counts)
+
+        mean = pixel_sum / total
+        # Variance from exact integer moments: no float cancellation and
+        # never negative, unlike E[x^2] - mean^2 in floating point
+        std = math.sqrt((total * square_sum - pixel_sum * pixel_sum) / (total * total))
+        min_val = float(occupied[0])
+        max_val = float(occupied[-1])
+        dark_ratio = dark_count / total
+        bright_ratio = bright_count / total
 
         return {
             "mean": mean,
@@ -105,74 +302,47 @@ class ImagingAgent(BaseAgent):
     # ------------------------------------------------------------------
     # Probability generation
     # ------------------------------------------------------------------
-    def _compute_probabilities(self, features: Dict[str, float], metadata: Dict[str, Any], path: Path) -> Dict[str, float]:
-        seed = int(hashlib.sha1(path.read_bytes()).hexdigest()[:8], 16)
+    def _compute_probabilities(self, features: Dict[str, float], metadata: Dict[str, Any], seed: int) -> Dict[str, float]:
         rng = random.Random(seed)
 
-        weights = {condition: rng.uniform(0.5, 1.5) for condition in self.CONDITIONS}
-
-        # Feature heuristics
-        dark = features["dark_ratio"]
-        contrast = features["contrast"]
-        mean = features["mean"]
-
-        if dark > 0.55:
-            weights["pneumonia"] += 0.9
-            weights["covid_suspect"] += 0.6
-            weights["normal"] -= 0.7
-        elif dark > 0.4:
-            weights["bronchitis"] += 0.4
-            weights["pneumonia"] += 0.25
-
-        if contrast < 120:
-            weights["pneumonia"] += 0.5
-        elif contrast > 220:
-            weights["normal"] += 0.4
-
-        if mean < 100:
-            weights["pneumonia"] += 0.3
-            weights["tb_suspect"] += 0.2
-
-        # Symptom modifiers
-        notes = metadata["notes"]
-        if "dry cough" in notes:
-            weights["covid_suspect"] += 0.4
-        if "productive" in notes or "phlegm" in notes:
-            weights["bronchitis"] += 0.4
-        if "fever" in notes:
-            weights["pneumonia"] += 0.3
-            weights["covid_suspect"] += 0.2
-        if "shortness of breath" in notes or "breathless" in notes:
-            weights["pneumonia"] += 0.5
-
-        # SpO2 adjustments
-        spo2 = metadata["spo2"]
-        if spo2 < 90:
-            weights["pneumonia"] += 0.8
-        elif spo2 < 94:
-            weights["pneumonia"] += 0.4
+        weights = [rng.uniform(0.5, 1.5) for _ in self.CONDITIONS]
+        if _apply_rules_jit is not None:
+            weights = np.array(weights)
+            _apply_rules_jit(weights, *self._rule_inputs(features, metadata))
         else:
-            weights["normal"] += 0.3
-
-        # Age adjustments
-        age = metadata["age"]
-        if age > 65:
-            weights["pneumonia"] += 0.2
-        elif age < 5:
-            weights["bronchitis"] += 0.3
+            _apply_rules(weights, *self._rule_inputs(features, metadata))
 
-        # Normalise to probabilities
+        # Normalise to probabilities, still indexed like CONDITIONS
         min_clip = 0.01
-        clipped = {k: max(min_clip, v) for k, v in weights.items()}
-        total = sum(clipped.values())
-        probs = {k: round(v / total, 3) for k, v in clipped.items()}
+        clipped = [max(min_clip, float(w)) for w in weights]
+        total = sum(clipped)
+        probs = [round(v / total, 3) for v in clipped]
 
         # Ensure sum to 1.0 (floating rounding fix)
-        remainder = 1.0 - sum(probs.values())
-        top_key = max(probs, key=probs.get)
-        probs[top_key] = round(probs[top_key] + remainder, 3)
-
-        return probs
+        remainder = 1.0 - sum(probs)
+        top = probs.index(max(probs))
+        probs[top] = round(probs[top] + remainder, 3)
+
+        return dict(zip(self.CONDITIONS, probs))
+
+    @staticmethod
+    def _rule_inputs(features: Dict[str, float], metadata: Dict[str, Any]) -> tuple:
+        """Scalar arguments for _apply_rules (see _APPLY_RULES_SIGNATURE), with note keywords packed into bits."""
+        keywords = metadata["keywords"]
+        note_flags = (
+            ("dry cough" in keywords) * _NOTE_DRY_COUGH
+            | ("productive" in keywords or "phlegm" in keywords) * _NOTE_PRODUCTIVE
+            | ("fever" in keywords) * _NOTE_FEVER
+            | ("shortness of breath" in keywords or "breathless" in keywords) * _NOTE_BREATHLESS
+        )
+        return (
+            float(features["dark_ratio"]),
+            float(features["contrast"]),
+            float(features["mean"]),
+            int(metadata["spo2"]),
+            float(metadata["age"]),
+            int(note_flags),
+        )
 
     # ------------------------------------------------------------------
     # Severity & confidence
@@ -185,13 +355,13 @@ class ImagingAgent(BaseAgent):
             return "severe"
         if spo2 < 94 or infection_prob > 0.55:
             return "moderate"
-        if any(token in metadata["notes"] for token in ["worsening", "severe", "acute"]):
+        if not metadata["keywords"].isdisjoint(_SEVERITY_KEYWORDS):
             return "moderate"
         return "mild"
 
     def _score_confidence(self, probs: Dict[str, float]) -> float:
-        ordered = sorted(probs.values(), reverse=True)
-        margin = ordered[0] - ordered[1]
+        _, top, second = _top_two(probs)
+        margin = top - second
         confidence = 0.4 + min(0.5, margin)
         return min(0.95, max(0.4, confidence))
 
@@ -200,7 +370,7 @@ class ImagingAgent(BaseAgent):
     # ------------------------------------------------------------------
     def _detect_red_flags(self, metadata: Dict[str, Any], severity: str) -> List[str]:
         flags: List[str] = []
-        notes = metadata["notes"]
+        keywords = metadata["keywords"]
         spo2 = metadata["spo2"]
 
         if spo2 < 88:
@@ -209,20 +379,14 @@ class ImagingAgent(BaseAgent):
             flags.append("⚠️ WARNING: Oxygen saturation is low; urgent doctor review advised")
 
         for keyword in RED_FLAG_KEYWORDS:
-            if keyword.lower() in notes:
+            if keyword.lower() in keywords:
                 flags.append(f"⚠️ WARNING: Reported symptom '{keyword}' requires prompt medical attention")
 
         if severity == "severe":
             flags.append("⚠️ WARNING: Severe presentation – direct medical supervision recommended")
 
         # Deduplicate while preserving order
-        seen = set()
-        deduped = []
-        for flag in flags:
-            if flag not in seen:
-                deduped.append(flag)
-                seen.add(flag)
-        return deduped
+        return list(dict.fromkeys(flags))
 
     # ------------------------------------------------------------------
     # User-facing recommendations
@@ -3,15 +3,15 @@
 from __future__ import annotations
 
 import io
+import itertools
 import json
 import re
+import secrets
 import shutil
+import time
 from dataclasses import dataclass
-from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
-
-from PIL import Image
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
 
 try:  # Optional dependency – degrade gracefully during tests
     import pdfplumber  # type: ignore
@@ -23,6 +23,44 @@ from config import DEFAULT_LOCATION
 
 UploadedLike = Union[Path, str, io.BytesIO, Any]
 
+_COPY_CHUNK_BYTES = 1024 * 1024
+# Per-process upload sequence (one next() per file) so uploads persisted in
+# the same second get distinct names; the random start keeps processes apart
+_UPLOAD_SEQ = itertools.count(secrets.randbelow(10_000))
+
+_PNG_MAGIC = b"\x89PNG\r\n\x1a\n"
+_JPEG_MAGIC = b"\xff\xd8\xff"
+_IMAGE_MAGIC = (_PNG_MAGIC, _JPEG_MAGIC)
+
+_NON_DIGIT_RE = re.compile(r"\D")
+_ALLERGY_SPLIT_RE = re.compile(r"[,;]\s*")
+_AGE_RE = re.compile(r"age[:\s]+(\d{1,3})", re.IGNORECASE)
+# Tried in order; the first pattern that matches anywhere wins
+_SYMPTOM_PATTERNS = tuple(
+    re.compile(pattern, re.IGNORECASE)
+    for pattern in (
+        r"chief\s+complaint[s]?[:\s]+([^\n]+)",
+        r"presenting\s+complaint[s]?[:\s]+([^\n]+)",
+        r"symptom[s]?[:\s]+([^\n]+)",
+        r"history[:\s]+([^\n]+)",
+    )
+)
+
+# (pattern, replacement, needs "@"); every pattern without "@" needs a digit
+_PII_PATTERNS = tuple(
+    (re.compile(pattern), repl, needs_at)
+    for pattern, repl, needs_at in (
+        (r"\b\d{10}\b", "**********", False),
+        (r"\b\d{3}[-.\s]?\d{3}[-.\s]?\d{4}\b", "***-***-****", False),
+        (r"\b\d{4}\s?\d{4}\s?\d{4}\b", "**** **** ****", False),
+        (r"\b[A-Z]{5}\d{4}[A-Z]\b", "*****####*", False),
+        (r"\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b", "***@***.***", True),
+        (r"\b\d{4}[-\s]?\d{4}[-\s]?\d{4}[-\s]?\d{4}\b", "**** **** **** ****", False),
+    )
+)
+_PII_ANY = re.compile("|".join(f"(?:{pattern.pattern})" for pattern, _, _ in _PII_PATTERNS))
+_ANY_DIGIT_RE = re.compile(r"\d")
+
 
 @dataclass
 class IngestionPayload:
@@ -40,6 +78,9 @@ class IngestionPayload:
 class IngestionAgent(BaseAgent):
     """First agent in pipeline: validates artifacts and structures patient bundle."""
 
+    # Persists uploads to disk on every call, so results must not be replayed.
+    cacheable = False
+
     def __init__(self, upload_dir: str = "./uploads", log_callback=None) -> None:
         super().__init__("IngestionAgent", log_callback)
         self.upload_dir = Path(upload_dir)
@@ -48,6 +89,7 @@ class IngestionAgent(BaseAgent):
         self.allowed_image_exts = {".png", ".jpg", ".jpeg"}
         self.allowed_doc_exts = {".pdf", ".txt"}
         self.max_file_size_bytes = 10 * 1024 * 1024  # 10 MB
+        self.max_pdf_pages = 5  # pages of text extracted per PDF
 
     def process(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
         """Validate uploads, extract optional text, and emit structured bundle."""
@@ -193,12 +235,15 @@ class IngestionAgent(BaseAgent):
         else:
             source = None
 
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        stamp = f"{int(time.time())}_{next(_UPLOAD_SEQ):04d}"
         suffix = self._infer_extension(upload) or ""
-        destination = self.upload_dir / f"{prefix}_{timestamp}{suffix}"
+        destination = self.upload_dir / f"{prefix}_{stamp}{suffix}"
 
         if source and source.exists():
-            shutil.copy(source, destination)
+            # copyfile uses the kernel's zero-copy path (sendfile) on Linux
+            shutil.copyfile(source, destination)
+        elif hasattr(upload, "read"):
+            self._stream_upload(upload, destination)
         else:
             blob = self._read_bytes(upload)
             if len(blob) > self.max_file_size_bytes:
@@ -206,12 +251,12 @@ class IngestionAgent(BaseAgent):
             destination.write_bytes(blob)
 
         if prefix == "xray":
-            try:
-                with Image.open(destination) as img:
-                    img.verify()
-            except Exception as error:
+            # Header check only; ImagingAgent decodes the full image once later
+            with destination.open("rb") as handle:
+                header = handle.read(len(_PNG_MAGIC))
+            if not header.startswith(_IMAGE_MAGIC):
                 destination.unlink(missing_ok=True)
-                raise ValueError(f"Invalid X-ray image: {error}")
+                raise ValueError("Invalid X-ray image: expected a PNG or JPEG file")
 
         return destination
 
@@ -231,6 +276,25 @@ class IngestionAgent(BaseAgent):
             combined = self._mask_pii(combined)
         return paths, combined
 
+    def _stream_upload(self, upload: Any, destination: Path) -> None:
+        """Copy a file-like upload to disk in chunks, enforcing the size limit."""
+        upload.seek(0)
+        written = 0
+        # Exclusive create: a name collision fails instead of overwriting
+        # another worker's upload (and that file is left alone below)
+        out = destination.open("xb")
+        try:
+            with out:
+                while chunk := upload.read(_COPY_CHUNK_BYTES):
+                    written += len(chunk)
+                    if written > self.max_file_size_bytes:
+                        raise ValueError("Uploaded file exceeds 10MB limit")
+                    out.write(chunk)
+        except BaseException:
+            # Never leave a truncated upload behind
+            destination.unlink(missing_ok=True)
+            raise
+
     def _read_bytes(self, upload: UploadedLike) -> bytes:
         if isinstance(upload, io.BytesIO):
             upload.seek(0)
@@ -257,17 +321,31 @@ class IngestionAgent(BaseAgent):
         return Path(name).suffix.lower()
 
     def _extract_document_text(self, path: Path) -> str:
+        # Pages are pulled lazily: once the top-priority symptom section and
+        # an age line have been seen, later pages cannot change what the
+        # bundle uses, so their (expensive) layout analysis is skipped.
+        pages: List[str] = []
+        found_complaint = found_age = False
+        for text in self._iter_document_pages(path):
+            pages.append(text)
+            found_complaint = found_complaint or bool(_SYMPTOM_PATTERNS[0].search(text))
+            found_age = found_age or bool(_AGE_RE.search(text))
+            if found_complaint and found_age:
+                break
+        return "\n".join(pages)
+
+    def _iter_document_pages(self, path: Path) -> Iterator[str]:
+        """Yield document text page by page (a .txt file is a single page)."""
         suffix = path.suffix.lower()
         if suffix == ".txt":
-            return path.read_text(errors="ignore")
-        if suffix == ".pdf" and pdfplumber:
+            yield path.read_text(errors="ignore")
+        elif suffix == ".pdf" and pdfplumber:
             try:
                 with pdfplumber.open(path) as pdf:
-                    pages = [page.extract_text() or "" for page in pdf.pages]
-                return "\n".join(pages)
+                    for page in pdf.pages[: self.max_pdf_pages]:
+                        yield page.extract_text() or ""
             except Exception as error:
                 self._log("WARNING", "pdfplumber failed", {"error": str(error)})
-        return ""
 
     def _build_patient_profile(self, raw: Dict[str, Any], extracted_text: str) -> Dict[str, Any]:
         age = self._coerce_int(raw.get("age"), default=0, lower=0, upper=120)
@@ -291,7 +369,7 @@ class IngestionAgent(BaseAgent):
                 zip_code = self._sanitize_pincode(potential_zip) or ""
 
         if age == 0 and extracted_text:
-            match = re.search(r"age[:\s]+(\d{1,3})", extracted_text, flags=re.IGNORECASE)
+            match = _AGE_RE.search(extracted_text)
             if match:
                 age = self._coerce_int(match.group(1), default=age, lower=0, upper=120)
 
@@ -326,7 +404,7 @@ class IngestionAgent(BaseAgent):
         if value is None:
             return []
         if isinstance(value, str):
-            items = re.split(r"[,;]\s*", value)
+            items = _ALLERGY_SPLIT_RE.split(value)
         else:
             items = list(value)
         return sorted({item.strip() for item in items if item and item.strip()})
@@ -344,14 +422,8 @@ class IngestionAgent(BaseAgent):
         return " | ".join(parts)
 
     def _extract_symptom_section(self, text: str) -> str:
-        patterns = (
-            r"chief\s+complaint[s]?[:\s]+([^\n]+)",
-            r"presenting\s+complaint[s]?[:\s]+([^\n]+)",
-            r"symptom[s]?[:\s]+([^\n]+)",
-            r"history[:\s]+([^\n]+)",
-        )
-        for pattern in patterns:
-            match = re.search(pattern, text, flags=re.IGNORECASE)
+        for pattern in _SYMPTOM_PATTERNS:
+            match = pattern.search(text)
             if match:
                 return match.group(1).strip()
         return self._excerpt(text, 160)
@@ -367,7 +439,10 @@ class IngestionAgent(BaseAgent):
     def _sanitize_pincode(value: Any) -> Optional[str]:
         if value is None:
             return None
-        digits = re.sub(r"\D", "", str(value))
+        text = str(value)
+        # Already-clean pincodes (the common case) skip the regex; isdecimal()
+        # and \D agree on what a digit is
+        digits = text if text.isdecimal() else _NON_DIGIT_RE.sub("", text)
         if len(digits) == 6:
             return digits
         return None
@@ -376,21 +451,23 @@ class IngestionAgent(BaseAgent):
         if not text:
             return text
 
-        replacements = [
-            (r"\b\d{10}\b", "**********"),
-            (r"\b\d{3}[-.\s]?\d{3}[-.\s]?\d{4}\b", "***-***-****"),
-            (r"\b\d{4}\s?\d{4}\s?\d{4}\b", "**** **** ****"),
-            (r"\b[A-Z]{5}\d{4}[A-Z]\b", "*****####*"),
-            (r"\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b", "***@***.***"),
-            (r"\b\d{4}[-\s]?\d{4}[-\s]?\d{4}[-\s]?\d{4}\b", "**** **** **** ****"),
-        ]
+        # Every pattern needs a digit or an "@", both cheap to look for.
+        # Past that, one scan with the union tells whether there is any PII;
+        # only then mask pattern by pattern (later patterns see the output of
+        # earlier ones), skipping those whose trigger character is absent.
+        has_digit = _ANY_DIGIT_RE.search(text) is not None
+        has_at = "@" in text
+        if not (has_digit or has_at) or not _PII_ANY.search(text):
+            return text
+
         masked = text
-        for pattern, repl in replacements:
-            masked = re.sub(pattern, repl, masked)
+        for pattern, repl, needs_at in _PII_PATTERNS:
+            if has_at if needs_at else has_digit:
+                masked = pattern.sub(repl, masked)
         return masked
 
     def cleanup_old_files(self, hours: int = 24) -> int:
-        cutoff = datetime.now().timestamp() - hours * 3600
+        cutoff = time.time() - hours * 3600
         deleted = 0
         for path in self.upload_dir.glob("*"):
             if path.is_file() and path.stat().st_mtime < cutoff:
@@ -11,16 +11,144 @@ Responsibilities:
 - Calculate pricing and delivery fees
 """
 
+import hashlib
 import json
 import math
 import re
 from datetime import datetime, timedelta
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from types import MappingProxyType
+from typing import Dict, List, Mapping, NamedTuple, Optional, Tuple
 
+import numpy as np
 import pandas as pd
 
-from config import DEFAULT_LOCATION
+try:  # Optional dependency – compiled Haversine for the pharmacy scan
+    from numba import njit  # type: ignore
+except Exception:  # pragma: no cover - optional dependency
+    njit = None
+
+from agents.base_agent import run_in_agent_executor
+from config import DEFAULT_LOCATION, LOGGING_CONFIG
+
+
+_NON_DIGIT_RE = re.compile(r"\D")
+_EVERY_HOURS_RE = re.compile(r"every\s*(\d+)")
+_NUMBER_RE = re.compile(r"(\d+)")
+_EMPTY_MAPPING = MappingProxyType({})
+# Equirectangular pre-filter in _find_nearby_pharmacies: only applied when
+# every limit is within _APPROX_MAX_KM, widened by _APPROX_MARGIN (1%)
+_APPROX_MAX_KM = 50
+_APPROX_MARGIN = 1.01
+# Location fields that may carry the pincode, in priority order
+_PINCODE_KEYS = ("pincode", "zip_code", "zipcode", "postal_code", "zip")
+# Severity order for LOGGING_CONFIG["log_level"]; SUCCESS ranks with INFO
+_LOG_LEVEL_RANK = {"DEBUG": 10, "INFO": 20, "SUCCESS": 20, "WARNING": 30, "ERROR": 40, "CRITICAL": 50}
+_INVENTORY_DTYPES = {
+    'pharmacy_id': str,
+    'sku': str,
+    'drug_name': str,
+    'form': 'category',
+    'strength': str,
+    'price': np.float64,
+    # Nullable so blank cells still load (filled with 0 after reading)
+    'qty': 'Int32',
+}
+
+
+def _response_template(**fields) -> Mapping:
+    """Fixed fields of a non-success response; None marks a per-call field."""
+    return MappingProxyType({
+        "pharmacy_id": "",
+        "pharmacy_name": "",
+        "distance_km": 0,
+        "eta_min": 0,
+        "delivery_fee": 0,
+        "items": None,
+        "total_price": 0,
+        **fields,
+    })
+
+
+# Built once per process; each response copies its template and fills in the
+# per-call fields (``items`` always gets a fresh list, never a shared one)
+_NO_MEDICINES_TEMPLATE = _response_template(
+    availability="none",
+    message="No OTC medicines to match",
+    status="no_medicines",
+    timestamp=None,
+)
+_LOCATION_ERROR_TEMPLATE = _response_template(
+    availability="location_error",
+    message=None,
+    recommendation="Please provide a valid 6-digit Indian pincode",
+    status="error",
+    timestamp=None,
+)
+_NO_PHARMACIES_TEMPLATE = _response_template(
+    availability="no_pharmacies",
+    message=None,
+    recommendation="Consider tele-consultation or visit nearby clinic directly",
+    status="no_match",
+    timestamp=None,
+)
+_OUT_OF_STOCK_TEMPLATE = _response_template(
+    availability="out_of_stock",
+    message="Required medicines currently out of stock at nearby pharmacies",
+    recommendation="Check with pharmacy directly or try alternative location",
+    status="no_stock",
+    timestamp=None,
+)
+_ERROR_TEMPLATE = _response_template(
+    availability="error",
+    error=None,
+    status="error",
+    timestamp=None,
+    agent="PharmacyAgent",
+)
+
+
+@lru_cache(maxsize=10_000)
+def _sanitize_pincode(value: str) -> Optional[str]:
+    """Return the 6 digits of a pincode-like string, else None (memoized; pincodes repeat)."""
+    digits = _NON_DIGIT_RE.sub("", value)
+    return digits if len(digits) == 6 else None
+
+
+def _haversine_kernel(lat1, lon1, cos_lat1, lat_rad, lon_rad, cos_lat, out):
+    """Fill ``out`` with Haversine distances in km (same formula as the NumPy path)."""
+    for i in range(lat_rad.shape[0]):
+        dlat = lat_rad[i] - lat1
+        dlon = lon_rad[i] - lon1
+        a = math.sin(dlat / 2) ** 2 + cos_lat1 * cos_lat[i] * math.sin(dlon / 2) ** 2
+        out[i] = 2 * math.asin(math.sqrt(a)) * 6371
+
+
+# Compiled once per process (and cached on disk) when numba is installed:
+# one fused loop instead of a temporary array per NumPy ufunc
+_haversine_kernel_jit = njit(cache=True)(_haversine_kernel) if njit is not None else None
+
+
+class _PharmacyTable(NamedTuple):
+    """Parsed pharmacies.json shared by all PharmacyAgent instances."""
+    
+    records: Tuple[Mapping, ...]
+    lat_rad: np.ndarray
+    lon_rad: np.ndarray
+    cos_lat: np.ndarray
+    delivery_km: np.ndarray
+    lat_order: np.ndarray
+    lat_sorted: np.ndarray
+    max_delivery_km: float
+
+
+class _InventoryTable(NamedTuple):
+    """Parsed inventory.csv shared by all PharmacyAgent instances."""
+    
+    row_count: int
+    by_pharmacy: Mapping[str, Mapping[str, Mapping]]
+    stocking: Mapping[str, frozenset]
 
 
 class PharmacyAgent:
@@ -41,10 +169,11 @@ class PharmacyAgent:
         """
         self.data_dir = Path(data_dir)
         self.log_callback = log_callback
+        self._min_log_rank = _LOG_LEVEL_RANK.get(str(LOGGING_CONFIG.get("log_level", "INFO")).upper(), 20)
         
         # Load data
         self.pharmacies = self._load_pharmacies()
-        self.inventory = self._load_inventory()
+        self._load_inventory()
         self.zipcodes = self._load_zipcodes()
         
         # Configuration
@@ -55,7 +184,12 @@ class PharmacyAgent:
         
         self._log("INFO", f"Pharmacy Agent initialized with {len(self.pharmacies)} pharmacies")
     
-    def process(self, therapy_result: Dict, location: Dict) -> Dict:
+    def process(
+        self,
+        therapy_result: Dict,
+        location: Dict,
+        prefetched: Optional[Dict] = None
+    ) -> Dict:
         """
         Main processing method - match pharmacy and check stock.
         
@@ -67,7 +201,8 @@ class PharmacyAgent:
             },
             "location": {
                 "pincode": "380001"
-            }
+            },
+            "prefetched": optional output of prefetch_pharmacies(location)
         }
         
         Returns:
@@ -94,6 +229,8 @@ class PharmacyAgent:
         }
         """
         self._log("INFO", "Pharmacy Agent started processing")
+        # One clock reading per request keeps all timestamps in the response consistent
+        now = datetime.now()
         
         try:
             # Extract required medicines
@@ -101,42 +238,20 @@ class PharmacyAgent:
             
             if not otc_options:
                 self._log("WARNING", "No OTC medicines to match")
-                return self._no_medicines_response()
+                return self._no_medicines_response(now)
             
             # Build therapy map (sku -> recommendation details)
             therapy_map = {item.get("sku"): item for item in otc_options if item.get("sku")}
 
-            # Get patient location coordinates
-            location_context = self._normalize_location(location)
-            pincode = location_context.get("pincode")
+            # Resolve location and nearby pharmacies (unless already prefetched)
+            candidates = prefetched if prefetched is not None else self.prefetch_pharmacies(location)
             
-            if not pincode:
-                raw_val = location_context.get("raw_input")
-                self._log("WARNING", f"Invalid location payload: {raw_val}")
-                return self._location_error_response(raw_val or "")
-
-            patient_coords = self._get_coordinates(pincode)
-
-            if not patient_coords:
-                self._log("WARNING", f"Invalid pincode: {pincode}")
-                return self._location_error_response(pincode)
-
-            location_context["coordinates_used"] = patient_coords
-            default_coords = (DEFAULT_LOCATION["lat"], DEFAULT_LOCATION["lon"])
-            location_context["default_coordinates_applied"] = (
-                math.isclose(patient_coords[0], default_coords[0], rel_tol=1e-4)
-                and math.isclose(patient_coords[1], default_coords[1], rel_tol=1e-4)
-            )
+            if candidates["error_response"] is not None:
+                return candidates["error_response"]
             
-            # Find nearby pharmacies
-            nearby_pharmacies = self._find_nearby_pharmacies(
-                patient_coords,
-                self.max_search_radius_km
-            )
-            
-            if not nearby_pharmacies:
-                self._log("WARNING", "No pharmacies found in delivery range")
-                return self._no_pharmacies_response()
+            location_context = candidates["location_context"]
+            patient_coords = candidates["patient_coords"]
+            nearby_pharmacies = candidates["nearby_pharmacies"]
             
             # Check stock availability at each pharmacy
             pharmacy_matches = self._check_stock_availability(
@@ -146,7 +261,7 @@ class PharmacyAgent:
             
             if not pharmacy_matches:
                 self._log("WARNING", "No pharmacies have required medicines in stock")
-                return self._out_of_stock_response(nearby_pharmacies[0])
+                return self._out_of_stock_response(nearby_pharmacies[0], now)
             
             # Select best pharmacy (closest with full stock)
             best_match = self._select_best_pharmacy(pharmacy_matches)
@@ -156,7 +271,8 @@ class PharmacyAgent:
                 best_match,
                 patient_coords,
                 therapy_map,
-                location_context
+                location_context,
+                now
             )
             
             self._log("SUCCESS", f"Matched pharmacy: {result['pharmacy_name']} ({result['distance_km']:.1f} km)")
@@ -165,44 +281,235 @@ class PharmacyAgent:
             
         except Exception as e:
             self._log("ERROR", f"Pharmacy matching failed: {str(e)}")
-            return self._error_response(str(e))
+            return self._error_response(str(e), now)
+    
+    async def process_async(
+        self,
+        therapy_result: Dict,
+        location: Dict,
+        prefetched: Optional[Dict] = None
+    ) -> Dict:
+        """Async variant of process() that runs on the shared agent executor."""
+        return await run_in_agent_executor(self.process, therapy_result, location, prefetched)
     
-    def _load_pharmacies(self) -> pd.DataFrame:
-        """Load pharmacies database."""
+    def prefetch_pharmacies(self, location: Dict) -> Dict:
+        """
+        Resolve patient location and nearby pharmacies.
+        
+        Only depends on the location, so the coordinator can run it while
+        Imaging/Therapy are still working and hand the result to process().
+        
+        Returns:
+        {
+            "location_context": {...},
+            "patient_coords": (lat, lon),
+            "nearby_pharmacies": [...],   # sorted by distance
+            "error_response": None        # or the response to return as-is
+        }
+        """
+        candidates = {
+            "location_context": None,
+            "patient_coords": None,
+            "nearby_pharmacies": [],
+            "error_response": None
+        }
+        
+        # Get patient location coordinates
+        location_context = self._normalize_location(location)
+        pincode = location_context.get("pincode")
+        
+        if not pincode:
+            raw_val = location_context.get("raw_input")
+            self._log("WARNING", f"Invalid location payload: {raw_val}")
+            candidates["error_response"] = self._location_error_response(raw_val or "")
+            return candidates
+
+        patient_coords = self._get_coordinates(pincode)
+
+        if not patient_coords:
+            self._log("WARNING", f"Invalid pincode: {pincode}")
+            candidates["error_response"] = self._location_error_response(pincode)
+            return candidates
+
+        location_context["coordinates_used"] = patient_coords
+        default_coords = (DEFAULT_LOCATION["lat"], DEFAULT_LOCATION["lon"])
+        location_context["default_coordinates_applied"] = (
+            math.isclose(patient_coords[0], default_coords[0], rel_tol=1e-4)
+            and math.isclose(patient_coords[1], default_coords[1], rel_tol=1e-4)
+        )
+        
+        # Find nearby pharmacies
+        nearby_pharmacies = self._find_nearby_pharmacies(
+            patient_coords,
+            self.max_search_radius_km
+        )
+        
+        if not nearby_pharmacies:
+            self._log("WARNING", "No pharmacies found in delivery range")
+            candidates["error_response"] = self._no_pharmacies_response()
+            return candidates
+        
+        candidates["location_context"] = location_context
+        candidates["patient_coords"] = patient_coords
+        candidates["nearby_pharmacies"] = nearby_pharmacies
+        return candidates
+    
+    async def prefetch_pharmacies_async(self, location: Dict) -> Dict:
+        """Async variant of prefetch_pharmacies() for speculative execution."""
+        return await run_in_agent_executor(self.prefetch_pharmacies, location)
+    
+    def _load_pharmacies(self) -> Tuple[Mapping, ...]:
+        """Load pharmacies database as read-only records (shared across instances per file version)."""
         pharmacy_file = self.data_dir / "pharmacies.json"
         
         if not pharmacy_file.exists():
             raise FileNotFoundError(f"Pharmacies database not found: {pharmacy_file}")
         
-        with open(pharmacy_file, 'r') as f:
+        # Keyed by mtime, so editing pharmacies.json triggers a fresh parse
+        table = self._read_pharmacy_table(str(pharmacy_file.resolve()), pharmacy_file.stat().st_mtime_ns)
+        
+        self._pharm_records = table.records
+        self._pharm_lat_rad = table.lat_rad
+        self._pharm_lon_rad = table.lon_rad
+        self._pharm_cos_lat = table.cos_lat
+        self._pharm_delivery_km = table.delivery_km
+        self._pharm_lat_order = table.lat_order
+        self._pharm_lat_sorted = table.lat_sorted
+        self._pharm_max_delivery_km = table.max_delivery_km
+        
+        self._log("INFO", f"Loaded {len(table.records)} pharmacies")
+        return table.records
+    
+    @staticmethod
+    @lru_cache(maxsize=4)
+    def _read_pharmacy_table(pharmacy_path: str, mtime_ns: int) -> _PharmacyTable:
+        """
+        Parse pharmacies.json into coordinate arrays and records for the distance scan.
+        
+        Memoized on (path, mtime) and shared by every PharmacyAgent, so the
+        returned arrays and records are read-only. Row i of every array
+        describes records[i].
+        """
+        with open(pharmacy_path, 'r') as f:
             data = json.load(f)
         
-        df = pd.DataFrame(data)
-        self._log("INFO", f"Loaded {len(df)} pharmacies")
-        return df
+        # Each scan merges distance_km into a new dict on top of these
+        records = tuple(MappingProxyType(dict(pharmacy)) for pharmacy in data)
+        
+        lat_rad = np.radians(np.array([p['lat'] for p in records], dtype=np.float64))
+        lon_rad = np.radians(np.array([p['lon'] for p in records], dtype=np.float64))
+        cos_lat = np.cos(lat_rad)
+        # Without any delivery_km field every pharmacy delivers 10 km; a
+        # pharmacy missing just its own is limited by the search radius (NaN)
+        missing_delivery = np.nan if any('delivery_km' in p for p in records) else 10.0
+        delivery_km = np.array(
+            [p.get('delivery_km', missing_delivery) for p in records],
+            dtype=np.float64
+        )
+        
+        # Latitude index: a pharmacy d km away is at least d / R radians of
+        # latitude away, so a radius query only needs the rows whose latitude
+        # falls in a band found by binary search
+        lat_order = np.argsort(lat_rad, kind='stable')
+        lat_sorted = lat_rad[lat_order]
+        max_delivery_km = float(np.nanmax(delivery_km)) if records else 0.0
+        
+        for array in (lat_rad, lon_rad, cos_lat, delivery_km, lat_order, lat_sorted):
+            array.setflags(write=False)
+        
+        return _PharmacyTable(
+            records=records,
+            lat_rad=lat_rad,
+            lon_rad=lon_rad,
+            cos_lat=cos_lat,
+            delivery_km=delivery_km,
+            lat_order=lat_order,
+            lat_sorted=lat_sorted,
+            max_delivery_km=max_delivery_km,
+        )
     
-    def _load_inventory(self) -> pd.DataFrame:
-        """Load inventory database."""
+    def _load_inventory(self) -> None:
+        """Load inventory lookups (shared across instances per file version)."""
         inventory_file = self.data_dir / "inventory.csv"
         
         if not inventory_file.exists():
             raise FileNotFoundError(f"Inventory database not found: {inventory_file}")
         
-        df = pd.read_csv(inventory_file)
-        self._log("INFO", f"Loaded {len(df)} inventory records")
-        return df
+        table = self._read_inventory_table(str(inventory_file.resolve()), inventory_file.stat().st_mtime_ns)
+        
+        self._inventory_by_pharmacy = table.by_pharmacy
+        self._pharmacies_stocking = table.stocking
+        
+        self._log("INFO", f"Loaded {table.row_count} inventory records")
     
-    def _load_zipcodes(self) -> pd.DataFrame:
-        """Load zipcodes database."""
+    @staticmethod
+    @lru_cache(maxsize=4)
+    def _read_inventory_table(inventory_path: str, mtime_ns: int) -> _InventoryTable:
+        """
+        Parse inventory.csv into stock lookups.
+        
+        Memoized on (path, mtime) and shared by every PharmacyAgent; the
+        lookups are read-only mappings. The DataFrame itself is discarded
+        once they are built.
+        """
+        # Narrow dtypes where exact: prices stay float64 so they are reported unchanged
+        df = pd.read_csv(
+            inventory_path,
+            usecols=list(_INVENTORY_DTYPES),
+            dtype=_INVENTORY_DTYPES
+        )
+        # A blank quantity counts as out of stock, as NaN > 0 did before
+        df['qty'] = df['qty'].fillna(0)
+        
+        # pharmacy_id -> {sku: record} for constant-time stock lookups
+        by_pharmacy: Dict[str, Dict[str, Mapping]] = {}
+        for row in df.itertuples(index=False):
+            # First row wins for duplicate (pharmacy, sku) pairs, as with iloc[0]
+            by_pharmacy.setdefault(row.pharmacy_id, {}).setdefault(row.sku, MappingProxyType({
+                'drug_name': row.drug_name,
+                'form': row.form,
+                'strength': row.strength,
+                'price': float(row.price),
+                'qty': int(row.qty),
+            }))
+        
+        # Reverse index: sku -> pharmacies holding it in stock
+        stocking: Dict[str, set] = {}
+        for pharmacy_id, records in by_pharmacy.items():
+            for sku, record in records.items():
+                if record['qty'] > 0:
+                    stocking.setdefault(sku, set()).add(pharmacy_id)
+        
+        return _InventoryTable(
+            row_count=len(df),
+            by_pharmacy=MappingProxyType({
+                pharmacy_id: MappingProxyType(records) for pharmacy_id, records in by_pharmacy.items()
+            }),
+            stocking=MappingProxyType({sku: frozenset(ids) for sku, ids in stocking.items()}),
+        )
+    
+    def _load_zipcodes(self) -> Mapping[int, Tuple[float, float]]:
+        """Load zipcodes database as a pincode -> (lat, lon) lookup (shared per file version)."""
         zipcode_file = self.data_dir / "zipcodes.csv"
         
         if not zipcode_file.exists():
             self._log("WARNING", f"Zipcodes database not found: {zipcode_file}")
-            return pd.DataFrame(columns=['pincode', 'lat', 'lon'])
+            return _EMPTY_MAPPING
         
-        df = pd.read_csv(zipcode_file)
-        self._log("INFO", f"Loaded {len(df)} zipcodes")
-        return df
+        lookup = self._read_zipcodes(str(zipcode_file.resolve()), zipcode_file.stat().st_mtime_ns)
+        self._log("INFO", f"Loaded {len(lookup)} zipcodes")
+        return lookup
+    
+    @staticmethod
+    @lru_cache(maxsize=4)
+    def _read_zipcodes(zipcode_path: str, mtime_ns: int) -> Mapping[int, Tuple[float, float]]:
+        """Parse zipcodes.csv into a read-only pincode -> (lat, lon) mapping (memoized on path, mtime)."""
+        df = pd.read_csv(zipcode_path, usecols=['pincode', 'lat', 'lon'])
+        lookup: Dict[int, Tuple[float, float]] = {}
+        for pincode, lat, lon in zip(df['pincode'].tolist(), df['lat'].tolist(), df['lon'].tolist()):
+            # First row wins for duplicate pincodes
+            lookup.setdefault(int(pincode), (float(lat), float(lon)))
+        return MappingProxyType(lookup)
     
     def _get_coordinates(self, pincode: str) -> Optional[Tuple[float, float]]:
         """
@@ -218,12 +525,10 @@ class PharmacyAgent:
             return None
         
         try:
-            pincode_int = int(pincode)
-            match = self.zipcodes[self.zipcodes['pincode'] == pincode_int]
-            
-            if not match.empty:
-                return (float(match.iloc[0]['lat']), float(match.iloc[0]['lon']))
-        except:
+            coords = self.zipcodes.get(int(pincode))
+            if coords is not None:
+                return coords
+        except (TypeError, ValueError):
             pass
 
         # Fallback to default location (Ahmedabad)
@@ -233,26 +538,14 @@ class PharmacyAgent:
     def _normalize_location(self, location: Optional[Dict]) -> Dict:
         """Extract and sanitize location fields from payload."""
         location = location or {}
-        candidate_keys = [
-            "pincode",
-            "zip_code",
-            "zipcode",
-            "postal_code",
-            "zip",
-        ]
-
-        raw_input = {key: location.get(key) for key in candidate_keys}
-        if "fallback_used" in location:
-            raw_input["fallback_used"] = location.get("fallback_used")
 
         sanitized_pincode = None
-        for key in candidate_keys:
+        for key in _PINCODE_KEYS:
             value = location.get(key)
             if value is None:
                 continue
-            digits = re.sub(r"\D", "", str(value))
-            if len(digits) == 6:
-                sanitized_pincode = digits
+            sanitized_pincode = _sanitize_pincode(str(value))
+            if sanitized_pincode:
                 break
 
         fallback_requested = bool(location.get("fallback_used"))
@@ -264,6 +557,13 @@ class PharmacyAgent:
             city = city or DEFAULT_LOCATION["city"]
             used_default = True
 
+        # Echo of the submitted fields, only needed to report an unusable location
+        raw_input = None
+        if not sanitized_pincode:
+            raw_input = {key: location.get(key) for key in _PINCODE_KEYS}
+            if "fallback_used" in location:
+                raw_input["fallback_used"] = location.get("fallback_used")
+
         return {
             "raw_input": raw_input,
             "pincode": sanitized_pincode,
@@ -287,23 +587,25 @@ class PharmacyAgent:
         Returns:
             List of pharmacy dicts with distance calculated
         """
-        nearby = []
-        patient_lat, patient_lon = patient_coords
-        
-        for _, pharmacy in self.pharmacies.iterrows():
-            # Calculate distance
-            distance = self._haversine_distance(
-                patient_lat, patient_lon,
-                pharmacy['lat'], pharmacy['lon']
-            )
-            
-            # Check if within delivery range
-            pharmacy_delivery_km = pharmacy.get('delivery_km', 10)
-            
-            if distance <= min(max_radius_km, pharmacy_delivery_km):
-                pharmacy_dict = pharmacy.to_dict()
-                pharmacy_dict['distance_km'] = round(distance, 2)
-                nearby.append(pharmacy_dict)
+        rows = self._rows_in_latitude_band(patient_coords[0], max_radius_km)
+        
+        # Within both the search radius and the pharmacy's own delivery range
+        # (fmin ignores a missing delivery_km, as min() did)
+        limits = np.fmin(max_radius_km, self._pharm_delivery_km[rows])
+        
+        # Cheap equirectangular pre-filter at city scale, with a margin far
+        # above its error there, so only likely matches get the exact formula
+        if rows.size and limits.max() <= _APPROX_MAX_KM:
+            keep = self._approx_distances(*patient_coords, rows=rows) <= limits * _APPROX_MARGIN
+            rows, limits = rows[keep], limits[keep]
+        
+        distances = self._haversine_distances(*patient_coords, rows=rows)
+        in_range = distances <= limits
+        
+        nearby = [
+            {**self._pharm_records[idx], 'distance_km': round(float(distance), 2)}
+            for idx, distance in zip(rows[in_range].tolist(), distances[in_range].tolist())
+        ]
         
         # Sort by distance (closest first)
         nearby.sort(key=lambda x: x['distance_km'])
@@ -337,6 +639,69 @@ class PharmacyAgent:
         
         return c * r
     
+    def _rows_in_latitude_band(self, lat: float, max_radius_km: float) -> np.ndarray:
+        """
+        Pharmacy rows that can possibly lie within max_radius_km of latitude lat.
+        
+        Returns:
+            Row indices in ascending (file) order
+        """
+        radius_km = min(max_radius_km, self._pharm_max_delivery_km)
+        # Small slack so rounding never drops a pharmacy right on the boundary
+        band = radius_km / 6371 + 1e-9
+        lat1 = math.radians(lat)
+        
+        lo = np.searchsorted(self._pharm_lat_sorted, lat1 - band, side='left')
+        hi = np.searchsorted(self._pharm_lat_sorted, lat1 + band, side='right')
+        return np.sort(self._pharm_lat_order[lo:hi])
+    
+    def _approx_distances(self, lat: float, lon: float, rows: np.ndarray) -> np.ndarray:
+        """
+        Equirectangular approximation of the distance from (lat, lon) to pharmacy rows.
+        
+        Within 50 km it stays within 0.2% of the Haversine distance at Indian
+        latitudes; used only to pre-filter candidates, never as the reported distance.
+        
+        Returns:
+            Approximate distances in kilometers, aligned with rows
+        """
+        lat1, lon1 = math.radians(lat), math.radians(lon)
+        dlat = self._pharm_lat_rad[rows] - lat1
+        dlon = (self._pharm_lon_rad[rows] - lon1) * math.cos(lat1)
+        return np.sqrt(dlat * dlat + dlon * dlon) * 6371
+    
+    def _haversine_distances(
+        self,
+        lat: float,
+        lon: float,
+        rows: Optional[np.ndarray] = None
+    ) -> np.ndarray:
+        """
+        Haversine distance from (lat, lon) to pharmacies in one vectorized pass.
+        
+        Args:
+            rows: Pharmacy row indices to measure (default: all)
+        
+        Returns:
+            Distances in kilometers, aligned with rows
+        """
+        lat1, lon1 = math.radians(lat), math.radians(lon)
+        lat_rad, lon_rad, cos_lat = self._pharm_lat_rad, self._pharm_lon_rad, self._pharm_cos_lat
+        if rows is not None:
+            lat_rad, lon_rad, cos_lat = lat_rad[rows], lon_rad[rows], cos_lat[rows]
+        
+        if _haversine_kernel_jit is not None:
+            distances = np.empty(lat_rad.shape[0])
+            _haversine_kernel_jit(lat1, lon1, math.cos(lat1), lat_rad, lon_rad, cos_lat, distances)
+            return distances
+        
+        dlat = lat_rad - lat1
+        dlon = lon_rad - lon1
+        a = np.sin(dlat / 2) ** 2 + math.cos(lat1) * cos_lat * np.sin(dlon / 2) ** 2
+        c = 2 * np.arcsin(np.sqrt(a))
+        
+        return c * 6371
+    
     def _check_stock_availability(
         self,
         pharmacies: List[Dict],
@@ -346,51 +711,55 @@ class PharmacyAgent:
         Check which pharmacies have the required medicines in stock.
         
         Args:
-            pharmacies: List of nearby pharmacies
-            otc_options: List of required medicines with SKUs
+            pharmacies: List of nearby pharmacies, sorted by distance
+            therapy_map: Required medicines keyed by SKU
             
         Returns:
-            List of pharmacies with stock information
+            List of pharmacies with stock information, ending at the
+            closest full-stock pharmacy if there is one
         """
         required_skus = [sku for sku in therapy_map.keys() if sku]
         matches = []
 
-        for pharmacy in pharmacies:
-            pharmacy_id = pharmacy['id']
+        # Join once through the reverse index: pharmacy_id -> required SKUs
+        # it has in stock (in required order). Pharmacies absent here stock
+        # none of them and cannot match.
+        stocked_skus: Dict[str, List[str]] = {}
+        for sku in required_skus:
+            for pharmacy_id in self._pharmacies_stocking.get(sku, ()):
+                stocked_skus.setdefault(pharmacy_id, []).append(sku)
 
-            # Get inventory for this pharmacy
-            pharmacy_inventory = self.inventory[
-                self.inventory['pharmacy_id'] == pharmacy_id
-            ]
+        for pharmacy in pharmacies:
+            in_stock = stocked_skus.get(pharmacy['id'])
+            if not in_stock:
+                continue
 
-            # Check availability of each required medicine
+            pharmacy_inventory = self._inventory_by_pharmacy[pharmacy['id']]
             available_items = []
-            missing_items = []
-
-            for sku in required_skus:
-                item = pharmacy_inventory[pharmacy_inventory['sku'] == sku]
-
-                if not item.empty and item.iloc[0]['qty'] > 0:
-                    therapy_details = therapy_map.get(sku, {})
-                    available_items.append({
-                        'sku': sku,
-                        'drug_name': item.iloc[0]['drug_name'],
-                        'form': item.iloc[0]['form'],
-                        'strength': item.iloc[0]['strength'],
-                        'price': float(item.iloc[0]['price']),
-                        'qty_available': int(item.iloc[0]['qty']),
-                        'therapy_details': therapy_details
-                    })
-                else:
-                    missing_items.append(sku)
-
-            # Add pharmacy to matches if it has at least some items
-            if available_items:
-                pharmacy_copy = pharmacy.copy()
-                pharmacy_copy['available_items'] = available_items
-                pharmacy_copy['missing_items'] = missing_items
-                pharmacy_copy['stock_percentage'] = len(available_items) / len(required_skus) * 100
-                matches.append(pharmacy_copy)
+            for sku in in_stock:
+                item = pharmacy_inventory[sku]
+                available_items.append({
+                    'sku': sku,
+                    'drug_name': item['drug_name'],
+                    'form': item['form'],
+                    'strength': item['strength'],
+                    'price': item['price'],
+                    'qty_available': item['qty'],
+                    'therapy_details': therapy_map.get(sku, {})
+                })
+            in_stock_set = set(in_stock)
+            missing_items = [sku for sku in required_skus if sku not in in_stock_set]
+
+            matches.append({
+                **pharmacy,
+                'available_items': available_items,
+                'missing_items': missing_items,
+                'stock_percentage': len(available_items) / len(required_skus) * 100
+            })
+            # Pharmacies are distance-sorted, so the first full-stock one
+            # is what _select_best_pharmacy picks; the rest cannot win
+            if not missing_items:
+                break
 
         return matches
     
@@ -406,12 +775,12 @@ class PharmacyAgent:
         if not pharmacy_matches:
             raise ValueError("No pharmacy matches available")
 
-        pharmacy_matches.sort(
+        # Only the best match is needed: one O(n) pass, first one wins ties
+        best = min(
+            pharmacy_matches,
             key=lambda x: (-x['stock_percentage'], x['distance_km'])
         )
 
-        best = pharmacy_matches[0]
-
         self._log(
             "INFO",
             f"Selected {best['name']}: {best['stock_percentage']:.0f}% stock, "
@@ -425,9 +794,11 @@ class PharmacyAgent:
         pharmacy: Dict,
         patient_coords: Tuple[float, float],
         therapy_map: Dict[str, Dict],
-        location_context: Dict
+        location_context: Dict,
+        now: Optional[datetime] = None
     ) -> Dict:
         """Prepare final pharmacy response matching assignment contract."""
+        now = now or datetime.now()
         distance_km = pharmacy['distance_km']
         eta_minutes = self._calculate_eta(distance_km)
         delivery_fee = self._calculate_delivery_fee(distance_km)
@@ -450,7 +821,8 @@ class PharmacyAgent:
 
         reservation_id, reservation_expires = self._mock_reserve_items(
             pharmacy['id'],
-            sum(item["qty"] for item in reserved_items)
+            sum(item["qty"] for item in reserved_items),
+            now
         )
 
         # Match exact assignment output format
@@ -465,8 +837,8 @@ class PharmacyAgent:
             "city": location_context.get("city", ""),
             "pincode": location_context.get("pincode", ""),
             "services": pharmacy.get('services', []),
-            "estimated_delivery": (datetime.now() + timedelta(minutes=eta_minutes)).isoformat(),
-            "timestamp": datetime.now().isoformat(),
+            "estimated_delivery": (now + timedelta(minutes=eta_minutes)).isoformat(),
+            "timestamp": now.isoformat(),
             "reservation_id": reservation_id,
             "reservation_expires_at": reservation_expires.isoformat(),
             "status": "success"
@@ -509,7 +881,7 @@ class PharmacyAgent:
         elif "twice" in frequency or "every 12" in frequency:
             daily_doses = 2
         elif "every" in frequency:
-            matches = re.findall(r"every\s*(\d+)", frequency)
+            matches = _EVERY_HOURS_RE.findall(frequency)
             if matches:
                 hours = int(matches[0])
                 if hours > 0:
@@ -520,7 +892,7 @@ class PharmacyAgent:
             daily_doses = 4
 
         duration_days = 3
-        day_matches = re.findall(r"(\d+)", duration)
+        day_matches = _NUMBER_RE.findall(duration)
         if day_matches:
             duration_days = max(int(num) for num in day_matches)
         if duration_days <= 0:
@@ -529,22 +901,29 @@ class PharmacyAgent:
         quantity = daily_doses * duration_days
         return max(1, min(quantity, 14))
 
-    def _mock_reserve_items(self, pharmacy_id: str, total_units: int) -> Tuple[str, datetime]:
+    def _mock_reserve_items(
+        self,
+        pharmacy_id: str,
+        total_units: int,
+        now: Optional[datetime] = None
+    ) -> Tuple[str, datetime]:
         """Generate a mock reservation for the matched pharmacy."""
-        reservation_id = self._generate_reservation_id(pharmacy_id)
-        expires_at = datetime.now() + timedelta(hours=2)
-        self._log(
-            "INFO",
-            f"Reserved {total_units} unit(s) at {pharmacy_id} under reservation {reservation_id} until {expires_at.strftime('%H:%M')}"
-        )
+        now = now or datetime.now()
+        reservation_id = self._generate_reservation_id(pharmacy_id, now)
+        expires_at = now + timedelta(hours=2)
+        if self._log_enabled("INFO"):
+            self._log(
+                "INFO",
+                f"Reserved {total_units} unit(s) at {pharmacy_id} under reservation {reservation_id} until {expires_at.strftime('%H:%M')}"
+            )
         return reservation_id, expires_at
 
-    def _generate_reservation_id(self, pharmacy_id: str) -> str:
-        """Generate a reproducible mock reservation ID."""
-        import random
-
-        random.seed(f"{pharmacy_id}{datetime.now().strftime('%Y%m%d%H%M')}")
-        return f"RSV{random.randint(100000, 999999)}"
+    def _generate_reservation_id(self, pharmacy_id: str, now: Optional[datetime] = None) -> str:
+        """Generate a reproducible mock reservation ID (same pharmacy and minute, same ID)."""
+        now = now or datetime.now()
+        # Hash rather than reseeding the global random module: no shared state to race on
+        digest = hashlib.blake2b(f"{pharmacy_id}{now:%Y%m%d%H%M}".encode(), digest_size=8).digest()
+        return f"RSV{int.from_bytes(digest, 'big') % 900000 + 100000}"
 
     def _generate_delivery_note(self, pharmacy: Dict) -> str:
         """Craft a short delivery note based on pharmacy capabilities."""
@@ -566,90 +945,56 @@ class PharmacyAgent:
 
         return " ".join(parts)
     
-    def _no_medicines_response(self) -> Dict:
+    def _no_medicines_response(self, now: Optional[datetime] = None) -> Dict:
         """Response when no medicines to match."""
         return {
-            "pharmacy_id": "",
-            "pharmacy_name": "",
-            "distance_km": 0,
-            "eta_min": 0,
-            "delivery_fee": 0,
+            **_NO_MEDICINES_TEMPLATE,
             "items": [],
-            "total_price": 0,
-            "availability": "none",
-            "message": "No OTC medicines to match",
-            "status": "no_medicines",
-            "timestamp": datetime.now().isoformat()
+            "timestamp": (now or datetime.now()).isoformat()
         }
     
-    def _location_error_response(self, pincode: str) -> Dict:
+    def _location_error_response(self, pincode: str, now: Optional[datetime] = None) -> Dict:
         """Response when location is invalid."""
         return {
-            "pharmacy_id": "",
-            "pharmacy_name": "",
-            "distance_km": 0,
-            "eta_min": 0,
-            "delivery_fee": 0,
+            **_LOCATION_ERROR_TEMPLATE,
             "items": [],
-            "total_price": 0,
-            "availability": "location_error",
             "message": f"Invalid or unknown pincode: {pincode}",
-            "recommendation": "Please provide a valid 6-digit Indian pincode",
-            "status": "error",
-            "timestamp": datetime.now().isoformat()
+            "timestamp": (now or datetime.now()).isoformat()
         }
     
-    def _no_pharmacies_response(self) -> Dict:
+    def _no_pharmacies_response(self, now: Optional[datetime] = None) -> Dict:
         """Response when no pharmacies found nearby."""
         return {
-            "pharmacy_id": "",
-            "pharmacy_name": "",
-            "distance_km": 0,
-            "eta_min": 0,
-            "delivery_fee": 0,
+            **_NO_PHARMACIES_TEMPLATE,
             "items": [],
-            "total_price": 0,
-            "availability": "no_pharmacies",
             "message": f"No pharmacies found within {self.max_search_radius_km}km delivery range",
-            "recommendation": "Consider tele-consultation or visit nearby clinic directly",
-            "status": "no_match",
-            "timestamp": datetime.now().isoformat()
+            "timestamp": (now or datetime.now()).isoformat()
         }
     
-    def _out_of_stock_response(self, nearest_pharmacy: Dict) -> Dict:
+    def _out_of_stock_response(self, nearest_pharmacy: Dict, now: Optional[datetime] = None) -> Dict:
         """Response when medicines are out of stock."""
         return {
+            **_OUT_OF_STOCK_TEMPLATE,
             "pharmacy_id": nearest_pharmacy['id'],
             "pharmacy_name": nearest_pharmacy['name'],
             "distance_km": nearest_pharmacy['distance_km'],
-            "eta_min": 0,
-            "delivery_fee": 0,
             "items": [],
-            "total_price": 0,
-            "availability": "out_of_stock",
-            "message": "Required medicines currently out of stock at nearby pharmacies",
-            "recommendation": "Check with pharmacy directly or try alternative location",
-            "status": "no_stock",
-            "timestamp": datetime.now().isoformat()
+            "timestamp": (now or datetime.now()).isoformat()
         }
     
-    def _error_response(self, error_msg: str) -> Dict:
+    def _error_response(self, error_msg: str, now: Optional[datetime] = None) -> Dict:
         """Standard error response."""
         return {
-            "pharmacy_id": "",
-            "pharmacy_name": "",
-            "distance_km": 0,
-            "eta_min": 0,
-            "delivery_fee": 0,
+            **_ERROR_TEMPLATE,
             "items": [],
-            "total_price": 0,
-            "availability": "error",
             "error": error_msg,
-            "status": "error",
-            "timestamp": datetime.now().isoformat(),
-            "agent": "PharmacyAgent"
+            "timestamp": (now or datetime.now()).isoformat()
         }
     
+    def _log_enabled(self, level: str) -> bool:
+        """Whether ``level`` passes LOGGING_CONFIG["log_level"]; lets hot paths skip building a message."""
+        return _LOG_LEVEL_RANK.get(level, 20) >= self._min_log_rank
+    
     def _log(self, level: str, message: str) -> None:
         """Log events."""
         if self.log_callback:
@@ -12,11 +12,21 @@ Responsibilities:
 
 import os
 import csv
-import pandas as pd
-from typing import Dict, List, Optional, Tuple
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Dict, List, Mapping, NamedTuple, Optional, Tuple
 from datetime import datetime
 import random
 
+from agents.base_agent import run_in_agent_executor
+
+
+class _InteractionTable(NamedTuple):
+    """Parsed interactions.csv shared by all TherapyAgent instances."""
+    
+    row_count: int
+    by_pair: Mapping[Tuple[str, str], Tuple[Tuple[str, str], ...]]
+
 
 class TherapyAgent:
     """
@@ -39,9 +49,9 @@ class TherapyAgent:
         self.data_dir = data_dir
         self.log_callback = log_callback
         
-        # Load data
-        self.meds_df = self._load_medicines()
-        self.interactions_df = self._load_interactions()
+        # Load data (parsed tables are shared across instances per file version)
+        self._med_records = self._load_medicines()
+        self._interactions_by_pair = self._load_interactions()
         
         # Condition to indication mapping (OTC medicines only)
         self.condition_map = {
@@ -51,6 +61,8 @@ class TherapyAgent:
             "bronchitis": ["cough", "chest congestion", "expectorant"],
             "tb_suspect": ["cough", "fever"]  # Will be escalated to doctor anyway
         }
+        # Indication list -> matching medicine records (built on first use)
+        self._meds_by_indications: Dict[Tuple[str, ...], Tuple[Dict, ...]] = {}
         
         self._log("INFO", "Therapy Agent initialized successfully")
     
@@ -189,35 +201,91 @@ class TherapyAgent:
             self._log("ERROR", f"Therapy Agent failed: {str(e)}")
             return self._error_response(str(e))
     
-    def _load_medicines(self) -> pd.DataFrame:
+    async def process_async(self, imaging_output: Dict, patient_data: Dict) -> Dict:
+        """Async variant of process() that runs on the shared agent executor."""
+        return await run_in_agent_executor(self.process, imaging_output, patient_data)
+    
+    def _load_medicines(self) -> Tuple[Mapping, ...]:
         """Load medicines database from CSV."""
         meds_path = os.path.join(self.data_dir, "meds.csv")
         
         if not os.path.exists(meds_path):
             raise FileNotFoundError(f"Medicines database not found: {meds_path}")
         
-        df = pd.read_csv(meds_path)
+        records = self._read_medicines(os.path.realpath(meds_path), os.stat(meds_path).st_mtime_ns)
         
-        # Validate required columns
-        required_cols = ['sku', 'drug_name', 'indication', 'age_min', 'contra_allergy_keywords']
-        missing = set(required_cols) - set(df.columns)
-        if missing:
-            raise ValueError(f"Missing columns in meds.csv: {missing}")
+        self._log("INFO", f"Loaded {len(records)} medicines from database")
+        return records
+    
+    @staticmethod
+    @lru_cache(maxsize=4)
+    def _read_medicines(meds_path: str, mtime_ns: int) -> Tuple[Mapping, ...]:
+        """
+        Parse meds.csv into read-only medicine records, in file order.
         
-        self._log("INFO", f"Loaded {len(df)} medicines from database")
-        return df
+        Memoized on (path, mtime) and shared by every TherapyAgent. Lookup
+        fields are lowercased and split here rather than per request.
+        """
+        with open(meds_path, newline='', encoding='utf-8-sig') as f:
+            reader = csv.DictReader(f)
+            
+            # Validate required columns
+            required_cols = ['sku', 'drug_name', 'indication', 'age_min', 'contra_allergy_keywords']
+            missing = set(required_cols) - set(reader.fieldnames or ())
+            if missing:
+                raise ValueError(f"Missing columns in meds.csv: {missing}")
+            
+            return tuple(
+                MappingProxyType({
+                    "sku": row['sku'],
+                    "drug_name": row['drug_name'],
+                    "drug_name_lc": row['drug_name'].lower(),
+                    "indication": row['indication'],
+                    "indication_lc": row['indication'].lower(),
+                    "age_min": int(row['age_min']),
+                    "contra_keywords": tuple(k.strip() for k in row['contra_allergy_keywords'].lower().split(',')),
+                })
+                for row in reader
+            )
     
-    def _load_interactions(self) -> pd.DataFrame:
+    def _load_interactions(self) -> Mapping[Tuple[str, str], Tuple[Tuple[str, str], ...]]:
         """Load drug interactions database from CSV."""
         interactions_path = os.path.join(self.data_dir, "interactions.csv")
         
         if not os.path.exists(interactions_path):
             self._log("WARNING", "Interactions database not found - skipping interaction checks")
-            return pd.DataFrame(columns=['drug_a', 'drug_b', 'level', 'note'])
+            return MappingProxyType({})
+        
+        table = self._read_interactions(
+            os.path.realpath(interactions_path), os.stat(interactions_path).st_mtime_ns
+        )
+        self._log("INFO", f"Loaded {table.row_count} drug interactions")
+        return table.by_pair
+    
+    @staticmethod
+    @lru_cache(maxsize=4)
+    def _read_interactions(interactions_path: str, mtime_ns: int) -> _InteractionTable:
+        """
+        Parse interactions.csv into a (drug, drug) -> [(level, note), ...] lookup.
         
-        df = pd.read_csv(interactions_path)
-        self._log("INFO", f"Loaded {len(df)} drug interactions")
-        return df
+        Memoized on (path, mtime) and shared by every TherapyAgent. Pairs are
+        lowercased and keyed both ways round; entries keep file order.
+        """
+        with open(interactions_path, newline='', encoding='utf-8-sig') as f:
+            rows = list(csv.DictReader(f))
+        
+        by_pair: Dict[Tuple[str, str], List[Tuple[str, str]]] = {}
+        for row in rows:
+            pair = (row['drug_a'].lower(), row['drug_b'].lower())
+            entry = (row['level'], row['note'])
+            by_pair.setdefault(pair, []).append(entry)
+            if pair[1] != pair[0]:
+                by_pair.setdefault(pair[::-1], []).append(entry)
+        
+        return _InteractionTable(
+            row_count=len(rows),
+            by_pair=MappingProxyType({pair: tuple(entries) for pair, entries in by_pair.items()}),
+        )
     
     def _validate_inputs(self, imaging_output: Dict, patient_data: Dict) -> None:
         """Validate required inputs."""
@@ -241,8 +309,7 @@ class TherapyAgent:
         MUCH MORE LENIENT - allow OTC for mild/moderate cases.
         """
         # Only CRITICAL red flags require prescription (not all red flags)
-        critical_flags = [f for f in red_flags if "CRITICAL" in f or "EMERGENCY" in f]
-        if critical_flags:
+        if any("CRITICAL" in f or "EMERGENCY" in f for f in red_flags):
             return True
         
         # Only SEVERE cases need prescription (not moderate)
@@ -275,44 +342,47 @@ class TherapyAgent:
             self._log("INFO", f"No OTC treatment for {condition}")
             return []
         
+        # Medicines matching any indication, in catalog order (scanned once per list)
+        key = tuple(indications)
+        candidates = self._meds_by_indications.get(key)
+        if candidates is None:
+            candidates = self._meds_by_indications[key] = tuple(
+                med for med in self._med_records
+                if any(ind in med['indication_lc'] for ind in indications)
+            )
+        
         # Find matching medicines
+        allergies_lc = [allergy.lower() for allergy in allergies]
         suitable_meds = []
         
-        for _, med in self.meds_df.iterrows():
-            med_indication = str(med['indication']).lower()
+        for med in candidates:
+            # Check age restriction
+            if patient_age < med['age_min']:
+                continue
             
-            # Check if any indication matches
-            if any(ind in med_indication for ind in indications):
-                
-                # Check age restriction
-                if patient_age < med['age_min']:
-                    continue
-                
-                # Basic allergy check (detailed check later)
-                contra_keywords = str(med['contra_allergy_keywords']).lower().split(',')
-                contra_keywords = [k.strip() for k in contra_keywords]
-                
-                has_allergy = any(
-                    allergy.lower() in contra_keywords or 
-                    allergy.lower() in str(med['drug_name']).lower()
-                    for allergy in allergies
-                )
-                
-                if has_allergy:
-                    continue
-                
-                # Add to suitable list
-                suitable_meds.append({
-                    "sku": med['sku'],
-                    "drug_name": med['drug_name'],
-                    "indication": med['indication'],
-                    "age_min": int(med['age_min']),
-                    "contraindications": contra_keywords
-                })
+            # Basic allergy check (detailed check later)
+            has_allergy = any(
+                allergy in med['contra_keywords'] or allergy in med['drug_name_lc']
+                for allergy in allergies_lc
+            )
+            
+            if has_allergy:
+                continue
+            
+            # Add to suitable list
+            suitable_meds.append({
+                "sku": med['sku'],
+                "drug_name": med['drug_name'],
+                "indication": med['indication'],
+                "age_min": med['age_min'],
+                "contraindications": list(med['contra_keywords'])
+            })
+            if len(suitable_meds) == 5:  # Limit to top 5 options
+                break
         
         # Enhance with dosage info
         otc_options = []
-        for med in suitable_meds[:5]:  # Limit to top 5 options
+        for med in suitable_meds:
             option = self._format_medicine_option(med, severity)
             otc_options.append(option)
         
@@ -402,28 +472,22 @@ class TherapyAgent:
         """
         Check for drug-drug interactions between OTC and current medications.
         """
-        if not current_meds or self.interactions_df.empty:
+        if not current_meds or not self._interactions_by_pair:
             return []
         
         warnings = []
+        current_lc = [current_drug.lower() for current_drug in current_meds]
         
         for otc in otc_options:
             otc_drug = otc['drug_name']
+            otc_lc = otc_drug.lower()
             
-            for current_drug in current_meds:
-                # Check both directions (A-B and B-A)
-                interaction = self.interactions_df[
-                    ((self.interactions_df['drug_a'].str.lower() == otc_drug.lower()) & 
-                     (self.interactions_df['drug_b'].str.lower() == current_drug.lower())) |
-                    ((self.interactions_df['drug_a'].str.lower() == current_drug.lower()) & 
-                     (self.interactions_df['drug_b'].str.lower() == otc_drug.lower()))
-                ]
+            for current_drug, drug_lc in zip(current_meds, current_lc):
+                # Pairs are indexed both ways round (A-B and B-A)
+                interactions = self._interactions_by_pair.get((otc_lc, drug_lc))
                 
-                if not interaction.empty:
-                    for _, row in interaction.iterrows():
-                        level = row['level']
-                        note = row['note']
-                        
+                if interactions:
+                    for level, note in interactions:
                         # Format severity emoji
                         severity_emoji = {
                             'mild': '⚠️',
@@ -566,8 +630,7 @@ class TherapyAgent:
         MUCH MORE LENIENT - only escalate for true emergencies.
         """
         # Only CRITICAL/EMERGENCY red flags require escalation (not all red flags)
-        critical_flags = [f for f in red_flags if "CRITICAL" in f or "EMERGENCY" in f]
-        if critical_flags:
+        if any("CRITICAL" in f or "EMERGENCY" in f for f in red_flags):
             return True
         
         # Only SEVERE cases (not moderate)
@@ -575,8 +638,7 @@ class TherapyAgent:
             return True
         
         # High-risk interactions (keep this)
-        high_risk_interactions = [w for w in interaction_warnings if w['level'] in ['high', 'severe']]
-        if high_risk_interactions:
+        if any(w['level'] in ('high', 'severe') for w in interaction_warnings):
             return True
         
         # No OTC options AND not mild (allow mild cases even without OTC)
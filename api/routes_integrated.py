@@ -39,7 +39,9 @@ from agents.doctor_agent import DoctorAgent
 
 router = APIRouter(prefix="/api/v1", tags=["Healthcare"])
 
-# Initialize Coordinator
+# Initialize Coordinator (health checks). Pipeline runs each get their own
+# Coordinator, which is not coroutine-safe (current session, event log);
+# agents' file-backed tables are shared through module-level caches.
 coordinator = Coordinator(data_dir="./data", upload_dir="./uploads")
 
 # In-memory storage for demo (use database in production)
@@ -280,8 +282,9 @@ async def analyze_xray(
             "pincode": pincode_value or "380001"
         }
         
-        # Execute multi-agent pipeline
-        result = coordinator.execute_pipeline(upload_data)
+        # Execute multi-agent pipeline on a per-request coordinator
+        run_coordinator = Coordinator(data_dir="./data", upload_dir="./uploads")
+        result = await run_coordinator.aexecute_pipeline(upload_data)
         
         # Store analysis result
         analysis_id = str(uuid.uuid4())
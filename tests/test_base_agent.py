@@ -0,0 +1,239 @@
+"""
+Unit Tests for BaseAgent utilities
+Location: tests/test_base_agent.py
+
+Tests agent chain helpers and the async processing path.
+"""
+
+import asyncio
+import io
+import sys
+import time
+from pathlib import Path
+from typing import Dict
+
+import pytest
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from agents.base_agent import (
+    BaseAgent,
+    ExampleAgent,
+    create_agent_chain,
+    create_agent_chain_async,
+    create_agent_chain_batched,
+    create_agent_chain_streaming,
+)
+
+
+class EchoAgent(BaseAgent):
+    """Minimal agent that tags its input with its own name."""
+
+    def __init__(self, name: str):
+        super().__init__(name)
+
+    def process(self, input_data: Dict) -> Dict:
+        self._validate_input(input_data)
+        return self._create_output({"value": input_data["value"], "path": input_data.get("path", []) + [self.agent_name]})
+
+    def _validate_input(self, input_data: Dict) -> None:
+        self._validate_required_fields(input_data, ["value"])
+
+
+# ============= FIXTURES =============
+
+@pytest.fixture
+def agents():
+    """Three chained echo agents."""
+    return [EchoAgent("A"), EchoAgent("B"), EchoAgent("C")]
+
+
+# ============= TESTS =============
+
+def test_async_chain_matches_sync_chain(agents):
+    """Async chain without a graph runs stages in order like the sync chain."""
+    sync_result = create_agent_chain(agents)({"value": 1})
+    async_result = asyncio.run(create_agent_chain_async(agents)({"value": 1}))
+
+    assert async_result["status"] == sync_result["status"] == "chain_completed"
+    assert async_result["final_output"]["path"] == ["A", "B", "C"]
+
+
+def test_single_agent_chain_keeps_result_shape():
+    """Single-agent fast path returns the same envelope as longer chains."""
+    agent = EchoAgent("A")
+
+    ok = create_agent_chain([agent])({"value": 1})
+    assert ok["status"] == "chain_completed"
+    assert ok["all_results"] == [ok["final_output"]]
+
+    failed = create_agent_chain([agent])({"wrong": 1})
+    assert failed["status"] == "chain_failed"
+    assert failed["failed_at"] == "A"
+
+
+def test_streaming_chain_yields_each_step(agents):
+    """Streaming chain yields per-agent results and stops on error."""
+    steps = list(create_agent_chain_streaming(agents)({"value": 2}))
+    assert [step.agent_name for step in steps] == ["A", "B", "C"]
+    assert steps[-1].result["path"] == ["A", "B", "C"]
+
+    failed = list(create_agent_chain_streaming(agents)({"wrong": 2}))
+    assert len(failed) == 1
+    assert failed[0].result["status"] == "error"
+
+
+def test_async_chain_stops_on_error(agents):
+    """Async chain reports the failing agent and stops."""
+    result = asyncio.run(create_agent_chain_async(agents)({"wrong": 1}))
+
+    assert result["status"] == "chain_failed"
+    assert result["failed_at"] == "A"
+    assert len(result["results"]) == 1
+
+
+def test_async_chain_with_dependency_graph(agents):
+    """Independent agents run in the same level and fan in downstream."""
+    graph = {"A": [], "B": [], "C": ["A"]}
+    result = asyncio.run(create_agent_chain_async(agents, graph)({"value": 7}))
+
+    assert result["status"] == "chain_completed"
+    names = [r["agent"] for r in result["all_results"]]
+    assert set(names[:2]) == {"A", "B"}
+    assert result["final_output"]["path"] == ["A", "C"]
+
+
+def test_async_chain_rejects_cycles(agents):
+    """Cyclic dependency graphs are rejected up front."""
+    with pytest.raises(ValueError):
+        create_agent_chain_async(agents, {"A": ["C"], "C": ["A"]})
+
+
+def test_safe_process_memoizes_results():
+    """Repeated identical inputs are served from the cache."""
+    agent = EchoAgent("A")
+    calls = []
+    original = agent.process
+    agent.process = lambda data: calls.append(data) or original(data)
+
+    first = agent.safe_process({"value": 3})
+    second = agent.safe_process({"value": 3})
+
+    assert len(calls) == 1
+    assert second["path"] == first["path"]
+    assert second is not first
+
+    agent.clear_cache()
+    agent.safe_process({"value": 3})
+    assert len(calls) == 2
+
+
+def test_safe_process_skips_cache_for_non_json_payloads():
+    """Payloads that are not plain JSON are never keyed by their repr()."""
+    agent = EchoAgent("A")
+    calls = []
+    original = agent.process
+    agent.process = lambda data: calls.append(data) or original(data)
+
+    agent.safe_process({"value": 3, "upload": io.BytesIO(b"first")})
+    agent.safe_process({"value": 3, "upload": io.BytesIO(b"second")})
+
+    assert agent._cache_key({"value": 3, "upload": io.BytesIO(b"x")}) is None
+    assert len(calls) == 2
+    assert not agent._cache
+
+
+def test_safe_process_does_not_cache_errors():
+    """Failed runs are retried rather than replayed."""
+    agent = EchoAgent("A")
+
+    assert agent.safe_process({"wrong": 1})["status"] == "error"
+    assert not agent._cache
+
+
+def test_overlapping_async_calls_time_themselves():
+    """Concurrent calls on one agent each report their own processing time."""
+    class SleepyAgent(EchoAgent):
+        def process(self, input_data: Dict) -> Dict:
+            time.sleep(input_data["delay"])
+            return super().process(input_data)
+
+    agent = SleepyAgent("A")
+
+    async def run():
+        slow = asyncio.create_task(agent.safe_process_async({"value": 1, "delay": 0.3}))
+        await asyncio.sleep(0.15)
+        fast = await agent.safe_process_async({"value": 2, "delay": 0})
+        return await slow, fast
+
+    slow, fast = asyncio.run(run())
+
+    assert slow["processing_time_seconds"] >= 0.25
+    assert fast["processing_time_seconds"] < 0.1
+
+
+def test_safe_process_batch_isolates_failures():
+    """One invalid record yields an error entry without failing the batch."""
+    agent = EchoAgent("A")
+    results = agent.safe_process_batch([{"value": 1}, {"wrong": 2}, {"value": 3}])
+
+    assert [r["status"] for r in results] == ["success", "error", "success"]
+
+
+def test_batched_chain_preserves_order(agents):
+    """Pipelined batches return one chain result per input, in order."""
+    inputs = [{"value": i} for i in range(5)] + [{"wrong": 0}]
+    results = asyncio.run(create_agent_chain_batched(agents, batch_size=2)(inputs))
+
+    assert len(results) == 6
+    for i, result in enumerate(results[:5]):
+        assert result["status"] == "chain_completed"
+        assert result["final_output"]["value"] == i
+        assert len(result["all_results"]) == 3
+    assert results[5]["status"] == "chain_failed"
+    assert results[5]["failed_at"] == "A"
+
+
+def test_subclass_must_implement_process():
+    """Missing abstract methods are rejected when the class is defined."""
+    with pytest.raises(TypeError):
+        class IncompleteAgent(BaseAgent):
+            def _validate_input(self, input_data: Dict) -> None:
+                pass
+
+    class AbstractAgent(BaseAgent, abstract=True):
+        pass
+
+    assert issubclass(AbstractAgent, BaseAgent)
+
+
+def test_set_executor_is_used_by_async_path():
+    """Per-class executors route process_async work to that pool."""
+    from concurrent.futures import ThreadPoolExecutor
+
+    class PooledAgent(EchoAgent):
+        pass
+
+    pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="pooled")
+    PooledAgent.set_executor(pool)
+    try:
+        agent = PooledAgent("P")
+        result = asyncio.run(agent.process_async({"value": 1}))
+        assert result["value"] == 1
+        assert PooledAgent._executor is pool
+        assert EchoAgent._executor is not pool
+    finally:
+        pool.shutdown()
+
+
+def test_safe_process_prechecks_required_fields():
+    """REQUIRED_FIELDS are checked before process() is entered."""
+    agent = ExampleAgent()
+    agent.process = lambda data: pytest.fail("process() should not run")
+
+    result = agent.safe_process({"wrong_field": 1})
+
+    assert result["status"] == "error"
+    assert result["error_type"] == "ValueError"
+    assert "required_field" in result["error"]
@@ -5,6 +5,7 @@ Location: tests/test_coordinator.py
 Tests agent hand-offs, pipeline execution, and error handling.
 """
 
+import io
 import pytest
 import sys
 import os
@@ -14,6 +15,7 @@ from datetime import datetime
 # Add project root to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+from agents import coordinator as coordinator_module
 from agents.coordinator import Coordinator
 from agents.ingestion_agent import IngestionAgent
 from agents.imaging_agent import ImagingAgent
@@ -422,6 +424,227 @@ def test_coordinator_pipeline_integration(coordinator):
     coordinator.clear_event_log()
 
 
+def test_async_pipeline_matches_sync_entrypoint(data_dir, upload_dir):
+    """
+    Test the async pipeline entry point end to end.
+    
+    Validates:
+    - aexecute_pipeline completes on a bundled X-ray
+    - execute_pipeline (sync wrapper) returns the same outcome
+    """
+    import asyncio
+    
+    upload_data = {
+        "xray_file": str(Path(data_dir) / "xray3.png"),
+        "patient_info": {"age": 45, "gender": "M", "allergies": []},
+        "symptoms": "fever and productive cough, phlegm",
+        "spo2": 93,
+        "pincode": "400001",
+    }
+    
+    async_result = asyncio.run(
+        Coordinator(data_dir=data_dir, upload_dir=upload_dir).aexecute_pipeline(dict(upload_data))
+    )
+    sync_result = Coordinator(data_dir=data_dir, upload_dir=upload_dir).execute_pipeline(dict(upload_data))
+    
+    assert async_result["status"] == sync_result["status"] == "SUCCESS"
+    assert async_result["assessment"] == sync_result["assessment"]
+    assert async_result["pharmacy"]["pharmacy_id"] == sync_result["pharmacy"]["pharmacy_id"]
+
+
+def test_async_pipeline_builds_agents_off_the_event_loop(data_dir, upload_dir, monkeypatch):
+    """Test cold agents are constructed on the agent executor, not the loop thread."""
+    import asyncio
+    import threading
+    
+    built_on = {}
+    original_build = Coordinator._build_agent
+    
+    def recording_build(self, name):
+        built_on[name] = threading.current_thread()
+        return original_build(self, name)
+    
+    monkeypatch.setattr(Coordinator, "_build_agent", recording_build)
+    
+    result = asyncio.run(Coordinator(data_dir=data_dir, upload_dir=upload_dir).aexecute_pipeline({
+        "xray_file": str(Path(data_dir) / "xray3.png"),
+        "patient_info": {"age": 45, "gender": "M", "allergies": []},
+        "symptoms": "fever and productive cough, phlegm",
+        "spo2": 93,
+        "pincode": "400001",
+    }))
+    
+    assert result["status"] == "SUCCESS"
+    for name in ("ingestion_agent", "imaging_agent", "therapy_agent"):
+        assert built_on[name] is not threading.main_thread()
+
+
+def test_escalation_gathers_pharmacy_fallback(data_dir, upload_dir, monkeypatch):
+    """Escalated cases with OTC options also carry a concurrent pharmacy match."""
+    coordinator = Coordinator(data_dir=data_dir, upload_dir=upload_dir)
+    monkeypatch.setattr(Coordinator, "_should_escalate_to_doctor", lambda *args: True)
+    
+    result = coordinator.execute_pipeline({
+        "xray_file": str(Path(data_dir) / "xray3.png"),
+        "patient_info": {"age": 45, "gender": "M", "allergies": []},
+        "symptoms": "fever, breathless",
+        "spo2": 95,
+        "pincode": "400001",
+    })
+    
+    assert result["status"] == "ESCALATED"
+    assert result["doctor_recommendations"]["status"] == "success"
+    assert result["pharmacy_fallback"]["status"] == "success"
+
+
+def test_escalation_doctor_call_overlaps_prefetch_wait(data_dir, upload_dir, monkeypatch):
+    """Test the doctor lookup starts before the pharmacy prefetch is awaited."""
+    import asyncio
+    
+    coordinator = Coordinator(data_dir=data_dir, upload_dir=upload_dir)
+    monkeypatch.setattr(Coordinator, "_should_escalate_to_doctor", lambda *args: True)
+    pharmacy_agent, doctor_agent = coordinator.pharmacy_agent, coordinator.doctor_agent
+    prefetch, consult = pharmacy_agent.prefetch_pharmacies_async, doctor_agent.process_async
+    doctor_started = None
+    overlapped = []
+    
+    async def slow_prefetch(location):
+        # Releases as soon as the doctor call starts; times out if it waits for us
+        try:
+            await asyncio.wait_for(doctor_started.wait(), timeout=1)
+            overlapped.append(True)
+        except asyncio.TimeoutError:
+            overlapped.append(False)
+        return await prefetch(location)
+    
+    async def recording_consult(payload):
+        doctor_started.set()
+        return await consult(payload)
+    
+    async def run():
+        nonlocal doctor_started
+        doctor_started = asyncio.Event()
+        return await coordinator.aexecute_pipeline({
+            "xray_file": str(Path(data_dir) / "xray3.png"),
+            "patient_info": {"age": 45, "gender": "M", "allergies": []},
+            "symptoms": "fever, breathless",
+            "spo2": 95,
+            "pincode": "400001",
+        })
+    
+    monkeypatch.setattr(pharmacy_agent, "prefetch_pharmacies_async", slow_prefetch)
+    monkeypatch.setattr(doctor_agent, "process_async", recording_consult)
+    
+    result = asyncio.run(run())
+    
+    assert result["status"] == "ESCALATED"
+    assert overlapped == [True]
+
+
+def test_pharmacy_prefetch_only_uses_a_built_agent(data_dir, upload_dir, monkeypatch):
+    """Test the speculative prefetch never constructs a cold Pharmacy Agent."""
+    upload = {
+        "xray_file": str(Path(data_dir) / "xray3.png"),
+        "patient_info": {"age": 45, "gender": "M", "allergies": []},
+        "symptoms": "fever",
+        "spo2": 95,
+        "pincode": "400001",
+    }
+    
+    async def imaging_fails(_ingestion_result):
+        return {"error": "imaging unavailable"}
+    
+    cold = Coordinator(data_dir=data_dir, upload_dir=upload_dir)
+    monkeypatch.setattr(cold.imaging_agent, "process_async", imaging_fails)
+    assert cold.execute_pipeline(upload)["status"] == "FAILED"
+    assert cold._pharmacy_agent is None
+    
+    prefetched = []
+    warm = Coordinator(data_dir=data_dir, upload_dir=upload_dir)
+    fetch = warm.pharmacy_agent.prefetch_pharmacies_async
+    
+    async def recording_fetch(location):
+        prefetched.append(location)
+        return await fetch(location)
+    
+    monkeypatch.setattr(warm.pharmacy_agent, "prefetch_pharmacies_async", recording_fetch)
+    warm.execute_pipeline(upload)
+    assert prefetched
+
+
+def test_event_log_builds_dicts_on_read(coordinator):
+    """Test event log records are materialised as timestamped dicts."""
+    coordinator.clear_event_log()
+    coordinator._log_event("Test", "WARNING", "Test message", {"key": "value"})
+    
+    events = coordinator.get_event_log()
+    assert len(events) == 1
+    assert events[0]["agent"] == "Test"
+    assert events[0]["level"] == "WARNING"
+    assert events[0]["metadata"] == {"key": "value"}
+    datetime.fromisoformat(events[0]["timestamp"])
+    
+    assert coordinator.event_log.maxlen is not None, "Event log should be bounded"
+
+
+def test_console_echo_writes_to_current_stdout(coordinator, monkeypatch):
+    """Test the console listener is running and follows a replaced sys.stdout."""
+    assert coordinator_module._event_listener is not None
+    
+    buffer = io.StringIO()
+    monkeypatch.setattr(sys, "stdout", buffer)
+    assert coordinator_module._console_handler.stream is buffer
+
+
+def test_export_session_sync_and_async(coordinator, tmp_path):
+    """Test sync and async session exports write the same JSON payload."""
+    import asyncio
+    import json
+    
+    sync_path = tmp_path / "sync.json"
+    async_path = tmp_path / "async.json"
+    
+    coordinator.export_session(str(sync_path))
+    asyncio.run(coordinator.aexport_session(str(async_path)))
+    
+    sync_data = json.loads(sync_path.read_text())
+    async_data = json.loads(async_path.read_text())
+    
+    assert sync_data["session_id"] == async_data["session_id"]
+    assert sync_data["event_log"][0] == async_data["event_log"][0]
+    assert "exported_at" in async_data
+
+
+def test_session_and_order_ids_are_unique(coordinator):
+    """Test back-to-back sessions and orders never reuse an ID."""
+    session_ids = {coordinator._create_session() for _ in range(50)}
+    assert len(session_ids) == 50
+    assert all(sid.startswith("SES") and len(sid) == 21 for sid in session_ids)
+    
+    order_ids = {
+        coordinator._generate_order_summary({}, {})["order_id"] for _ in range(50)
+    }
+    assert len(order_ids) == 50
+    assert all(oid.startswith("ORD") and len(oid) == 11 for oid in order_ids)
+
+
+def test_concurrent_cold_agent_access_builds_agent_once(coordinator):
+    """Test sessions racing on a cold agent share one construction."""
+    import asyncio
+    
+    async def resolve_twice():
+        return await asyncio.gather(
+            coordinator._aget_agent("pharmacy_agent"),
+            coordinator._aget_agent("pharmacy_agent")
+        )
+    
+    first, second = asyncio.run(resolve_twice())
+    
+    assert first is second
+    builds = [record for record in coordinator.event_log if record[3].startswith("Pharmacy Agent initialized")]
+    assert len(builds) == 1
+
+
 # ============= TEST 6: ERROR HANDLING =============
 
 def test_error_handling():
@@ -0,0 +1,148 @@
+import heapq
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+from agents.doctor_agent import DoctorAgent, _score_kernel
+
+
+DATA_DIR = "./data"
+
+
+@pytest.fixture()
+def doctor_agent():
+    return DoctorAgent(data_dir=DATA_DIR, log_callback=lambda *_args: None)
+
+
+def _escalation(condition="pneumonia", severity="moderate", red_flags=None):
+    return {
+        "imaging_result": {
+            "condition_probs": {condition: 0.7, "normal": 0.3},
+            "severity_hint": severity,
+            "red_flags": red_flags or [],
+        },
+        "patient": {"age": 50},
+    }
+
+
+def test_specialty_index_only_holds_tele_doctors(doctor_agent):
+    tele_ids = set(
+        doctor_agent.doctors_df.loc[doctor_agent.doctors_df["tele_available"] == True, "doctor_id"]
+    )
+    indexed = {
+        record["doctor_id"]: specialty
+        for specialty, records in doctor_agent.specialty_index.items()
+        for record in records
+    }
+
+    assert set(indexed) == tele_ids
+    assert all(
+        doctor_agent.doctors_df.set_index("doctor_id").loc[doc_id, "specialty"] == specialty
+        for doc_id, specialty in indexed.items()
+    )
+
+
+def test_process_matches_required_specialties(doctor_agent):
+    result = doctor_agent.process(_escalation("tb_suspect"))
+
+    assert result["status"] == "success"
+    assert result["available_doctors"]
+    required = set(doctor_agent.condition_specialty_map["tb_suspect"])
+    assert all(doc["specialty"] in required for doc in result["available_doctors"])
+    assert result["total_matches"] == sum(
+        len(doctor_agent.specialty_index.get(spec, [])) for spec in required
+    )
+
+
+def test_slot_schedule_is_sorted_and_filtered_by_bisect(doctor_agent, monkeypatch):
+    times, labels = doctor_agent._parse_slot_schedule(
+        "2030-01-02T09:00:00, 2020-01-01T10:00:00,2030-01-01T10:00:00Z"
+    )
+
+    assert labels == ["2020-01-01T10:00:00", "2030-01-01T10:00:00Z", "2030-01-02T09:00:00"]
+    assert times == sorted(times)
+    assert doctor_agent._parse_slot_schedule("not-a-date") == ([], [])
+
+    monkeypatch.setattr(doctor_agent, "_slot_schedules", [(times, labels)])
+    assert doctor_agent._future_slots(0, times[1]) == ["2030-01-02T09:00:00"]
+
+
+def test_critical_flags_counted_once_for_urgency_and_note(doctor_agent):
+    flags = ["⚠️ low SpO2", "🚨 critical: call now", "Emergency referral"]
+
+    assert doctor_agent._count_critical_flags(flags) == 2
+    result = doctor_agent.process(_escalation(red_flags=flags))
+    assert result["urgency_level"] == "critical"
+    assert "Red flags: 2 critical warnings" in result["emergency_note"]
+
+
+def test_affinity_matrix_matches_condition_specialty_map(doctor_agent):
+    for condition, required in doctor_agent.condition_specialty_map.items():
+        row = doctor_agent._affinity[doctor_agent._condition_to_id[condition]]
+        for specialty, spec_id in doctor_agent._spec_to_id.items():
+            expected = 40 if specialty == required[0] else 30 if specialty in required else 20
+            assert row[spec_id] == expected
+        assert row[-1] == 20
+
+
+def test_process_result_is_cached_until_first_slot_passes(doctor_agent):
+    first = doctor_agent.process(_escalation("pneumonia"))
+    first["available_doctors"].clear()
+    second = doctor_agent.process(_escalation("pneumonia"))
+
+    assert second["available_doctors"]
+    assert len(doctor_agent._result_cache) == 1
+
+    (valid_until, _), = doctor_agent._result_cache.values()
+    key = next(iter(doctor_agent._result_cache))
+    assert doctor_agent._result_cache_get(key, valid_until) is None
+    assert not doctor_agent._result_cache
+
+
+def test_cached_result_without_future_slots_expires_after_ttl(doctor_agent, monkeypatch):
+    monkeypatch.setattr(doctor_agent, "_future_slots", lambda row, now: [])
+    before = datetime.now()
+    result = doctor_agent.process(_escalation("pneumonia"))
+
+    assert all(not doctor["available_slots"] for doctor in result["available_doctors"])
+
+    (valid_until, _), = doctor_agent._result_cache.values()
+    key = next(iter(doctor_agent._result_cache))
+    assert before < valid_until <= datetime.now() + DoctorAgent._cache_ttl
+    assert doctor_agent._result_cache_get(key, valid_until - timedelta(seconds=1)) is not None
+    assert doctor_agent._result_cache_get(key, valid_until) is None
+
+
+def test_top_positions_matches_stable_nlargest():
+    scores = np.array([70, 85, 85, 60, 85, 90, 70, 85])
+    expected = heapq.nlargest(5, range(scores.size), key=scores.__getitem__)
+
+    assert DoctorAgent._top_positions(scores, 5).tolist() == expected
+    assert DoctorAgent._top_positions(scores[:3], 5).tolist() == [1, 2, 0]
+
+
+def test_score_kernel_matches_numpy_scoring(doctor_agent, monkeypatch):
+    rows = np.arange(len(doctor_agent._doctor_records))
+    jitter = np.arange(rows.size) % 11
+
+    class _FixedJitter:
+        def integers(self, low, high, size):
+            return jitter[:size]
+
+    monkeypatch.setattr(doctor_agent, "_rng", _FixedJitter())
+
+    for condition_id in doctor_agent._condition_to_id.values():
+        for urgency in ("critical", "low"):
+            expected = doctor_agent._calculate_match_scores(rows, urgency, condition_id)
+            out = np.empty(rows.size, dtype=np.int64)
+            _score_kernel(
+                doctor_agent._doctor_spec_ids[rows],
+                doctor_agent._experience[rows],
+                doctor_agent._tele[rows],
+                doctor_agent._affinity[condition_id],
+                urgency == "critical",
+                jitter,
+                out,
+            )
+            assert out.tolist() == expected.tolist()
@@ -0,0 +1,108 @@
+"""
+Unit Tests for the Imaging Agent
+Location: tests/test_imaging.py
+
+Tests X-ray feature extraction, note keyword matching and result caching.
+"""
+
+import shutil
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+from PIL import Image
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from agents.imaging_agent import ImagingAgent, _NOTE_KEYWORDS, _match_note_keywords, _top_two
+
+
+@pytest.fixture
+def data_dir():
+    """Return path to test data directory."""
+    return "./data"
+
+
+def test_imaging_cache_is_content_addressed(data_dir, tmp_path):
+    """Test identical X-ray bytes at a new path reuse the cached imaging result."""
+    messages = []
+    agent = ImagingAgent(log_callback=lambda _name, _level, msg, _metadata=None: messages.append(msg))
+    
+    first_path = tmp_path / "first.png"
+    retry_path = tmp_path / "retry.png"
+    shutil.copy(f"{data_dir}/xray3.png", first_path)
+    shutil.copy(f"{data_dir}/xray3.png", retry_path)
+    
+    payload = {"patient": {"age": 45}, "notes": "fever", "spo2": 95}
+    first = agent.process({**payload, "xray_path": str(first_path)})
+    retry = agent.process({**payload, "xray_path": str(retry_path)})
+    
+    assert "ImagingAgent cache hit" in messages
+    assert retry["condition_probs"] == first["condition_probs"]
+    
+    # Different clinical inputs must not share the cached result
+    messages.clear()
+    agent.process({**payload, "spo2": 86, "xray_path": str(retry_path)})
+    assert "ImagingAgent cache hit" not in messages
+
+
+def test_imaging_features_from_histogram_match_pixel_statistics(tmp_path):
+    """Test single-pass histogram features equal direct pixel statistics."""
+    # Smaller than the feature thumbnail, so every pixel is counted as-is
+    pixels = np.random.default_rng(7).integers(0, 256, size=(48, 64)).astype(np.uint8)
+    path = tmp_path / "synthetic.png"
+    Image.fromarray(pixels, mode="L").save(path)
+    pixels = pixels.astype(np.float64)
+    
+    features = ImagingAgent()._extract_image_features(path)
+    
+    assert features["mean"] == pytest.approx(pixels.mean())
+    assert features["std"] == pytest.approx(pixels.std())
+    assert features["contrast"] == pixels.max() - pixels.min()
+    assert features["dark_ratio"] == pytest.approx((pixels < 90).mean())
+    assert features["bright_ratio"] == pytest.approx((pixels > 200).mean())
+
+
+def test_imaging_features_use_bounded_thumbnail(data_dir):
+    """Test large X-rays are reduced before features are extracted."""
+    histogram = ImagingAgent._grayscale_histogram(Path(data_dir) / "xray1.jpeg")
+    
+    assert histogram.sum() <= 512 * 512
+
+
+def test_imaging_note_keywords_match_substring_checks():
+    """Test the single-pass keyword scan finds overlapping keywords like substring checks."""
+    notes = "worsening severe headache, severe pain and shortness of breath; breathless"
+    expected = {keyword for keyword in _NOTE_KEYWORDS if keyword in notes}
+    
+    assert _match_note_keywords(notes) == expected
+    assert {"severe", "severe headache", "severe pain", "breathless"} <= expected
+
+
+def test_imaging_top_two_matches_max_and_sorted():
+    """Test the single-scan top-two helper agrees with max() and sorted() on ties."""
+    probs = {"normal": 0.2, "pneumonia": 0.3, "covid_suspect": 0.3, "tb_suspect": 0.1, "pleural_effusion": 0.1}
+    ordered = sorted(probs.values(), reverse=True)
+    
+    assert _top_two(probs) == (max(probs, key=probs.get), ordered[0], ordered[1])
+    assert _top_two({"normal": 0.9, "pneumonia": 0.1}) == ("normal", 0.9, 0.1)
+
+
+def test_imaging_safe_process_reads_xray_once(data_dir, tmp_path, monkeypatch):
+    """Test safe_process() leaves caching to process(), so each call reads the X-ray once."""
+    xray_path = tmp_path / "scan.png"
+    shutil.copy(f"{data_dir}/xray3.png", xray_path)
+    reads = []
+    read_bytes = Path.read_bytes
+    monkeypatch.setattr(Path, "read_bytes", lambda self: reads.append(self) or read_bytes(self))
+    agent = ImagingAgent(log_callback=lambda *_args: None)
+    payload = {"patient": {"age": 45}, "notes": "fever", "spo2": 95, "xray_path": str(xray_path)}
+    
+    first = agent.safe_process(payload)
+    assert len(reads) == 1
+    assert len(agent._cache) == 1
+    
+    assert agent.safe_process(payload)["condition_probs"] == first["condition_probs"]
+    assert len(reads) == 2
@@ -1,27 +1,131 @@
+"""
+Unit Tests for the Ingestion Agent
+Location: tests/test_ingestion.py
+
+Tests PII masking, PDF text extraction and upload persistence.
+Run directly for a manual smoke test against ./uploads.
+"""
+
+import io
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import agents.ingestion_agent as ingestion_module
 from agents.ingestion_agent import IngestionAgent
 
-# Initialize
-agent = IngestionAgent(upload_dir="./uploads")
-
-# Test with mock data
-upload_data = {
-    "xray_file": "./test_xray.png",  # Your test image
-    "patient_info": {
-        "age": 45,
-        "gender": "M",
-        "allergies": ["penicillin"]
-    },
-    "symptoms": "cough, fever",
-    "spo2": 94
-}
-
-# Process
-result = agent.process(upload_data)
-
-# Check output
-if result["status"] == "success":
-    print(f"✅ X-ray saved: {result['xray_path']}")
-    print(f"✅ Patient: {result['patient']['age']}y")
-    print(f"✅ Notes: {result['notes']}")
-else:
-    print(f"❌ Error: {result['error']}")
\ No newline at end of file
+
+@pytest.fixture
+def upload_dir(tmp_path):
+    """Create temporary upload directory for testing."""
+    upload_path = tmp_path / "uploads"
+    upload_path.mkdir()
+    return str(upload_path)
+
+
+def test_ingestion_masks_pii_with_precompiled_patterns(upload_dir):
+    """Test PII masking still applies every pattern and skips clean text."""
+    agent = IngestionAgent(upload_dir=upload_dir)
+    
+    clean = "Chief complaint: dry cough for 3 days"
+    assert agent._mask_pii(clean) == clean
+    
+    masked = agent._mask_pii("Call 9876543210 or mail a.b@example.com, PAN ABCDE1234F")
+    assert masked == "Call ********** or mail ***@***.***, PAN *****####*"
+
+
+def test_ingestion_stops_reading_pdf_pages_once_details_found(upload_dir, tmp_path, monkeypatch):
+    """Test PDF pages are extracted lazily and skipped once complaint and age are known."""
+    extracted = []
+    
+    class _Page:
+        def __init__(self, text):
+            self.text = text
+        
+        def extract_text(self):
+            extracted.append(self.text)
+            return self.text
+    
+    class _Pdf:
+        pages = [_Page("Age: 61"), _Page("Chief complaint: chest tightness"), _Page("Appendix")]
+        
+        def __enter__(self):
+            return self
+        
+        def __exit__(self, *exc):
+            return False
+    
+    monkeypatch.setattr(ingestion_module, "pdfplumber", type("pdfplumber", (), {"open": staticmethod(lambda _path: _Pdf())}))
+    agent = IngestionAgent(upload_dir=upload_dir)
+    
+    text = agent._extract_document_text(tmp_path / "report.pdf")
+    
+    assert text == "Age: 61\nChief complaint: chest tightness"
+    assert extracted == ["Age: 61", "Chief complaint: chest tightness"]
+
+
+def test_ingestion_uploads_in_same_second_get_distinct_names(upload_dir):
+    """Test persisted uploads never overwrite each other within one second."""
+    agent = IngestionAgent(upload_dir=upload_dir)
+    
+    first = agent._persist_file(io.BytesIO(b"first report"), "doc")
+    second = agent._persist_file(io.BytesIO(b"second report"), "doc")
+    
+    assert first != second
+    assert first.read_bytes() == b"first report"
+    assert second.read_bytes() == b"second report"
+
+
+def test_ingestion_stream_upload_removes_partial_file_on_error(upload_dir):
+    """Test a failed copy leaves no truncated upload and never overwrites an existing file."""
+    agent = IngestionAgent(upload_dir=upload_dir)
+    
+    class _FailingUpload(io.BytesIO):
+        def read(self, size=-1):
+            if self.tell():
+                raise OSError("connection reset")
+            return super().read(4)
+    
+    destination = Path(upload_dir) / "partial.png"
+    with pytest.raises(OSError):
+        agent._stream_upload(_FailingUpload(b"0123456789"), destination)
+    assert not destination.exists()
+    
+    destination.write_bytes(b"other worker")
+    with pytest.raises(FileExistsError):
+        agent._stream_upload(io.BytesIO(b"mine"), destination)
+    assert destination.read_bytes() == b"other worker"
+
+
+# ============= MANUAL SMOKE TEST =============
+
+if __name__ == "__main__":
+    # Initialize
+    agent = IngestionAgent(upload_dir="./uploads")
+
+    # Test with mock data
+    upload_data = {
+        "xray_file": "./test_xray.png",  # Your test image
+        "patient_info": {
+            "age": 45,
+            "gender": "M",
+            "allergies": ["penicillin"]
+        },
+        "symptoms": "cough, fever",
+        "spo2": 94
+    }
+
+    # Process
+    result = agent.process(upload_data)
+
+    # Check output
+    if result["status"] == "success":
+        print(f"✅ X-ray saved: {result['xray_path']}")
+        print(f"✅ Patient: {result['patient']['age']}y")
+        print(f"✅ Notes: {result['notes']}")
+    else:
+        print(f"❌ Error: {result['error']}")
@@ -1,9 +1,13 @@
 import math
-from datetime import datetime
+from datetime import datetime, timedelta
+from pathlib import Path
 
+import numpy as np
+import pandas as pd
 import pytest
 
-from agents.pharmacy_agent import PharmacyAgent
+from agents.pharmacy_agent import PharmacyAgent, _haversine_kernel
+from config import DEFAULT_LOCATION
 
 
 DATA_DIR = "./data"
@@ -83,3 +87,177 @@ def test_pharmacy_process_returns_reservation_details(pharmacy_agent):
     # Ensure reservation expiry is ISO formatted
     datetime.fromisoformat(result["reservation_expires_at"])
     datetime.fromisoformat(result["estimated_delivery"])
+
+
+def test_pharmacy_process_uses_prefetched_candidates(pharmacy_agent, monkeypatch):
+    therapy_result = {"otc_options": [{"sku": "OTC001", "drug_name": "Paracetamol"}]}
+    location = {"zip_code": "400011", "city": "Mumbai"}
+
+    prefetched = pharmacy_agent.prefetch_pharmacies(location)
+    assert prefetched["error_response"] is None
+    assert prefetched["nearby_pharmacies"]
+
+    # Prefetched candidates must be used as-is, without a second location scan
+    def _unexpected_scan(*_args, **_kwargs):
+        raise AssertionError("nearby pharmacies were re-scanned")
+
+    expected = pharmacy_agent.process(therapy_result, location)
+    monkeypatch.setattr(pharmacy_agent, "_find_nearby_pharmacies", _unexpected_scan)
+    result = pharmacy_agent.process(therapy_result, location, prefetched=prefetched)
+
+    assert result["pharmacy_id"] == expected["pharmacy_id"]
+    assert result["items"] == expected["items"]
+
+
+def test_vectorized_distances_match_scalar_haversine(pharmacy_agent):
+    patient = (19.07, 72.88)
+    distances = pharmacy_agent._haversine_distances(*patient)
+
+    assert len(distances) == len(pharmacy_agent.pharmacies)
+    for pharmacy, distance in zip(pharmacy_agent.pharmacies, distances):
+        expected = pharmacy_agent._haversine_distance(*patient, pharmacy["lat"], pharmacy["lon"])
+        assert math.isclose(distance, expected, rel_tol=1e-12, abs_tol=1e-9)
+
+    nearby = pharmacy_agent._find_nearby_pharmacies(patient, 10)
+    assert [p["distance_km"] for p in nearby] == sorted(p["distance_km"] for p in nearby)
+    assert all(p["distance_km"] <= min(10, p["delivery_km"]) for p in nearby)
+
+
+def test_latitude_band_keeps_every_pharmacy_in_range(pharmacy_agent):
+    distances = pharmacy_agent._haversine_distances(19.07, 72.88)
+    delivery_km = np.array([pharmacy["delivery_km"] for pharmacy in pharmacy_agent.pharmacies])
+
+    for radius in (0.5, 5, 15, 25, 100):
+        rows = pharmacy_agent._rows_in_latitude_band(19.07, radius)
+        assert rows.tolist() == sorted(rows.tolist())
+        in_range = distances <= np.minimum(radius, delivery_km)
+        assert set(np.flatnonzero(in_range).tolist()) <= set(rows.tolist())
+
+
+def test_inventory_index_matches_inventory_rows(pharmacy_agent):
+    inventory = pd.read_csv(f"{DATA_DIR}/inventory.csv")
+    index = pharmacy_agent._inventory_by_pharmacy
+
+    assert sum(len(skus) for skus in index.values()) == len(inventory)
+    for row in inventory.sample(50, random_state=0).itertuples(index=False):
+        record = index[row.pharmacy_id][row.sku]
+        assert record["qty"] == row.qty
+        assert record["price"] == row.price
+        assert record["drug_name"] == row.drug_name
+
+
+def test_get_coordinates_uses_first_zipcode_row():
+    agent = PharmacyAgent(data_dir=DATA_DIR, log_callback=lambda *_args: None)
+    zipcodes = pd.read_csv(f"{DATA_DIR}/zipcodes.csv")
+    first = zipcodes.drop_duplicates("pincode").iloc[0]
+
+    assert agent._get_coordinates(str(first["pincode"])) == (first["lat"], first["lon"])
+    assert agent._get_coordinates("000000") == (DEFAULT_LOCATION["lat"], DEFAULT_LOCATION["lon"])
+    assert agent._get_coordinates("12345") is None
+
+
+def test_haversine_kernel_matches_numpy_distances(pharmacy_agent):
+    lat, lon = 19.07, 72.88
+    out = np.empty(len(pharmacy_agent.pharmacies))
+    _haversine_kernel(
+        math.radians(lat),
+        math.radians(lon),
+        math.cos(math.radians(lat)),
+        pharmacy_agent._pharm_lat_rad,
+        pharmacy_agent._pharm_lon_rad,
+        pharmacy_agent._pharm_cos_lat,
+        out,
+    )
+
+    assert np.allclose(out, pharmacy_agent._haversine_distances(lat, lon), rtol=1e-12, atol=1e-9)
+
+
+def test_process_timestamps_share_one_clock_reading(pharmacy_agent):
+    therapy_result = {"otc_options": [{"sku": "OTC001", "drug_name": "Paracetamol"}]}
+    result = pharmacy_agent.process(therapy_result, {"zip_code": "400011"})
+
+    assert result["status"] == "success"
+    timestamp = datetime.fromisoformat(result["timestamp"])
+    assert datetime.fromisoformat(result["estimated_delivery"]) == timestamp + timedelta(minutes=result["eta_min"])
+    assert datetime.fromisoformat(result["reservation_expires_at"]) == timestamp + timedelta(hours=2)
+
+
+def test_reservation_id_is_deterministic_per_pharmacy_and_minute(pharmacy_agent):
+    now = datetime(2030, 1, 1, 9, 30, 15)
+
+    first = pharmacy_agent._generate_reservation_id("ph0003", now)
+    assert first == pharmacy_agent._generate_reservation_id("ph0003", now.replace(second=59))
+    assert first.startswith("RSV") and 100000 <= int(first[3:]) <= 999999
+    assert first != pharmacy_agent._generate_reservation_id("ph0004", now)
+
+
+def test_stock_check_stops_at_closest_full_stock_pharmacy(pharmacy_agent):
+    therapy_map = {"OTC001": {}, "OTC015": {}}
+    nearby = pharmacy_agent._find_nearby_pharmacies((19.07, 72.88), 25)
+
+    matches = pharmacy_agent._check_stock_availability(nearby, therapy_map)
+
+    assert matches and not matches[-1]["missing_items"]
+    assert all(match["missing_items"] for match in matches[:-1])
+    assert pharmacy_agent._select_best_pharmacy(matches) is matches[-1]
+
+
+def test_approx_prefilter_keeps_exact_nearby_results(pharmacy_agent):
+    patient = (19.07, 72.88)
+    rows = pharmacy_agent._rows_in_latitude_band(patient[0], 25)
+    exact = pharmacy_agent._haversine_distances(*patient, rows=rows)
+    approx = pharmacy_agent._approx_distances(*patient, rows=rows)
+    close = exact <= 50
+
+    assert np.all(np.abs(approx[close] - exact[close]) <= 0.002 * exact[close] + 1e-9)
+
+    all_rows = np.arange(len(pharmacy_agent.pharmacies))
+    distances = pharmacy_agent._haversine_distances(*patient, rows=all_rows)
+    delivery_km = np.array([pharmacy["delivery_km"] for pharmacy in pharmacy_agent.pharmacies])
+    expected = {pharmacy_agent.pharmacies[i]["id"] for i in np.flatnonzero(distances <= np.minimum(25, delivery_km))}
+    assert {p["id"] for p in pharmacy_agent._find_nearby_pharmacies(patient, 25)} == expected
+
+
+def test_error_responses_get_fresh_items_and_current_fields(pharmacy_agent):
+    now = datetime(2025, 1, 1, 9, 30)
+    first = pharmacy_agent._error_response("boom", now)
+    second = pharmacy_agent._error_response("bang", now)
+
+    first["items"].append({"sku": "OTC001"})
+    assert second["items"] == []
+    assert (first["error"], second["error"]) == ("boom", "bang")
+    assert second["timestamp"] == now.isoformat()
+    assert pharmacy_agent._location_error_response("999999")["message"].endswith("999999")
+
+
+def test_reservation_log_skipped_below_configured_level(pharmacy_agent):
+    events = []
+    pharmacy_agent.log_callback = lambda _agent, level, message: events.append((level, message))
+
+    pharmacy_agent._mock_reserve_items("PH001", 10, datetime(2025, 1, 1, 9, 30))
+    assert events and events[-1][1].endswith("until 11:30")
+
+    events.clear()
+    pharmacy_agent._min_log_rank = 30
+    pharmacy_agent._mock_reserve_items("PH001", 10, datetime(2025, 1, 1, 9, 30))
+    assert events == []
+
+    # Other log lines are not filtered
+    pharmacy_agent._log("INFO", "still shown")
+    assert events == [("INFO", "still shown")]
+
+
+def test_inventory_rows_with_blank_quantity_load_as_out_of_stock(tmp_path):
+    for name in ("pharmacies.json", "zipcodes.csv"):
+        (tmp_path / name).write_bytes(Path(DATA_DIR, name).read_bytes())
+    lines = Path(DATA_DIR, "inventory.csv").read_text().splitlines()
+    header = lines[0].split(",")
+    first = lines[1].split(",")
+    first[header.index("qty")] = ""
+    (tmp_path / "inventory.csv").write_text("\n".join([lines[0], ",".join(first), *lines[2:]]) + "\n")
+
+    agent = PharmacyAgent(data_dir=str(tmp_path), log_callback=lambda *_args: None)
+
+    pharmacy_id, sku = first[header.index("pharmacy_id")], first[header.index("sku")]
+    assert agent._inventory_by_pharmacy[pharmacy_id][sku]["qty"] == 0
+    assert pharmacy_id not in agent._pharmacies_stocking.get(sku, frozenset())
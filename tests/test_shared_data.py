@@ -0,0 +1,59 @@
+import os
+from pathlib import Path
+
+import pytest
+
+from agents.doctor_agent import DoctorAgent
+from agents.pharmacy_agent import PharmacyAgent
+from agents.therapy_agent import TherapyAgent
+
+
+DATA_DIR = "./data"
+
+
+@pytest.mark.parametrize(
+    "agent_cls, files, shared, changed_file, reloaded",
+    [
+        (
+            DoctorAgent,
+            ("doctors.csv",),
+            ("doctors_df", "specialty_index"),
+            "doctors.csv",
+            ("doctors_df", "specialty_index"),
+        ),
+        (
+            PharmacyAgent,
+            ("pharmacies.json", "inventory.csv", "zipcodes.csv"),
+            ("pharmacies", "_inventory_by_pharmacy", "zipcodes"),
+            "inventory.csv",
+            ("_inventory_by_pharmacy",),
+        ),
+        (
+            TherapyAgent,
+            ("meds.csv", "interactions.csv"),
+            ("_med_records", "_interactions_by_pair"),
+            "meds.csv",
+            ("_med_records",),
+        ),
+    ],
+    ids=["doctor", "pharmacy", "therapy"],
+)
+def test_data_files_are_shared_until_they_change(tmp_path, agent_cls, files, shared, changed_file, reloaded):
+    for name in files:
+        (tmp_path / name).write_bytes(Path(DATA_DIR, name).read_bytes())
+    first = agent_cls(data_dir=str(tmp_path), log_callback=lambda *_args: None)
+    second = agent_cls(data_dir=str(tmp_path), log_callback=lambda *_args: None)
+
+    for attr in shared:
+        assert getattr(second, attr) is getattr(first, attr), attr
+
+    changed_path = tmp_path / changed_file
+    stat = changed_path.stat()
+    os.utime(changed_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    third = agent_cls(data_dir=str(tmp_path), log_callback=lambda *_args: None)
+
+    for attr in shared:
+        if attr in reloaded:
+            assert getattr(third, attr) is not getattr(first, attr), attr
+        else:
+            assert getattr(third, attr) is getattr(first, attr), attr
@@ -0,0 +1,78 @@
+import csv
+
+import pytest
+
+from agents.therapy_agent import TherapyAgent
+
+
+DATA_DIR = "./data"
+
+
+@pytest.fixture()
+def therapy_agent():
+    return TherapyAgent(data_dir=DATA_DIR, log_callback=lambda *_args: None)
+
+
+def _catalog_scan(catalog, indications, age, allergies):
+    """Reference scan: first five catalog rows the agent should offer."""
+    matches = []
+    for med in catalog:
+        contra_keywords = [k.strip() for k in med["contra_allergy_keywords"].lower().split(",")]
+        if (
+            any(ind in med["indication"].lower() for ind in indications)
+            and age >= int(med["age_min"])
+            and not any(
+                a.lower() in contra_keywords or a.lower() in med["drug_name"].lower()
+                for a in allergies
+            )
+        ):
+            matches.append(med["sku"])
+    return matches[:5]
+
+
+def test_otc_medicines_match_full_catalog_scan(therapy_agent):
+    with open(f"{DATA_DIR}/meds.csv", newline="", encoding="utf-8") as handle:
+        catalog = list(csv.DictReader(handle))
+
+    for condition, indications in therapy_agent.condition_map.items():
+        for age, allergies in ((30, []), (5, ["Ibuprofen"]), (70, ["paracetamol acetaminophen"])):
+            expected = _catalog_scan(catalog, indications, age, allergies)
+            options = therapy_agent._get_otc_medicines(condition, age, allergies, "mild")
+            assert [option["sku"] for option in options] == expected
+
+
+def test_otc_allergy_check_splits_comma_separated_keywords(tmp_path):
+    meds_path = tmp_path / "meds.csv"
+    meds_path.write_text(
+        "sku,drug_name,indication,age_min,contra_allergy_keywords\n"
+        "OTC901,Coldmix,cough cold,0,\"menthol, Eucalyptus Oil\"\n"
+        "OTC902,Honeyrub,cough relief,0,honey\n",
+        encoding="utf-8",
+    )
+    with open(meds_path, newline="", encoding="utf-8") as handle:
+        catalog = list(csv.DictReader(handle))
+    agent = TherapyAgent(data_dir=str(tmp_path), log_callback=lambda *_args: None)
+
+    for allergies, expected in (
+        (["eucalyptus oil"], ["OTC902"]),
+        (["Menthol"], ["OTC902"]),
+        (["eucalyptus"], ["OTC901", "OTC902"]),
+        (["menthol, eucalyptus oil"], ["OTC901", "OTC902"]),
+    ):
+        assert _catalog_scan(catalog, agent.condition_map["bronchitis"], 30, allergies) == expected
+        options = agent._get_otc_medicines("bronchitis", 30, allergies, "mild")
+        assert [option["sku"] for option in options] == expected
+
+
+def test_interactions_found_in_either_order(therapy_agent):
+    options = [{"drug_name": "Ibuprofen"}, {"drug_name": "Aspirin"}]
+
+    warnings = therapy_agent._check_interactions(options, ["aspirin", "NAPROXEN"])
+
+    pairs = [(w["drug_a"], w["drug_b"], w["level"]) for w in warnings]
+    assert pairs == [
+        ("Ibuprofen", "aspirin", "moderate"),
+        ("Ibuprofen", "NAPROXEN", "high"),
+        ("Aspirin", "NAPROXEN", "high"),
+    ]
+    assert therapy_agent._check_interactions(options, []) == []